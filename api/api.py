@@ -1,64 +1,422 @@
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional
 from datetime import datetime
+from api import decode
+from utils import metrics
 
 # Carregar variáveis do arquivo .env
 load_dotenv()
 
-def get_colaboradores(token: str) -> List[str]:
+logger = logging.getLogger(__name__)
+
+# URLs base da API Tangerino; podem apontar para o servidor local de testes
+# (benchmarks/fake_tangerino.py) via .env ou configure_base_urls
+EMPLOYER_API_URL = os.getenv("TANGERINO_EMPLOYER_API_URL", "https://api.tangerino.com.br/api").rstrip("/")
+PUNCH_API_URL = os.getenv("TANGERINO_PUNCH_API_URL", "https://apis.tangerino.com.br").rstrip("/")
+
+# Limite de requisições por segundo para cada token (limite da API Tangerino)
+MAX_REQUESTS_PER_SECOND = float(os.getenv("TANGERINO_MAX_RPS", "4"))
+
+# Registros por página na busca de pontos de toda a empresa
+PUNCH_PAGE_SIZE = int(os.getenv("TANGERINO_PAGE_SIZE", "500"))
+
+# Tamanho do pool de conexões keep-alive da sessão compartilhada
+POOL_SIZE = int(os.getenv("TANGERINO_POOL_SIZE", "10"))
+
+# Tempo máximo (segundos) de espera por cada resposta da API
+REQUEST_TIMEOUT = float(os.getenv("TANGERINO_TIMEOUT_SECONDS", "30"))
+
+# Novas tentativas para falhas transitórias (429, 5xx, timeout, conexão)
+MAX_RETRIES = int(os.getenv("TANGERINO_MAX_RETRIES", "4"))
+
+# Espera base e máxima (segundos) do backoff exponencial entre tentativas; um Retry-After
+# acima da máxima faz a requisição falhar na hora, em vez de prender a thread esperando
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+
+# Status HTTP considerados transitórios
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+class RateLimiter:
     """
-    Retorna uma lista de colaboradores disponíveis.
+    Limitador simples que garante um intervalo mínimo entre as requisições.
+
+    Seguro para uso entre threads: cada chamada reserva o próximo horário livre
+    e aguarda fora do lock, permitindo que várias threads compartilhem o limite.
+    """
+
+    def __init__(self, max_per_second: float):
+        self.interval = 1.0 / max_per_second if max_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Reserva o próximo horário livre e retorna quantos segundos faltam até ele (sem bloquear)."""
+        if not self.interval:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        return slot - now
+
+    def acquire(self) -> None:
+        """Bloqueia até que a próxima requisição seja permitida."""
+        espera = self.reserve()
+        if espera > 0:
+            time.sleep(espera)
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+def configure_base_urls(employer_url: Optional[str] = None, punch_url: Optional[str] = None) -> None:
+    """
+    Altera as URLs base usadas pelas funções deste módulo.
+
+    Args:
+        employer_url (Optional[str]): Base de employee/find-all e holiday-calendar (ex.: "http://localhost:8765/api").
+        punch_url (Optional[str]): Base do endpoint /punch/ (ex.: "http://localhost:8765").
+    """
+    global EMPLOYER_API_URL, PUNCH_API_URL
+    if employer_url:
+        EMPLOYER_API_URL = employer_url.rstrip("/")
+    if punch_url:
+        PUNCH_API_URL = punch_url.rstrip("/")
+
+def get_session() -> requests.Session:
+    """
+    Retorna a sessão HTTP compartilhada, reaproveitando conexões keep-alive.
 
     Returns:
-        List[str]: Lista de colaboradores.
+        requests.Session: Sessão única do processo.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def get_rate_limiter(token: str) -> RateLimiter:
+    """
+    Retorna o limitador de requisições associado ao token.
+
+    Args:
+        token (str): Token de autenticação.
+
+    Returns:
+        RateLimiter: Limitador compartilhado por todas as chamadas com o mesmo token.
+    """
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(token)
+        if limiter is None:
+            limiter = _rate_limiters[token] = RateLimiter(MAX_REQUESTS_PER_SECOND)
+        return limiter
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """
+    Lê o cabeçalho Retry-After, em segundos ou como data HTTP.
+
+    Returns:
+        Optional[float]: Segundos a aguardar, ou None se o cabeçalho estiver ausente ou inválido.
+    """
+    valor = response.headers.get("Retry-After")
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(valor).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(tentativa: int, retry_after: Optional[float] = None) -> float:
+    """
+    Calcula a espera antes da próxima tentativa (backoff exponencial com jitter completo).
+
+    Args:
+        tentativa (int): Número da tentativa que falhou, começando em 0.
+        retry_after (Optional[float]): Espera mínima pedida pelo servidor.
+
+    Returns:
+        float: Segundos a aguardar.
+    """
+    espera = random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** tentativa))
+    if retry_after is not None:
+        # O servidor informou quando tentar de novo; o jitter só evita que todas as threads voltem juntas
+        espera = min(retry_after, BACKOFF_MAX_SECONDS) + random.uniform(0, BACKOFF_BASE_SECONDS)
+    return espera
+
+def retry_after_exceeded(retry_after: Optional[float]) -> bool:
+    """
+    Indica se o servidor pediu uma espera maior que BACKOFF_MAX_SECONDS.
+
+    Nesse caso a requisição falha sem nova tentativa: a janela aparece como dias
+    incompletos em vez de segurar a thread (ou o semáforo do cliente assíncrono).
+    """
+    return retry_after is not None and retry_after > BACKOFF_MAX_SECONDS
+
+def _get(url: str, token: str, stream: bool = False) -> requests.Response:
+    """
+    Faz um GET autenticado respeitando o limite do token, com timeout e novas tentativas.
+
+    Falhas transitórias (RETRY_STATUS, timeout e erro de conexão) são repetidas até
+    MAX_RETRIES vezes; as demais são levantadas imediatamente.
+
+    Args:
+        url (str): URL completa.
+        token (str): Token de autenticação.
+        stream (bool): Não lê o corpo da resposta; quem chama o consome (ex.: `decode.decode_punch_page`)
+            e o tamanho registrado nas métricas vem do Content-Length.
+
+    Returns:
+        requests.Response: Resposta com status de sucesso.
+
+    Raises:
+        requests.exceptions.RequestException: Se a requisição falhar após todas as tentativas.
     """
-    
     headers = {
         "Authorization": f"Basic {token}",
         "Content-Type": "application/json"
     }
 
-    URL = "https://api.tangerino.com.br/api/employer/employee/find-all"
+    endpoint = urlsplit(url).path
+    inicio = time.perf_counter()
+    status, tamanho, tentativa = None, 0, 0
 
     try:
-        response = requests.get(url=URL, headers=headers)
-        response.raise_for_status()
-        return response.json().get("content", [])
+        for tentativa in range(MAX_RETRIES + 1):
+            get_rate_limiter(token).acquire()
+            try:
+                response = get_session().get(url=url, headers=headers, timeout=REQUEST_TIMEOUT, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                status = type(e).__name__
+                if tentativa == MAX_RETRIES:
+                    raise
+                logger.warning("%s em %s; nova tentativa %d de %d", status, endpoint, tentativa + 1, MAX_RETRIES)
+                time.sleep(backoff_delay(tentativa))
+                continue
+
+            status = response.status_code
+            tamanho = int(response.headers.get("Content-Length") or 0) if stream else len(response.content)
+            if response.status_code in RETRY_STATUS and tentativa < MAX_RETRIES:
+                retry_after = retry_after_seconds(response)
+                if retry_after_exceeded(retry_after):
+                    logger.warning("HTTP %s em %s pede %.0f s de espera (máximo %.0f s); sem nova tentativa",
+                                   status, endpoint, retry_after, BACKOFF_MAX_SECONDS)
+                else:
+                    logger.warning("HTTP %s em %s; nova tentativa %d de %d", status, endpoint, tentativa + 1, MAX_RETRIES)
+                    response.close()
+                    time.sleep(backoff_delay(tentativa, retry_after))
+                    continue
+
+            if response.status_code >= 400:
+                response.close()
+            response.raise_for_status()
+            return response
+    finally:
+        metrics.record_request(endpoint, status, time.perf_counter() - inicio, tamanho, tentativa)
+
+def fetch_colaboradores(token: str) -> List[Dict]:
+    """
+    Retorna a lista de colaboradores, levantando exceção em caso de falha.
+
+    Returns:
+        List[Dict]: Lista de colaboradores.
+
+    Raises:
+        requests.exceptions.RequestException: Se a requisição falhar.
+    """
+
+    URL = f"{EMPLOYER_API_URL}/employer/employee/find-all"
+
+    response = _get(URL, token)
+    return decode.loads(response.content).get("content", [])
+
+def get_colaboradores(token: str) -> List[str]:
+    """
+    Retorna uma lista de colaboradores disponíveis.
+
+    Returns:
+        List[str]: Lista de colaboradores.
+    """
+
+    try:
+        return fetch_colaboradores(token)
     except requests.exceptions.RequestException as e:
-        print(f"Erro ao buscar colaboradores: {e}")
+        logger.error("Erro ao buscar colaboradores: %s", e)
         return []
 
-def get_punch(start_ms: int, end_ms: int, colaborador, token: str) -> List[Dict]:
+def punch_url(start_ms: int, end_ms: int, colaborador, page: Optional[int] = None, size: Optional[int] = None) -> str:
+    """Monta a URL do endpoint /punch/; `colaborador` None busca todos os colaboradores da empresa."""
+    url = f"{PUNCH_API_URL}/punch/?endDate={end_ms}&startDate={start_ms}"
+    if colaborador is not None:
+        url += f"&employeeId={colaborador}"
+    if page is not None:
+        url += f"&page={page}"
+    if size is not None:
+        url += f"&size={size}"
+    return url
+
+def parse_punch_page(data: Dict, page: Optional[int] = None) -> Dict:
+    """
+    Extrai os registros de uma página do /punch/ e se há páginas seguintes.
+
+    Returns:
+        Dict: "content" (registros de ponto) e "truncated" (há páginas seguintes).
+    """
+    numero = data.get("number") or page or 0
+    ultima = data["last"] if data.get("last") is not None else numero + 1 >= (data.get("totalPages") or 1)
+    return {"content": data.get("content", []), "truncated": not ultima}
+
+def fetch_punch_page(start_ms: int, end_ms: int, colaborador, token: str, page: Optional[int] = None,
+                     size: Optional[int] = None) -> Dict:
+    """
+    Busca uma página de pontos do intervalo e informa também o tamanho e a duração da resposta.
+
+    Args:
+        start_ms (int): Timestamp inicial em milissegundos.
+        end_ms (int): Timestamp final em milissegundos.
+        colaborador: ID do colaborador, ou None para todos os colaboradores da empresa.
+        token (str): Token de autenticação.
+        page (Optional[int]): Página (a partir de 0); None usa o padrão da API.
+        size (Optional[int]): Registros por página; None usa o padrão da API.
+
+    Returns:
+        Dict: "content" (registros de ponto, só com os campos usados; ver `decode.slim_punch`),
+        "truncated" (há páginas seguintes), "bytes" (tamanho do corpo) e "elapsed"
+        (segundos até a resposta, sem a espera do limitador).
+
+    Raises:
+        requests.exceptions.RequestException: Se a requisição falhar.
     """
-    Gets all employee punches within the given time range.
+
+    response = _get(punch_url(start_ms, end_ms, colaborador, page, size), token, stream=decode.stream_enabled())
+    with response:
+        pagina = decode.decode_punch_page(response)
+    return {
+        **parse_punch_page(pagina, page),
+        "bytes": pagina["bytes"],
+        "elapsed": response.elapsed.total_seconds(),
+    }
+
+def iter_punch_pages(start_ms: int, end_ms: int, token: str, size: int = PUNCH_PAGE_SIZE) -> Iterator[List[Dict]]:
+    """
+    Percorre as páginas de pontos de todos os colaboradores no intervalo.
+
+    Args:
+        start_ms (int): Timestamp inicial em milissegundos.
+        end_ms (int): Timestamp final em milissegundos.
+        token (str): Token de autenticação.
+        size (int): Registros por página.
+
+    Yields:
+        List[Dict]: Registros de cada página, na ordem das páginas.
+
+    Raises:
+        requests.exceptions.RequestException: Se alguma página falhar.
+    """
+
+    page = 0
+    while True:
+        pagina = fetch_punch_page(start_ms, end_ms, None, token, page=page, size=size)
+        yield pagina["content"]
+        if not pagina["truncated"] or not pagina["content"]:
+            return
+        page += 1
+
+def fetch_all_punches(start_ms: int, end_ms: int, token: str, size: int = PUNCH_PAGE_SIZE) -> List[Dict]:
+    """
+    Busca os pontos de todos os colaboradores no intervalo, seguindo a paginação.
+
+    Returns:
+        List[Dict]: Registros de ponto de todas as páginas.
+
+    Raises:
+        requests.exceptions.RequestException: Se alguma página falhar.
+    """
+
+    return [punch for pagina in iter_punch_pages(start_ms, end_ms, token, size) for punch in pagina]
+
+def fetch_punch(start_ms: int, end_ms: int, colaborador, token: str) -> List[Dict]:
+    """
+    Gets all employee punches within the given time range, raising on failure.
 
     Args:
         start_ms (int): Start timestamp in milliseconds.
         end_ms (int): End timestamp in milliseconds.
 
     Returns:
-        List[Dict]: A list of punch records. Returns an empty list if the request fails or no data is found.
+        List[Dict]: A list of punch records.
 
     Raises:
-        Value Error: If the API token is not found in the environment variables.
+        requests.exceptions.RequestException: If the request fails.
     """
 
-    URL = f"https://apis.tangerino.com.br/punch/?employeeId={colaborador}&endDate={end_ms}&startDate={start_ms}"
+    return fetch_punch_page(start_ms, end_ms, colaborador, token)["content"]
 
-    headers = {
-        "Authorization": f"Basic {token}",
-        "Content-Type": "application/json"
-    }
+def get_punch(start_ms: int, end_ms: int, colaborador, token: str) -> List[Dict]:
+    """
+    Gets all employee punches within the given time range.
+
+    Args:
+        start_ms (int): Start timestamp in milliseconds.
+        end_ms (int): End timestamp in milliseconds.
+
+    Returns:
+        List[Dict]: A list of punch records. Returns an empty list if the request fails or no data is found.
+    """
 
     try:
-        response = requests.get(url=URL, headers=headers)
-        response.raise_for_status()
-        return response.json().get("content", [])
+        return fetch_punch(start_ms, end_ms, colaborador, token)
     except requests.exceptions.RequestException as e:
-        print(f'Erro ao buscar pontos: {e}')
+        logger.error("Erro ao buscar pontos: %s", e)
         return []
 
+def fetch_holidays_for_year(year: int, token: str) -> List[str]:
+    """
+    Busca os feriados de um ano, levantando exceção em caso de falha.
+
+    Args:
+        year (int): Ano do calendário de feriados.
+        token (str): Token de autenticação.
+
+    Returns:
+        List[str]: Lista de datas de feriados no formato "YYYY-MM-DD".
+    """
+
+    url = f"{EMPLOYER_API_URL}/employer/holiday-calendar/?year={year}"
+    response = _get(url, token)
+    return parse_holidays(decode.loads(response.content))
+
+def parse_holidays(data: Dict) -> List[str]:
+    """Extrai as datas ("YYYY-MM-DD") da resposta do calendário de feriados."""
+    year_holidays = data["item"][0]["holidays"]
+    return [holiday["date"] for holiday in year_holidays]
+
+def years_between(start_ms: int, end_ms: int) -> range:
+    """Retorna os anos cobertos pelo intervalo (inclusive)."""
+    start_year = datetime.fromtimestamp(start_ms / 1000).year
+    end_year = datetime.fromtimestamp(end_ms / 1000).year
+    return range(start_year, end_year + 1)
+
 def get_holidays_between(start_ms: int, end_ms: int, token: str) -> List[str]:
     """
     Busca e retorna uma lista de feriados entre os anos da data inicial e final.
@@ -71,27 +429,12 @@ def get_holidays_between(start_ms: int, end_ms: int, token: str) -> List[str]:
         List[str]: Lista de datas de feriados no formato "YYYY-MM-DD".
     """
 
-    start_year = datetime.fromtimestamp(start_ms / 1000).year
-    end_year = datetime.fromtimestamp(end_ms / 1000).year
-
     holidays = []
 
-    for year in range(start_year, end_year + 1):
+    for year in years_between(start_ms, end_ms):
         try:
-            url = f"https://api.tangerino.com.br/api/employer/holiday-calendar/?year={year}"
-            headers = {
-                "Authorization": f"Basic {token}",
-                "Content-Type": "application/json"
-            }
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            year_holidays = data["item"][0]["holidays"]
-            holidays.extend([holiday["date"] for holiday in year_holidays])
+            holidays.extend(fetch_holidays_for_year(year, token))
         except Exception as e:
-            print(f"Erro ao buscar feriados para {year}: {e}")
+            logger.error("Erro ao buscar feriados para %s: %s", year, e)
 
     return holidays
-
-
-
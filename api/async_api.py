@@ -0,0 +1,268 @@
+# api/async_api.py
+"""
+Cliente assíncrono (asyncio + aiohttp) da API Tangerino.
+
+Oferece as mesmas operações de api/api.py, mas várias requisições (colaboradores,
+janelas e anos diferentes) ficam em andamento ao mesmo tempo sobre um único pool
+de conexões HTTP/1.1 keep-alive. O limite de requisições por token, as novas
+tentativas, o timeout e as métricas são os mesmos da versão síncrona; o limite
+por token é inclusive compartilhado com ela.
+
+As falhas são levantadas com as exceções de `requests` (HTTPError, Timeout,
+ConnectionError, ChunkedEncodingError, JSONDecodeError...), para que o código
+que já trata a versão síncrona continue valendo.
+
+Uso em código assíncrono:
+
+    async with AsyncTangerinoClient(token) as client:
+        colaboradores, feriados = await asyncio.gather(client.get_colaboradores(),
+                                                       client.get_holidays_between(start_ms, end_ms))
+
+e, no Streamlit ou em scripts, pelas funções síncronas `get_colaboradores`,
+`get_punch`, `get_punches` e `get_holidays_between` deste módulo.
+
+Requer o pacote opcional `aiohttp`.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+
+from api import api, decode
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Requisições simultâneas em andamento por cliente (a taxa continua limitada por token)
+ASYNC_CONCURRENCY = int(os.getenv("TANGERINO_ASYNC_CONCURRENCY", "8"))
+
+# Tempo (segundos) que uma conexão ociosa fica aberta no pool
+KEEPALIVE_SECONDS = float(os.getenv("TANGERINO_KEEPALIVE_SECONDS", "30"))
+
+Janela = Tuple[int, int, object]
+
+# Falhas repetidas até MAX_RETRIES vezes, como em api._get (o corpo incompleto também é transitório)
+_TRANSITORIOS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError)
+
+def _erro_requests(e: Exception, url: str) -> requests.exceptions.RequestException:
+    """Traduz uma falha do aiohttp na exceção equivalente de `requests`."""
+    if isinstance(e, (asyncio.TimeoutError, aiohttp.ServerTimeoutError)):
+        return requests.exceptions.Timeout(f"Timeout em {url}")
+    if isinstance(e, aiohttp.ClientConnectionError):
+        return requests.exceptions.ConnectionError(f"ConnectionError em {url}: {e}")
+    if isinstance(e, aiohttp.ClientPayloadError):
+        return requests.exceptions.ChunkedEncodingError(f"Corpo incompleto em {url}: {e}")
+    return requests.exceptions.RequestException(f"{type(e).__name__} em {url}: {e}")
+
+class AsyncTangerinoClient:
+    """
+    Cliente assíncrono com um pool de conexões keep-alive próprio.
+
+    Deve ser usado como gerenciador de contexto assíncrono (`async with`), que
+    abre e fecha o pool. `max_concurrency` limita as requisições simultâneas do
+    cliente; a taxa por token segue MAX_REQUESTS_PER_SECOND de api/api.py.
+    """
+
+    def __init__(self, token: str, max_concurrency: int = ASYNC_CONCURRENCY, timeout: float = api.REQUEST_TIMEOUT):
+        self.token = token
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaforo: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncTangerinoClient":
+        conector = aiohttp.TCPConnector(limit=api.POOL_SIZE, keepalive_timeout=KEEPALIVE_SECONDS)
+        self._session = aiohttp.ClientSession(
+            connector=conector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"Authorization": f"Basic {self.token}", "Content-Type": "application/json"},
+        )
+        self._semaforo = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._session.close()
+        self._session = None
+
+    async def _get_json(self, url: str, decodificar: Callable[[bytes], Dict] = decode.loads) -> Tuple[Dict, int]:
+        """
+        GET autenticado com limite do token, timeout e novas tentativas, como `api._get`.
+
+        Args:
+            url (str): URL completa.
+            decodificar (Callable[[bytes], Dict]): Decodificador do corpo (padrão: `decode.loads`).
+
+        Returns:
+            Tuple[Dict, int]: Corpo da resposta já decodificado e o seu tamanho em bytes.
+
+        Raises:
+            requests.exceptions.RequestException: Se a requisição falhar após todas as tentativas.
+        """
+        endpoint = urlsplit(url).path
+        inicio = time.perf_counter()
+        status, tamanho, tentativa = None, 0, 0
+
+        try:
+            async with self._semaforo:
+                for tentativa in range(api.MAX_RETRIES + 1):
+                    espera = api.get_rate_limiter(self.token).reserve()
+                    if espera > 0:
+                        await asyncio.sleep(espera)
+                    try:
+                        async with self._session.get(url) as response:
+                            corpo = await response.read()
+                            status, tamanho = response.status, len(corpo)
+                            retry_after = api.retry_after_seconds(response)
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        erro = _erro_requests(e, url)
+                        status = type(erro).__name__
+                        if tentativa == api.MAX_RETRIES or not isinstance(erro, _TRANSITORIOS):
+                            raise erro from e
+                        logger.warning("%s em %s; nova tentativa %d de %d", status, endpoint, tentativa + 1, api.MAX_RETRIES)
+                        await asyncio.sleep(api.backoff_delay(tentativa))
+                        continue
+
+                    if status in api.RETRY_STATUS and tentativa < api.MAX_RETRIES:
+                        if api.retry_after_exceeded(retry_after):
+                            logger.warning("HTTP %s em %s pede %.0f s de espera (máximo %.0f s); sem nova tentativa",
+                                           status, endpoint, retry_after, api.BACKOFF_MAX_SECONDS)
+                        else:
+                            logger.warning("HTTP %s em %s; nova tentativa %d de %d", status, endpoint, tentativa + 1, api.MAX_RETRIES)
+                            await asyncio.sleep(api.backoff_delay(tentativa, retry_after))
+                            continue
+
+                    if status >= 400:
+                        raise requests.exceptions.HTTPError(f"{status} Error for url: {url}")
+                    return decodificar(corpo), tamanho
+        finally:
+            metrics.record_request(endpoint, status, time.perf_counter() - inicio, tamanho, tentativa)
+
+    async def fetch_colaboradores(self) -> List[Dict]:
+        """Lista de colaboradores, levantando exceção em caso de falha."""
+        data, _ = await self._get_json(f"{api.EMPLOYER_API_URL}/employer/employee/find-all")
+        return data.get("content", [])
+
+    async def get_colaboradores(self) -> List[Dict]:
+        """Lista de colaboradores; vazia em caso de falha."""
+        try:
+            return await self.fetch_colaboradores()
+        except requests.exceptions.RequestException as e:
+            logger.error("Erro ao buscar colaboradores: %s", e)
+            return []
+
+    async def fetch_punch_page(self, start_ms: int, end_ms: int, colaborador, page: Optional[int] = None,
+                               size: Optional[int] = None) -> Dict:
+        """Uma página de pontos, no formato de `api.fetch_punch_page` (sem "elapsed")."""
+        data, tamanho = await self._get_json(api.punch_url(start_ms, end_ms, colaborador, page, size), decode.decode_punch_body)
+        return {**api.parse_punch_page(data, page), "bytes": tamanho}
+
+    async def fetch_punch(self, start_ms: int, end_ms: int, colaborador) -> List[Dict]:
+        """
+        Pontos do colaborador no intervalo, seguindo a paginação como `utils.utils.completar_paginas`.
+
+        Raises:
+            requests.exceptions.RequestException: Se alguma página falhar; a janela nunca volta pela metade.
+        """
+        pagina = await self.fetch_punch_page(start_ms, end_ms, colaborador)
+        pontos, page = list(pagina["content"]), 1
+        while pagina["truncated"]:
+            pagina = await self.fetch_punch_page(start_ms, end_ms, colaborador, page=page)
+            if pagina["truncated"] and not pagina["content"]:
+                raise requests.exceptions.RequestException(f"Página {page} vazia, mas a API indica páginas seguintes")
+            pontos.extend(pagina["content"])
+            page += 1
+        return pontos
+
+    async def get_punch(self, start_ms: int, end_ms: int, colaborador) -> List[Dict]:
+        """Pontos do colaborador no intervalo; vazia em caso de falha."""
+        try:
+            return await self.fetch_punch(start_ms, end_ms, colaborador)
+        except requests.exceptions.RequestException as e:
+            logger.error("Erro ao buscar pontos: %s", e)
+            return []
+
+    async def get_punches(self, janelas: Iterable[Janela]) -> List[List[Dict]]:
+        """
+        Busca várias janelas (de um ou mais colaboradores) ao mesmo tempo.
+
+        Args:
+            janelas (Iterable[Janela]): (início em ms, fim em ms, colaborador) de cada busca.
+
+        Returns:
+            List[List[Dict]]: Pontos de cada janela, na mesma ordem; vazia para as que falharam.
+        """
+        resultados = await asyncio.gather(*(self.get_punch(s, e, c) for s, e, c in janelas), return_exceptions=True)
+        pontos = []
+        for resultado in resultados:
+            # Uma janela com falha inesperada não derruba as demais
+            if isinstance(resultado, Exception):
+                logger.error("Erro ao buscar pontos: %s", resultado)
+                resultado = []
+            pontos.append(resultado)
+        return pontos
+
+    async def fetch_holidays_for_year(self, year: int) -> List[str]:
+        """Feriados do ano ("YYYY-MM-DD"), levantando exceção em caso de falha."""
+        data, _ = await self._get_json(f"{api.EMPLOYER_API_URL}/employer/holiday-calendar/?year={year}")
+        return api.parse_holidays(data)
+
+    async def get_holidays_between(self, start_ms: int, end_ms: int) -> List[str]:
+        """Feriados de todos os anos do intervalo, buscados ao mesmo tempo; anos com falha são ignorados."""
+        anos = list(api.years_between(start_ms, end_ms))
+        resultados = await asyncio.gather(*(self.fetch_holidays_for_year(ano) for ano in anos), return_exceptions=True)
+
+        holidays = []
+        for ano, resultado in zip(anos, resultados):
+            if isinstance(resultado, Exception):
+                logger.error("Erro ao buscar feriados para %s: %s", ano, resultado)
+            else:
+                holidays.extend(resultado)
+        return holidays
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def run(coro: Awaitable):
+    """
+    Executa uma corrotina a partir de código síncrono.
+
+    Sem loop de eventos na thread atual (Streamlit, scripts), usa `asyncio.run`;
+    dentro de um loop já em execução (ex.: Jupyter), executa em uma thread auxiliar.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = metrics.ContextExecutor(max_workers=1, thread_name_prefix="async-api")
+    return _executor.submit(asyncio.run, coro).result()
+
+async def _com_cliente(token: str, operacao: str, *args):
+    async with AsyncTangerinoClient(token) as client:
+        return await getattr(client, operacao)(*args)
+
+def get_colaboradores(token: str) -> List[Dict]:
+    """Versão síncrona de `AsyncTangerinoClient.get_colaboradores`."""
+    return run(_com_cliente(token, "get_colaboradores"))
+
+def get_punch(start_ms: int, end_ms: int, colaborador, token: str) -> List[Dict]:
+    """Versão síncrona de `AsyncTangerinoClient.get_punch`, com a assinatura de `api.get_punch`."""
+    return run(_com_cliente(token, "get_punch", start_ms, end_ms, colaborador))
+
+def get_punches(janelas: Iterable[Janela], token: str) -> List[List[Dict]]:
+    """Versão síncrona de `AsyncTangerinoClient.get_punches`: todas as janelas em um único pool."""
+    return run(_com_cliente(token, "get_punches", list(janelas)))
+
+def get_holidays_between(start_ms: int, end_ms: int, token: str) -> List[str]:
+    """Versão síncrona de `AsyncTangerinoClient.get_holidays_between`, com os anos em paralelo."""
+    return run(_com_cliente(token, "get_holidays_between", start_ms, end_ms))
@@ -0,0 +1,175 @@
+# api/decode.py
+"""
+Decodificação rápida das respostas JSON da API.
+
+Por padrão o corpo é lido de uma vez e decodificado com o `orjson`, se
+instalado (cerca de 2x mais rápido), ou com o `json` da biblioteca padrão.
+
+Com TANGERINO_STREAM_JSON=1 e o `ijson` instalado, as páginas do /punch/ são
+lidas em fluxo direto da conexão, registro a registro, sem montar o documento
+inteiro: o pico de memória por página cai para cerca de um terço, ao custo de
+mais CPU na decodificação (útil para páginas grandes em máquinas com pouca memória).
+
+Em todos os casos, cada registro de ponto é reduzido aos campos usados pelo
+pipeline (ver `slim_punch`). Corpos inválidos e falhas de leitura da conexão
+são levantados como exceções de `requests` (como `response.json()`), para que
+os tratamentos de `RequestException` continuem valendo.
+"""
+import json
+import os
+from typing import Dict, Optional
+
+import requests
+from urllib3 import exceptions as urllib3_exceptions
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:
+    ijson = None
+
+# Lê as páginas do /punch/ em fluxo com o ijson (1) em vez de decodificar o corpo inteiro (0)
+STREAM_JSON = os.getenv("TANGERINO_STREAM_JSON", "0") == "1"
+
+# Campos do topo da página do /punch/ usados na paginação
+_CAMPOS_PAGINA = ("number", "last", "totalPages")
+
+def stream_enabled() -> bool:
+    """Indica se as páginas do /punch/ são decodificadas em fluxo (TANGERINO_STREAM_JSON=1 e `ijson` instalado)."""
+    return STREAM_JSON and ijson is not None
+
+def _erro_json(e: Exception) -> requests.exceptions.RequestException:
+    if isinstance(e, json.JSONDecodeError):
+        # orjson.JSONDecodeError também é subclasse de json.JSONDecodeError
+        return requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos)
+    return requests.exceptions.InvalidJSONError(f"Resposta JSON inválida: {e}")
+
+def loads(corpo: bytes):
+    """
+    Decodifica um documento JSON completo com o `orjson`, se instalado, ou com o `json`.
+
+    Raises:
+        requests.exceptions.InvalidJSONError: Se o corpo não for JSON válido
+            (`requests.exceptions.JSONDecodeError` para erros de sintaxe).
+    """
+    try:
+        if orjson is not None:
+            return orjson.loads(corpo)
+        return json.loads(corpo)
+    except ValueError as e:
+        raise _erro_json(e) from e
+
+def slim_punch(punch: Dict) -> Dict:
+    """
+    Mantém apenas os campos do registro de ponto usados pelo pipeline.
+
+    `id` (identidade do registro), `employee.id/name`, `date`, `dateIn`, `dateOut`,
+    `adjust` e `adjustmentReason.description`.
+    """
+    employee = punch.get("employee") or {}
+    motivo = punch.get("adjustmentReason")
+    return {
+        "id": punch.get("id"),
+        "employee": {"id": employee.get("id"), "name": employee.get("name")},
+        "date": punch.get("date"),
+        "dateIn": punch.get("dateIn"),
+        "dateOut": punch.get("dateOut"),
+        "adjust": punch.get("adjust"),
+        "adjustmentReason": {"description": motivo.get("description")} if motivo else None,
+    }
+
+class _ContadorDeBytes:
+    """Envolve um arquivo contando os bytes lidos (o tamanho do corpo não é conhecido de antemão)."""
+
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.lidos = 0
+
+    def read(self, n: int = -1) -> bytes:
+        dados = self.arquivo.read(n)
+        self.lidos += len(dados)
+        return dados
+
+def _erro_leitura(e: urllib3_exceptions.HTTPError) -> requests.exceptions.RequestException:
+    # Mesma tradução de requests.Response.iter_content
+    if isinstance(e, urllib3_exceptions.ProtocolError):
+        return requests.exceptions.ChunkedEncodingError(e)
+    if isinstance(e, urllib3_exceptions.DecodeError):
+        return requests.exceptions.ContentDecodingError(e)
+    if isinstance(e, urllib3_exceptions.SSLError):
+        return requests.exceptions.SSLError(e)
+    return requests.exceptions.ConnectionError(e)
+
+def _stream_punch_page(arquivo) -> Dict:
+    try:
+        return _montar_pagina(arquivo)
+    except urllib3_exceptions.HTTPError as e:
+        raise _erro_leitura(e) from e
+    except (ijson.JSONError, ValueError) as e:
+        raise _erro_json(e) from e
+
+def _montar_pagina(arquivo) -> Dict:
+    pagina: Dict = {"content": []}
+    construtor: Optional[ObjectBuilder] = None
+    for prefixo, evento, valor in ijson.parse(arquivo, use_float=True):
+        if construtor is not None:
+            if prefixo == "content.item" and evento == "end_map":
+                pagina["content"].append(slim_punch(construtor.value))
+                construtor = None
+            else:
+                construtor.event(evento, valor)
+        elif prefixo == "content.item" and evento == "start_map":
+            construtor = ObjectBuilder()
+            construtor.event(evento, valor)
+        elif prefixo in _CAMPOS_PAGINA and evento in ("number", "boolean", "null"):
+            pagina[prefixo] = valor
+    return pagina
+
+def decode_punch_body(corpo: bytes) -> Dict:
+    """
+    Decodifica o corpo já lido de uma página do /punch/.
+
+    Returns:
+        Dict: "content" (registros reduzidos por `slim_punch`) e os campos de
+        paginação presentes ("number", "last", "totalPages").
+
+    Raises:
+        requests.exceptions.InvalidJSONError: Se o corpo não for uma página JSON válida.
+    """
+    data = loads(corpo)
+    if not isinstance(data, dict):
+        raise requests.exceptions.InvalidJSONError(f"Página inesperada: {type(data).__name__}")
+    pagina = {campo: data[campo] for campo in _CAMPOS_PAGINA if campo in data}
+    pagina["content"] = [slim_punch(p) for p in data.get("content") or []]
+    return pagina
+
+def decode_punch_page(response) -> Dict:
+    """
+    Decodifica uma página do /punch/ direto da resposta HTTP.
+
+    Com leitura em fluxo (`stream_enabled`), a resposta deve ter sido feita com
+    `stream=True`: os registros são montados enquanto o corpo chega da conexão.
+
+    Args:
+        response (requests.Response): Resposta com status de sucesso.
+
+    Returns:
+        Dict: Formato de `decode_punch_body`, mais "bytes" (tamanho do corpo lido).
+
+    Raises:
+        requests.exceptions.RequestException: Se o corpo for inválido ou a leitura da conexão falhar.
+    """
+    if stream_enabled():
+        response.raw.decode_content = True
+        arquivo = _ContadorDeBytes(response.raw)
+        pagina = _stream_punch_page(arquivo)
+        pagina["bytes"] = arquivo.lidos
+        return pagina
+
+    corpo = response.content
+    return {**decode_punch_body(corpo), "bytes": len(corpo)}
@@ -1,11 +1,11 @@
 # app.py
 import streamlit as st
-from components.login_components import show_login_form
-from components.main_dashboard import show_date_selector, show_employee_selector, display_dataframes
-from api.api import get_colaboradores, get_holidays_between
-from utils.utils import converter_data_para_ms, fetch_punches_in_chunks
+from components.login_components import show_account_selector, show_login_form
+from utils.metrics import configure_logging, set_session
 from datetime import datetime
 
+configure_logging()
+
 # Configuração inicial da página
 st.set_page_config(
     page_title="Controle de Ponto - Tangerino v2",
@@ -27,15 +27,41 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 def main_app():
+    # Importados só depois do login: a tela de login não precisa de pandas, Babel e pytz (ver benchmarks/startup.py)
+    from components.main_dashboard import show_date_selector, show_employee_selector, display_day_minutes, display_loading_preview, show_incomplete_days, show_prefetch_toggle
+    from services.data_service import get_colaboradores_cached, get_holidays_between_cached, refresh_cached_data
+    from utils.utils import converter_data_para_ms, namespace_da_conta
+    from utils.day_store import DayStore, iter_load_period
+    from utils.transformToDataframe import compute_adjusted
+    from utils.punch_cache import get_default_cache
+    from utils.archive import get_default_archive
+    from utils.batch import EmployeeReport, archive_report
+    from utils.prefetch import Prefetcher, prefetch_targets
+
     st.title("Controle de Ponto")
 
     token = st.session_state.get("token")
     if not token:
         st.error("Token não encontrado. Faça login novamente.")
         return
-    
+
+    show_account_selector()
+    # Cache e arquivo histórico separados por conta: IDs de colaboradores podem se repetir entre empresas
+    conta = namespace_da_conta(token)
+    if st.sidebar.button("🔄 Atualizar colaboradores e feriados"):
+        refresh_cached_data()
+
+    modo = st.radio("Modo", ["Individual", "Lote"], horizontal=True)
     start_date, end_date = show_date_selector()
-    colaboradores = get_colaboradores(token)
+    colaboradores = get_colaboradores_cached(token)
+
+    # O pré-carregamento anterior é cancelado a cada nova navegação, para não disputar com a busca atual
+    prefetcher = st.session_state.setdefault("prefetcher", Prefetcher(get_default_cache(conta)))
+    prefetcher.cancel()
+
+    if modo == "Lote":
+        return batch_app(token, colaboradores, start_date, end_date)
+
     colaborador_id = show_employee_selector(colaboradores)
     
     if start_date > end_date:
@@ -44,14 +70,72 @@ def main_app():
     start_ms = converter_data_para_ms(datetime.combine(start_date, datetime.min.time()))
     end_ms = converter_data_para_ms(datetime.combine(end_date, datetime.max.time()))
     
-    with st.spinner("Buscando dados da API..."):
-        punches = fetch_punches_in_chunks(start_ms, end_ms, colaborador_id, token)
-        holidays = get_holidays_between(start_ms, end_ms, token)
-    
-    display_dataframes(punches, holidays, colaborador_id)
+    cache = get_default_cache(conta)
+    store = st.session_state.setdefault("day_store", DayStore())
+    if st.button("🔄 Recarregar período da API"):
+        cache.invalidate(colaborador_id, start_date, end_date)
+        store.invalidate(colaborador_id, start_date, end_date)
+
+    with st.spinner("Buscando feriados..."):
+        holidays = get_holidays_between_cached(start_ms, end_ms, token)
+
+    # Apenas os dias ainda não processados nesta sessão são buscados; cada janela é exibida ao chegar
+    processados = display_loading_preview(
+        iter_load_period(store, colaborador_id, start_date, end_date, token, holidays, cache=cache),
+        lambda: store.assemble(colaborador_id, start_date, end_date),
+    )
+    pre_adjusts = store.assemble(colaborador_id, start_date, end_date)
+
+    incompletos = store.incomplete_days(colaborador_id, start_date, end_date)
+    show_incomplete_days(incompletos)
+
+    with st.spinner("Processando dados..."):
+        # A distribuição das horas excedentes depende do período inteiro
+        adjusted = compute_adjusted(pre_adjusts)
+        display_day_minutes(pre_adjusts, adjusted)
+
+    # Só grava no arquivo histórico quando algum dia foi buscado nesta execução
+    if processados and not pre_adjusts.empty:
+        archive_report(get_default_archive(conta), EmployeeReport(colaborador_id, "", pre_adjusts, adjusted,
+                                                             dias_incompletos=tuple(incompletos)))
+
+    if show_prefetch_toggle():
+        prefetcher.schedule(token, prefetch_targets(colaboradores, colaborador_id, start_date, end_date))
+
+def batch_app(token, colaboradores, start_date, end_date):
+    from components.main_dashboard import show_batch_employee_selector, display_batch_reports, show_summary_only_toggle, show_bulk_toggle
+    from services.data_service import get_holidays_between_cached
+    from utils.utils import converter_data_para_ms, namespace_da_conta
+    from utils.punch_cache import get_default_cache
+    from utils.archive import get_default_archive
+    from utils.batch import iter_batch_reports
+
+    selecionados = show_batch_employee_selector(colaboradores)
+    somente_resumo = show_summary_only_toggle()
+    bulk = show_bulk_toggle()
+
+    if start_date > end_date:
+        return st.error("Data Inicial não pode ser maior que Data Final")
+
+    if not st.button("Gerar relatório em lote", disabled=not selecionados):
+        return
+
+    start_ms = converter_data_para_ms(datetime.combine(start_date, datetime.min.time()))
+    end_ms = converter_data_para_ms(datetime.combine(end_date, datetime.max.time()))
+
+    holidays = get_holidays_between_cached(start_ms, end_ms, token)
+    conta = namespace_da_conta(token)
+    reports = iter_batch_reports(selecionados, start_ms, end_ms, token, holidays, cache=get_default_cache(conta),
+                                 bulk=bulk, archive=get_default_archive(conta))
+    display_batch_reports(reports, len(selecionados), somente_resumo=somente_resumo)
 
 if __name__ == "__main__":
     if not st.session_state.get("authenticated"):
         show_login_form()
     else:
-        main_app()
\ No newline at end of file
+        import uuid
+        from components.main_dashboard import show_debug_panel
+        # Os eventos de métricas desta execução (e das tarefas em segundo plano) ficam marcados com a sessão
+        set_session(st.session_state.setdefault("metrics_session", uuid.uuid4().hex))
+        main_app()
+        show_debug_panel()
\ No newline at end of file
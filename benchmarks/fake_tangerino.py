@@ -0,0 +1,254 @@
+# benchmarks/fake_tangerino.py
+"""
+Servidor local que imita a API Tangerino, para testes de carga e latência.
+
+Implementa os endpoints usados por api/api.py:
+    GET /api/employer/employee/find-all
+    GET /punch/?employeeId=&startDate=&endDate=
+    GET /api/employer/holiday-calendar/?year=
+e GET /__stats com a contagem de requisições por endpoint e status.
+
+A latência, a taxa de erros e o limite de requisições por token são
+configuráveis. Os dados são gerados por benchmarks/synthetic.py.
+
+Exemplo:
+    python -m benchmarks.fake_tangerino --port 8765 --employees 50 --latency-ms 120 --rate-limit 5
+e, no .env do app:
+    TANGERINO_EMPLOYER_API_URL=http://localhost:8765/api
+    TANGERINO_PUNCH_API_URL=http://localhost:8765
+"""
+import argparse
+import bisect
+import json
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic import synthetic_employees, synthetic_holidays, synthetic_punches
+
+class FakeTangerinoConfig:
+    """Parâmetros de comportamento do servidor."""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 rate_limit: float = 0.0, retry_after: int = 1, page_size: int = 0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.page_size = page_size
+        self.seed = seed
+
+class FakeTangerinoData:
+    """Colaboradores, pontos e feriados servidos pelo servidor, indexados para filtragem rápida."""
+
+    def __init__(self, employees: int = 10, start: date = date(2024, 1, 1), end: date = date(2024, 12, 31), seed: int = 0):
+        self.employees = synthetic_employees(employees)
+        self.holidays = synthetic_holidays(start, end)
+        self.punches_by_employee: Dict[int, List[Dict]] = defaultdict(list)
+        for punch in synthetic_punches(self.employees, start, end, seed=seed):
+            self.punches_by_employee[punch["employee"]["id"]].append(punch)
+
+        # Os dias de cada colaborador estão em ordem crescente (dentro do dia, do mais
+        # recente para o mais antigo, como na API), o que permite busca binária pela data
+        self._dias = {
+            employee_id: [p["date"] for p in punches]
+            for employee_id, punches in self.punches_by_employee.items()
+        }
+        self.all_punches = sorted((p for ps in self.punches_by_employee.values() for p in ps), key=lambda p: p["dateIn"])
+
+    def punches(self, employee_id: Optional[int], start_ms: int, end_ms: int) -> List[Dict]:
+        if employee_id is None:
+            return [p for p in self.all_punches if start_ms <= p["dateIn"] <= end_ms]
+
+        punches = self.punches_by_employee.get(employee_id, [])
+        dias = self._dias.get(employee_id, [])
+        # Margem de um dia em cada ponta para diferenças de fuso
+        inicio = bisect.bisect_left(dias, (datetime.fromtimestamp(start_ms / 1000).date() - timedelta(days=1)).isoformat())
+        fim = bisect.bisect_right(dias, (datetime.fromtimestamp(end_ms / 1000).date() + timedelta(days=1)).isoformat())
+        return [p for p in punches[inicio:fim] if start_ms <= p["dateIn"] <= end_ms]
+
+class _RateLimiter:
+    """Janela deslizante de um segundo por token."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._chamadas: Dict[str, List[float]] = defaultdict(list)
+
+    def allow(self, token: str, limite: float) -> bool:
+        if limite <= 0:
+            return True
+        agora = time.monotonic()
+        with self._lock:
+            chamadas = [t for t in self._chamadas[token] if agora - t < 1.0]
+            permitido = len(chamadas) < limite
+            if permitido:
+                chamadas.append(agora)
+            self._chamadas[token] = chamadas
+            return permitido
+
+def _make_handler(server: "FakeTangerinoServer"):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body, headers: Optional[Dict[str, str]] = None) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for nome, valor in (headers or {}).items():
+                self.send_header(nome, valor)
+            self.end_headers()
+            self.wfile.write(payload)
+            server.record(urlparse(self.path).path, status, len(payload))
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            config = server.config
+
+            if url.path == "/__stats":
+                return self._send(200, server.stats())
+
+            token = self.headers.get("Authorization", "")
+            if not token.startswith("Basic "):
+                return self._send(401, {"error": "unauthorized"})
+
+            if not server.rate_limiter.allow(token, config.rate_limit):
+                return self._send(429, {"error": "too many requests"}, {"Retry-After": str(config.retry_after)})
+
+            with server.rng_lock:
+                atraso = config.latency_ms + server.rng.uniform(0, config.jitter_ms)
+                falha = server.rng.random() < config.error_rate
+            if atraso > 0:
+                time.sleep(atraso / 1000)
+            if falha:
+                return self._send(503, {"error": "service unavailable"})
+
+            if url.path.rstrip("/") == "/api/employer/employee/find-all":
+                return self._send(200, {"content": server.data.employees})
+
+            if url.path.rstrip("/") == "/api/employer/holiday-calendar":
+                year = query.get("year", "")
+                holidays = [{"date": d} for d in server.data.holidays if d.startswith(f"{year}-")]
+                return self._send(200, {"item": [{"year": year, "holidays": holidays}]})
+
+            if url.path.rstrip("/") == "/punch":
+                try:
+                    employee_id = int(query["employeeId"]) if query.get("employeeId") else None
+                    start_ms, end_ms = int(query["startDate"]), int(query["endDate"])
+                except (KeyError, ValueError):
+                    return self._send(400, {"error": "invalid parameters"})
+                return self._send(200, server.page(server.data.punches(employee_id, start_ms, end_ms), query))
+
+            return self._send(404, {"error": "not found"})
+
+    return Handler
+
+class FakeTangerinoServer:
+    """
+    Servidor HTTP em thread própria; use `start()`/`stop()` ou como context manager.
+
+    `base_url` aponta para a raiz do servidor; a API de employer fica em `base_url + "/api"`.
+    """
+
+    def __init__(self, data: FakeTangerinoData, config: Optional[FakeTangerinoConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.data = data
+        self.config = config or FakeTangerinoConfig()
+        self.rate_limiter = _RateLimiter()
+        self.rng = random.Random(self.config.seed)
+        self.rng_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._requests: Counter = Counter()
+        self._bytes = 0
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def page(self, content: List[Dict], query: Dict[str, str]) -> Dict:
+        """Monta a resposta paginada no formato do Tangerino (`content`, `totalPages`, `last`...)."""
+        size = int(query.get("size") or self.config.page_size or 0)
+        if size <= 0:
+            return {"content": content, "totalElements": len(content), "totalPages": 1, "number": 0, "size": len(content), "last": True}
+        number = int(query.get("page") or 0)
+        total_pages = max(1, -(-len(content) // size))
+        return {
+            "content": content[number * size:(number + 1) * size],
+            "totalElements": len(content),
+            "totalPages": total_pages,
+            "number": number,
+            "size": size,
+            "last": number >= total_pages - 1,
+        }
+
+    def record(self, path: str, status: int, size: int) -> None:
+        with self._stats_lock:
+            self._requests[f"{path.rstrip('/') or '/'} {status}"] += 1
+            self._bytes += size
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            return {"requests": dict(self._requests), "total": sum(self._requests.values()), "bytes": self._bytes}
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._requests.clear()
+            self._bytes = 0
+
+    def start(self) -> "FakeTangerinoServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeTangerinoServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Servidor local que imita a API Tangerino.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--employees", type=int, default=10)
+    parser.add_argument("--start", default="2024-01-01", help="Primeiro dia com pontos (AAAA-MM-DD).")
+    parser.add_argument("--end", default="2024-12-31", help="Último dia com pontos (AAAA-MM-DD).")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latência fixa de cada resposta.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Latência adicional aleatória (0 a N ms).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fração de respostas 503.")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requisições por segundo por token antes de responder 429 (0 = sem limite).")
+    parser.add_argument("--retry-after", type=int, default=1, help="Valor do cabeçalho Retry-After nas respostas 429.")
+    parser.add_argument("--page-size", type=int, default=0, help="Tamanho padrão de página do /punch/ (0 = sem paginação).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    data = FakeTangerinoData(args.employees, date.fromisoformat(args.start), date.fromisoformat(args.end), seed=args.seed)
+    config = FakeTangerinoConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit, args.retry_after, args.page_size, args.seed)
+    server = FakeTangerinoServer(data, config, args.host, args.port)
+    print(f"Servidor Tangerino falso em {server.base_url} ({args.employees} colaboradores)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+if __name__ == "__main__":
+    main()
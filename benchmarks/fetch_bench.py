@@ -0,0 +1,61 @@
+# benchmarks/fetch_bench.py
+"""
+Benchmark da busca de pontos contra o servidor Tangerino falso.
+
+Sobe benchmarks/fake_tangerino.py no próprio processo, aponta api/api.py para
+ele e mede `fetch_punches_in_chunks` com diferentes números de workers,
+reportando o tempo e as requisições recebidas pelo servidor.
+
+Exemplo:
+    python -m benchmarks.fetch_bench --months 3 --latency-ms 150 --rate-limit 5 --workers 1,2,4,8
+"""
+import argparse
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from api import api
+from benchmarks.fake_tangerino import FakeTangerinoConfig, FakeTangerinoData, FakeTangerinoServer
+from utils.utils import converter_data_para_ms, fetch_punches_in_chunks
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark da busca de pontos contra o servidor Tangerino falso.")
+    parser.add_argument("--months", type=int, default=3, help="Meses buscados para um colaborador.")
+    parser.add_argument("--workers", default="1,2,4,8", help="Valores de max_workers separados por vírgula.")
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Limite do servidor em requisições/s por token (0 = sem limite).")
+    parser.add_argument("--client-rps", type=float, default=api.MAX_REQUESTS_PER_SECOND, help="Limite do cliente (TANGERINO_MAX_RPS).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    start = date(2024, 1, 1)
+    end = (pd.Timestamp(start) + pd.DateOffset(months=args.months)).date() - timedelta(days=1)
+    data = FakeTangerinoData(1, start, end, seed=args.seed)
+    config = FakeTangerinoConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit, seed=args.seed)
+    colaborador_id = data.employees[0]["id"]
+
+    start_ms = converter_data_para_ms(datetime.combine(start, datetime.min.time()))
+    end_ms = converter_data_para_ms(datetime.combine(end, datetime.max.time()))
+
+    api.MAX_REQUESTS_PER_SECOND = args.client_rps
+    print(f"{'workers':>7} {'tempo (s)':>10} {'pontos':>7} {'requisições':>12}  status")
+    with FakeTangerinoServer(data, config) as server:
+        api.configure_base_urls(server.base_url + "/api", server.base_url)
+        for workers in (int(w) for w in args.workers.split(",")):
+            # Cada rodada usa um token novo para não herdar o limitador da anterior
+            token = f"bench-{workers}"
+            server.reset_stats()
+            inicio = time.perf_counter()
+            punches = fetch_punches_in_chunks(start_ms, end_ms, colaborador_id, token, max_workers=workers)
+            tempo = time.perf_counter() - inicio
+            stats = server.stats()
+            status = ", ".join(f"{k}: {v}" for k, v in sorted(stats["requests"].items()))
+            print(f"{workers:>7} {tempo:>10.3f} {len(punches):>7} {stats['total']:>12}  {status}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+# benchmarks/pipeline_bench.py
+"""
+Benchmark do pipeline de processamento de pontos com dados sintéticos.
+
+Mede tempo e pico de memória de cada etapa (format_punches_as_dataframe,
+calcular_intervalo, get_adjusts, adjusted_punches, construção dos Stylers, os
+destaques pré-calculados usados com st.dataframe e o caminho numérico em
+minutos) para tamanhos de "colaboradores x meses".
+
+Exemplos:
+    python -m benchmarks.pipeline_bench --sizes 1x1,10x3,50x12 --output benchmarks/results/base.json
+    python -m benchmarks.pipeline_bench --sizes 1x1,10x3 --compare benchmarks/results/base.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_employees, synthetic_holidays, synthetic_punches
+from utils.transformToDataframe import (
+    adjusted_punches, build_day_minutes, calcular_intervalo, compute_adjusted, compute_adjusts,
+    format_punches_as_dataframe, get_adjusts, render_day_minutes,
+)
+
+DEFAULT_SIZES = "1x1,10x3,50x12"
+
+# Limite de linhas ao renderizar os Stylers (o HTML de tabelas enormes domina tudo)
+DEFAULT_STYLER_MAX_ROWS = 5000
+
+# Linhas por página no caminho do st.dataframe (mesmo valor do dashboard)
+DEFAULT_PAGE_SIZE = 500
+
+# Tolerância padrão antes de considerar uma etapa como regressão
+DEFAULT_THRESHOLD = 0.20
+
+def parse_size(texto: str) -> Tuple[int, int]:
+    colaboradores, meses = texto.lower().split("x")
+    return int(colaboradores), int(meses)
+
+def _sort_by_data(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df["Data"] = pd.to_datetime(df["Data"], format="%d/%m/%Y")
+    return df.sort_values("Data")
+
+def stage_format(ctx: Dict) -> int:
+    ctx["df_punches"] = _sort_by_data(format_punches_as_dataframe(ctx["punches"], ctx["holidays"]))
+    return len(ctx["df_punches"])
+
+def stage_intervalo(ctx: Dict) -> int:
+    return len(ctx["df_punches"]["Pontos"].map(calcular_intervalo))
+
+def stage_get_adjusts(ctx: Dict) -> int:
+    ctx["error_df"] = get_adjusts(ctx["df_punches"])
+    return len(ctx["error_df"])
+
+def stage_adjusted_punches(ctx: Dict) -> int:
+    ctx["adjusted_df"] = adjusted_punches(ctx["error_df"])
+    return len(ctx["adjusted_df"])
+
+def stage_styler(ctx: Dict) -> int:
+    from components.table_styles import build_stylers
+    n = ctx["styler_max_rows"]
+    styled_error, styled_adjusted = build_stylers(ctx["error_df"].head(n), ctx["adjusted_df"].head(n))
+    # O Styler só calcula os estilos ao gerar o HTML
+    styled_error.to_html()
+    styled_adjusted.to_html()
+    return min(len(ctx["error_df"]), n)
+
+def stage_css_masks(ctx: Dict) -> int:
+    from components.table_styles import adjusted_css, apply_css, error_css
+    # Caminho do st.dataframe: CSS da tabela toda calculado de uma vez, Styler só na primeira página
+    n = ctx["page_size"]
+    for df, css in ((ctx["error_df"], error_css(ctx["error_df"])), (ctx["adjusted_df"], adjusted_css(ctx["adjusted_df"]))):
+        apply_css(df.head(n), css)._compute()
+    return len(ctx["error_df"])
+
+def stage_build_day_minutes(ctx: Dict) -> int:
+    ctx["ir"] = _sort_by_data(build_day_minutes(ctx["punches"], ctx["holidays"]))
+    return len(ctx["ir"])
+
+def stage_compute_adjusts(ctx: Dict) -> int:
+    ctx["pre_ir"] = compute_adjusts(ctx["ir"])
+    return len(ctx["pre_ir"])
+
+def stage_compute_adjusted(ctx: Dict) -> int:
+    ctx["adjusted_ir"] = compute_adjusted(ctx["pre_ir"])
+    return len(ctx["adjusted_ir"])
+
+def stage_render_day_minutes(ctx: Dict) -> int:
+    return len(render_day_minutes(ctx["pre_ir"])) + len(render_day_minutes(ctx["adjusted_ir"]))
+
+# Etapas na ordem do pipeline; cada uma grava seu resultado no contexto e devolve as linhas produzidas
+STAGES: List[Tuple[str, Callable[[Dict], int]]] = [
+    ("format_punches_as_dataframe", stage_format),
+    ("calcular_intervalo", stage_intervalo),
+    ("get_adjusts", stage_get_adjusts),
+    ("adjusted_punches", stage_adjusted_punches),
+    ("styler_render", stage_styler),
+    ("css_masks", stage_css_masks),
+    ("build_day_minutes", stage_build_day_minutes),
+    ("compute_adjusts", stage_compute_adjusts),
+    ("compute_adjusted", stage_compute_adjusted),
+    ("render_day_minutes", stage_render_day_minutes),
+]
+
+def _measure(stage: Callable[[Dict], int], ctx: Dict, repeat: int, memory: bool) -> Dict:
+    tempos = []
+    rows = 0
+    for _ in range(repeat):
+        gc.collect()
+        inicio = time.perf_counter()
+        rows = stage(ctx)
+        tempos.append(time.perf_counter() - inicio)
+
+    peak_mb = None
+    if memory:
+        # Execução separada: o tracemalloc deixa o código bem mais lento
+        gc.collect()
+        tracemalloc.start()
+        stage(ctx)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = round(pico / 1024 / 1024, 3)
+
+    return {"seconds": round(min(tempos), 6), "peak_mb": peak_mb, "rows": rows}
+
+def run_size(colaboradores: int, meses: int, repeat: int, memory: bool, styler_max_rows: int, seed: int) -> List[Dict]:
+    start = date(2024, 1, 1)
+    end = (pd.Timestamp(start) + pd.DateOffset(months=meses)).date() - timedelta(days=1)
+    ctx = {
+        "punches": synthetic_punches(synthetic_employees(colaboradores), start, end, seed=seed),
+        "holidays": synthetic_holidays(start, end),
+        "styler_max_rows": styler_max_rows,
+        "page_size": DEFAULT_PAGE_SIZE,
+    }
+    size = f"{colaboradores}x{meses}"
+    resultados = []
+
+    for nome, stage in STAGES:
+        try:
+            medida = _measure(stage, ctx, repeat, memory)
+        except ImportError as e:
+            print(f"  {size:>8} {nome:<28} ignorada ({e})", file=sys.stderr)
+            continue
+        resultados.append({"size": size, "employees": colaboradores, "months": meses, "punches": len(ctx["punches"]), "stage": nome, **medida})
+        pico = "" if medida["peak_mb"] is None else f"{medida['peak_mb']:>10.1f} MB"
+        print(f"  {size:>8} {nome:<28} {medida['seconds']:>10.4f} s {pico} {medida['rows']:>9} linhas", file=sys.stderr)
+
+    return resultados
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return ""
+
+def compare(atual: List[Dict], baseline_path: str, threshold: float) -> bool:
+    """Compara com um resultado salvo e retorna True se alguma etapa ficou mais lenta que o limite."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["size"], r["stage"]): r for r in json.load(f)["results"]}
+
+    regressao = False
+    print(f"\n{'tamanho':>8} {'etapa':<28} {'base (s)':>10} {'atual (s)':>10} {'razão':>7}")
+    for r in atual:
+        base = baseline.get((r["size"], r["stage"]))
+        if base is None or not base["seconds"]:
+            continue
+        razao = r["seconds"] / base["seconds"]
+        marca = " <-- regressão" if razao > 1 + threshold else ""
+        regressao |= bool(marca)
+        print(f"{r['size']:>8} {r['stage']:<28} {base['seconds']:>10.4f} {r['seconds']:>10.4f} {razao:>7.2f}{marca}")
+    return regressao
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline de pontos com dados sintéticos.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Tamanhos 'colaboradoresxmeses' separados por vírgula (ex.: 1x1,500x12).")
+    parser.add_argument("--repeat", type=int, default=3, help="Execuções por etapa; vale o menor tempo.")
+    parser.add_argument("--no-memory", action="store_true", help="Não mede o pico de memória.")
+    parser.add_argument("--styler-max-rows", type=int, default=DEFAULT_STYLER_MAX_ROWS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: benchmarks/results/<data>.json).")
+    parser.add_argument("--compare", help="Resultado anterior (JSON) para comparação.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Aumento relativo de tempo tolerado na comparação.")
+    args = parser.parse_args(argv)
+
+    resultados = []
+    for texto in args.sizes.split(","):
+        colaboradores, meses = parse_size(texto)
+        resultados.extend(run_size(colaboradores, meses, args.repeat, not args.no_memory, args.styler_max_rows, args.seed))
+
+    output = args.output or os.path.join("benchmarks", "results", f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "repeat": args.repeat,
+                "seed": args.seed,
+                "styler_max_rows": args.styler_max_rows,
+            },
+            "results": resultados,
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados salvos em {output}", file=sys.stderr)
+
+    if args.compare and compare(resultados, args.compare, args.threshold):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+# benchmarks/startup.py
+"""
+Tempo de importação na partida do app (cold start), por módulo.
+
+Os imports de app.py são lidos do próprio arquivo e separados em dois grupos:
+
+- login: imports do topo do módulo, executados antes da tela de login;
+- app: todos os imports, inclusive os feitos dentro de `main_app`/`batch_app`.
+
+Cada grupo é importado em um processo Python novo com `-X importtime`; o
+relatório mostra o tempo total e os módulos de primeiro nível que mais pesam
+(sem os já carregados pelo interpretador vazio).
+
+Exemplos:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --output benchmarks/results/startup-base.json
+    python -m benchmarks.startup --compare benchmarks/results/startup-base.json --max-login-ms 400
+"""
+import argparse
+import ast
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# Tolerância padrão antes de considerar um grupo ou módulo como regressão
+DEFAULT_THRESHOLD = 0.20
+
+# Módulos abaixo deste tempo (ms) não entram na comparação: a variação é maior que o próprio tempo
+MIN_COMPARE_MS = 5.0
+
+def app_imports(path: str = APP_PATH) -> Dict[str, List[str]]:
+    """
+    Módulos importados por app.py, por grupo ("login" e "app").
+
+    Returns:
+        Dict[str, List[str]]: Nomes de módulos na ordem em que aparecem no arquivo.
+    """
+    with open(path, encoding="utf-8") as f:
+        arvore = ast.parse(f.read(), filename=path)
+
+    def modulos(nos) -> List[str]:
+        nomes = []
+        for no in nos:
+            if isinstance(no, ast.Import):
+                nomes.extend(alias.name for alias in no.names)
+            elif isinstance(no, ast.ImportFrom) and no.module and not no.level:
+                nomes.append(no.module)
+        return list(dict.fromkeys(nomes))
+
+    return {"login": modulos(arvore.body), "app": modulos(ast.walk(arvore))}
+
+def parse_importtime(saida: str) -> List[Tuple[int, str, float, float]]:
+    """
+    Interpreta a saída de `-X importtime`.
+
+    Returns:
+        List[Tuple[int, str, float, float]]: (nível de aninhamento, módulo, próprio em ms, acumulado em ms).
+    """
+    linhas = []
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        proprio, acumulado, nome = linha[len("import time:"):].split("|")
+        nivel = (len(nome) - len(nome.lstrip()) - 1) // 2
+        linhas.append((nivel, nome.strip(), int(proprio) / 1000, int(acumulado) / 1000))
+    return linhas
+
+def _importtime(codigo: str, cwd: str) -> Tuple[subprocess.CompletedProcess, List[Tuple[int, str, float, float]]]:
+    processo = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo], cwd=cwd, capture_output=True, text=True)
+    return processo, parse_importtime(processo.stderr)
+
+def measure_group(modulos: List[str], cwd: str, ja_carregados: Set[str]) -> Dict:
+    """
+    Importa `modulos` em um processo novo e mede o tempo total e o de cada módulo de primeiro nível.
+
+    Returns:
+        Dict: "seconds" (tempo total dos imports), "modules" ({módulo: ms acumulados}) e "error" (ou None).
+    """
+    codigo = ";".join([
+        "import time as _t",
+        "_inicio = _t.perf_counter()",
+        *(f"import {m}" for m in modulos),
+        "print(_t.perf_counter() - _inicio)",
+    ])
+    processo, linhas = _importtime(codigo, cwd)
+    if processo.returncode != 0:
+        erro = processo.stderr.strip().splitlines()[-1] if processo.stderr.strip() else f"código {processo.returncode}"
+        return {"seconds": None, "modules": {}, "error": erro}
+
+    modulos_ms = {nome: acumulado for nivel, nome, _, acumulado in linhas if nivel == 0 and nome not in ja_carregados}
+    return {"seconds": float(processo.stdout.strip().splitlines()[-1]), "modules": modulos_ms, "error": None}
+
+def run(repeat: int, cwd: str) -> Dict[str, Dict]:
+    """Mede cada grupo `repeat` vezes; vale a execução mais rápida."""
+    _, base = _importtime("pass", cwd)
+    ja_carregados = {nome for _, nome, _, _ in base}
+
+    resultados = {}
+    for grupo, modulos in app_imports().items():
+        medidas = [measure_group(modulos, cwd, ja_carregados) for _ in range(repeat)]
+        validas = [m for m in medidas if m["error"] is None]
+        resultados[grupo] = min(validas, key=lambda m: m["seconds"]) if validas else medidas[0]
+        resultados[grupo]["imports"] = modulos
+    return resultados
+
+def report(resultados: Dict[str, Dict], top: int) -> None:
+    for grupo, medida in resultados.items():
+        if medida["error"]:
+            print(f"{grupo:<6} erro: {medida['error']}", file=sys.stderr)
+            continue
+        print(f"{grupo:<6} {medida['seconds'] * 1000:>9.1f} ms", file=sys.stderr)
+        for nome, ms in sorted(medida["modules"].items(), key=lambda item: -item[1])[:top]:
+            print(f"       {ms:>9.1f} ms  {nome}", file=sys.stderr)
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return ""
+
+def compare(atual: Dict[str, Dict], baseline_path: str, threshold: float) -> bool:
+    """Compara com um resultado salvo e retorna True se algum grupo ou módulo ficou mais lento que o limite."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressao = False
+    print(f"\n{'grupo':<6} {'módulo':<40} {'base (ms)':>10} {'atual (ms)':>10} {'razão':>7}")
+    for grupo, medida in atual.items():
+        base = baseline.get(grupo)
+        if medida["error"] or not base or base.get("error"):
+            continue
+        pares = [("(total)", base["seconds"] * 1000, medida["seconds"] * 1000)]
+        pares += [(nome, base["modules"].get(nome, 0.0), ms) for nome, ms in medida["modules"].items()
+                  if ms >= MIN_COMPARE_MS]
+        for nome, antes, depois in pares:
+            razao = depois / antes if antes else float("inf")
+            marca = " <-- regressão" if razao > 1 + threshold else ""
+            regressao |= bool(marca)
+            if marca or nome == "(total)":
+                print(f"{grupo:<6} {nome:<40} {antes:>10.1f} {depois:>10.1f} {razao:>7.2f}{marca}")
+    return regressao
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Tempo de importação na partida do app, por módulo.")
+    parser.add_argument("--repeat", type=int, default=3, help="Execuções por grupo; vale a mais rápida.")
+    parser.add_argument("--top", type=int, default=15, help="Módulos exibidos por grupo.")
+    parser.add_argument("--output", help="Arquivo JSON de saída.")
+    parser.add_argument("--compare", help="Resultado anterior (JSON) para comparação.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Aumento relativo de tempo tolerado na comparação.")
+    parser.add_argument("--max-login-ms", type=float, help="Tempo máximo dos imports da tela de login; acima dele termina com código 1.")
+    args = parser.parse_args(argv)
+
+    resultados = run(args.repeat, os.path.dirname(APP_PATH))
+    report(resultados, args.top)
+
+    if args.output:
+        if os.path.dirname(args.output):
+            os.makedirs(os.path.dirname(args.output), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "meta": {
+                    "created_at": datetime.now().isoformat(timespec="seconds"),
+                    "commit": _git_commit(),
+                    "python": platform.python_version(),
+                    "repeat": args.repeat,
+                },
+                "results": resultados,
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\nResultados salvos em {args.output}", file=sys.stderr)
+
+    falhou = any(m["error"] for m in resultados.values())
+    if args.compare and compare(resultados, args.compare, args.threshold):
+        falhou = True
+    login: Optional[Dict] = resultados.get("login")
+    if args.max_login_ms is not None and login and login["seconds"] is not None and login["seconds"] * 1000 > args.max_login_ms:
+        print(f"\nImports da tela de login: {login['seconds'] * 1000:.1f} ms (limite {args.max_login_ms:.1f} ms)", file=sys.stderr)
+        falhou = True
+    return 1 if falhou else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# benchmarks/synthetic.py
+"""
+Gerador de pontos sintéticos no formato do endpoint /punch/ do Tangerino.
+
+Cada registro tem os mesmos campos usados pelo pipeline (`employee`, `date`,
+`dateIn`, `dateOut`, `adjust`, `adjustmentReason`). Os dias seguem uma jornada
+típica (entrada, almoço, saída), com variações que exercitam as regras de
+ajuste: batidas faltando, dias com um só par, sábados, compensação de feriado,
+intervalos curtos e horas extras.
+"""
+import random
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+BRAZIL_TZ = ZoneInfo("America/Sao_Paulo")
+
+NOMES = ["Ana", "Bruno", "Carla", "Diego", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela", "João"]
+SOBRENOMES = ["Silva", "Souza", "Oliveira", "Santos", "Lima", "Pereira", "Costa", "Almeida", "Ferreira", "Gomes"]
+
+def _ms(dia: date, minuto: int, segundo: int = 0) -> int:
+    local = datetime(dia.year, dia.month, dia.day, tzinfo=BRAZIL_TZ) + timedelta(minutes=minuto, seconds=segundo)
+    return int(local.astimezone(timezone.utc).timestamp() * 1000)
+
+def synthetic_employees(n: int, first_id: int = 100000) -> List[Dict]:
+    """Colaboradores no formato de `employee/find-all`."""
+    return [
+        {"id": first_id + i, "name": f"{NOMES[i % len(NOMES)]} {SOBRENOMES[(i // len(NOMES)) % len(SOBRENOMES)]} {i}"}
+        for i in range(n)
+    ]
+
+def synthetic_day(rng: random.Random, employee: Dict, dia: date, next_id: List[int]) -> List[Dict]:
+    """Gera os pontos de um colaborador em um dia, do mais recente para o mais antigo (como a API)."""
+    sabado, domingo = dia.weekday() == 5, dia.weekday() == 6
+    if domingo or (sabado and rng.random() < 0.8) or rng.random() < 0.04:
+        return []
+
+    adjust = rng.random() < 0.05
+    reason: Optional[Dict] = None
+    if adjust:
+        reason = {"description": "COMPENSAÇÃO FERIADO" if rng.random() < 0.4 else "ESQUECIMENTO"}
+
+    entrada = 7 * 60 + 30 + rng.randint(-30, 45)
+    if sabado or rng.random() < 0.05:
+        pares = [(entrada, entrada + rng.randint(180, 300))]
+    else:
+        saida_almoco = 12 * 60 + rng.randint(-30, 30)
+        volta_almoco = saida_almoco + rng.choice([rng.randint(30, 57), rng.randint(58, 90), rng.randint(58, 90)])
+        saida = volta_almoco + rng.randint(220, 420)
+        pares = [(entrada, saida_almoco), (volta_almoco, saida)]
+        if rng.random() < 0.05:
+            pares.append((saida + rng.randint(20, 60), saida + rng.randint(90, 180)))
+
+    registros = []
+    for i, (minuto_entrada, minuto_saida) in enumerate(pares):
+        sem_saida = i == len(pares) - 1 and rng.random() < 0.02
+        registros.append({
+            "id": next_id[0],
+            "employee": {"id": employee["id"], "name": employee["name"]},
+            "date": dia.isoformat(),
+            "dateIn": _ms(dia, minuto_entrada, rng.randint(0, 59)),
+            "dateOut": None if sem_saida else _ms(dia, minuto_saida, rng.randint(0, 59)),
+            "adjust": adjust,
+            "adjustmentReason": reason,
+        })
+        next_id[0] += 1
+
+    return list(reversed(registros))
+
+def synthetic_punches(employees: List[Dict], start: date, end: date, seed: int = 0) -> List[Dict]:
+    """
+    Gera os pontos de vários colaboradores entre duas datas (inclusive).
+
+    Args:
+        employees (List[Dict]): Colaboradores (com "id" e "name").
+        start (date): Primeiro dia.
+        end (date): Último dia.
+        seed (int): Semente, para resultados reprodutíveis.
+
+    Returns:
+        List[Dict]: Registros de ponto agrupados por colaborador e ordenados por dia.
+    """
+    rng = random.Random(seed)
+    next_id = [1]
+    punches = []
+    for employee in employees:
+        dia = start
+        while dia <= end:
+            punches.extend(synthetic_day(rng, employee, dia, next_id))
+            dia += timedelta(days=1)
+    return punches
+
+def synthetic_holidays(start: date, end: date) -> List[str]:
+    """Feriados nacionais fixos dentro do período, no formato "YYYY-MM-DD"."""
+    fixos = ["01-01", "04-21", "05-01", "09-07", "10-12", "11-02", "11-15", "12-25"]
+    return [f"{ano}-{d}" for ano in range(start.year, end.year + 1) for d in fixos if start.isoformat() <= f"{ano}-{d}" <= end.isoformat()]
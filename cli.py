@@ -0,0 +1,200 @@
+# cli.py
+"""
+Exportação em lote sem Streamlit.
+
+Exemplo:
+    python cli.py --inicio 2025-05-01 --fim 2025-05-31 --colaboradores todos --saida fechamento_maio --formato xlsx
+"""
+import argparse
+import getpass
+import os
+import sys
+from datetime import datetime
+
+from api.api import get_colaboradores, get_holidays_between
+from services.auth_service import TokenVault
+from utils import metrics
+from utils.archive import get_default_archive
+from utils.batch import BATCH_WORKERS, iter_batch_reports
+from utils.summary import render_summary, summarize_day_minutes
+from utils.punch_cache import get_default_cache
+from utils.transformToDataframe import render_day_minutes
+from utils.utils import converter_data_para_ms, formatar_faixas_de_dias, namespace_da_conta
+
+FORMATOS = ("csv", "parquet", "xlsx")
+
+class TableWriter:
+    """
+    Grava uma tabela em partes, à medida que cada colaborador termina.
+
+    CSV e XLSX recebem as datas no formato DD/MM/AAAA, como no dashboard; o Parquet
+    mantém as datas como timestamp.
+    """
+
+    def __init__(self, path: str, formato: str):
+        self.path = path
+        self.formato = formato
+        self._linhas = 0
+        self._writer = None
+        self._schema = None
+
+    def write(self, df) -> None:
+        if df.empty:
+            return
+
+        if self.formato in ("csv", "xlsx"):
+            df = df.assign(**{c: df[c].dt.strftime("%d/%m/%Y") for c in df.select_dtypes("datetime").columns})
+
+        if self.formato == "csv":
+            df.to_csv(self.path, mode="w" if self._linhas == 0 else "a", header=self._linhas == 0, index=False)
+        elif self.formato == "xlsx":
+            if self._writer is None:
+                import pandas as pd
+                self._writer = pd.ExcelWriter(self.path, engine="openpyxl")
+            df.to_excel(self._writer, index=False, header=self._linhas == 0, startrow=self._linhas + 1 if self._linhas else 0)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            self._writer.write_table(table.cast(self._schema))
+
+        self._linhas += len(df)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+def verificar_dependencias(formato: str) -> None:
+    """Falha cedo quando a biblioteca opcional do formato não está instalada."""
+    modulo = {"parquet": "pyarrow", "xlsx": "openpyxl"}.get(formato)
+    if modulo is None:
+        return
+    try:
+        __import__(modulo)
+    except ImportError:
+        sys.exit(f"O formato '{formato}' requer o pacote '{modulo}' (pip install {modulo}).")
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Exporta as tabelas de ponto (pré ajustes e ajustadas) sem abrir o dashboard.")
+    parser.add_argument("--token", default=os.getenv("TANGERINO_TOKEN"), help="Token da API Tangerino (padrão: variável TANGERINO_TOKEN).")
+    parser.add_argument("--cofre", help="Arquivo com o cofre de tokens (services/auth_service.py); cada conta gera os seus arquivos.")
+    parser.add_argument("--contas", help="Contas do cofre separadas por vírgula (padrão: todas).")
+    parser.add_argument("--inicio", required=True, type=lambda s: datetime.strptime(s, "%Y-%m-%d").date(), help="Data inicial (AAAA-MM-DD).")
+    parser.add_argument("--fim", required=True, type=lambda s: datetime.strptime(s, "%Y-%m-%d").date(), help="Data final (AAAA-MM-DD).")
+    parser.add_argument("--colaboradores", default="todos", help="IDs separados por vírgula ou 'todos'.")
+    parser.add_argument("--saida", required=True, help="Prefixo dos arquivos gerados.")
+    parser.add_argument("--formato", choices=FORMATOS, default="csv")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="Colaboradores processados em paralelo.")
+    parser.add_argument("--sem-cache", action="store_true", help="Ignora o cache local de pontos.")
+    parser.add_argument("--resumo", action="store_true", help="Grava também os totais do período por colaborador.")
+    parser.add_argument("--sem-arquivo", action="store_true", help="Não grava os dias processados no arquivo Parquet histórico.")
+    parser.add_argument("--metricas", help="Grava as métricas de requisições e etapas neste arquivo JSON.")
+    parser.add_argument("--log-level", default=None, help="Nível do logging (padrão: variável LOG_LEVEL ou WARNING).")
+    parser.add_argument("--empresa-inteira", action="store_true",
+                        help="Busca os pontos da empresa inteira de uma vez (sem employeeId), em vez de colaborador a colaborador.")
+    return parser.parse_args(argv)
+
+def abrir_cofre(path: str) -> TokenVault:
+    """
+    Abre o cofre com uma única derivação de chave.
+
+    Nome e senha vêm de TANGERINO_COFRE_NOME e TANGERINO_COFRE_SENHA ou são pedidos no terminal.
+    """
+    with open(path, encoding="utf-8") as f:
+        blob = f.read().strip()
+    name = os.getenv("TANGERINO_COFRE_NOME") or input("Nome: ")
+    password = os.getenv("TANGERINO_COFRE_SENHA") or getpass.getpass("Senha: ")
+    try:
+        return TokenVault.unlock(blob, name, password)
+    except ValueError as e:
+        sys.exit(str(e))
+
+def exportar(args: argparse.Namespace, token: str, saida: str) -> int:
+    """
+    Gera os arquivos de uma conta.
+
+    Returns:
+        int: Número de colaboradores com erro ou dias incompletos.
+    """
+    colaboradores = get_colaboradores(token)
+    if args.colaboradores != "todos":
+        ids = {int(i) for i in args.colaboradores.split(",") if i.strip()}
+        colaboradores = [c for c in colaboradores if c["id"] in ids]
+    if not colaboradores:
+        print(f"{saida}: nenhum colaborador encontrado.", file=sys.stderr)
+        return 1
+
+    start_ms = converter_data_para_ms(datetime.combine(args.inicio, datetime.min.time()))
+    end_ms = converter_data_para_ms(datetime.combine(args.fim, datetime.max.time()))
+    holidays = get_holidays_between(start_ms, end_ms, token)
+    # Cada conta tem cache e arquivo próprios: IDs de colaboradores podem se repetir entre empresas
+    conta = namespace_da_conta(token)
+    cache = None if args.sem_cache else get_default_cache(conta)
+    archive = None if args.sem_arquivo else get_default_archive(conta)
+
+    pre_writer = TableWriter(f"{saida}_pre_ajustes.{args.formato}", args.formato)
+    adjusted_writer = TableWriter(f"{saida}_ajustados.{args.formato}", args.formato)
+    summary_writer = TableWriter(f"{saida}_resumo.{args.formato}", args.formato) if args.resumo else None
+    falhas = 0
+
+    try:
+        reports = iter_batch_reports(colaboradores, start_ms, end_ms, token, holidays, max_workers=args.workers, cache=cache,
+                                     bulk=args.empresa_inteira, archive=archive)
+        for n, report in enumerate(reports, start=1):
+            if report.erro:
+                falhas += 1
+                print(f"[{n}/{len(colaboradores)}] {report.nome}: erro - {report.erro}", file=sys.stderr)
+                continue
+            pre_writer.write(render_day_minutes(report.pre_adjusts))
+            adjusted_writer.write(render_day_minutes(report.adjusted))
+            if summary_writer is not None:
+                summary_writer.write(render_summary(summarize_day_minutes(report.pre_adjusts, report.adjusted)))
+            print(f"[{n}/{len(colaboradores)}] {report.nome}: {len(report.adjusted)} dias", file=sys.stderr)
+            if report.dias_incompletos:
+                falhas += 1
+                print(f"    dias incompletos: {formatar_faixas_de_dias(list(report.dias_incompletos))}", file=sys.stderr)
+    finally:
+        pre_writer.close()
+        adjusted_writer.close()
+        if summary_writer is not None:
+            summary_writer.close()
+
+    return falhas
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    metrics.configure_logging(args.log_level)
+
+    if not (args.token or args.cofre):
+        sys.exit("Token não informado. Use --token, --cofre ou defina TANGERINO_TOKEN.")
+    if args.inicio > args.fim:
+        sys.exit("Data Inicial não pode ser maior que Data Final")
+    verificar_dependencias(args.formato)
+
+    if args.cofre:
+        vault = abrir_cofre(args.cofre)
+        contas = [c.strip() for c in args.contas.split(",") if c.strip()] if args.contas else vault.accounts
+        desconhecidas = [c for c in contas if c not in vault.tokens]
+        if desconhecidas:
+            sys.exit(f"Contas não encontradas no cofre: {', '.join(desconhecidas)}")
+        # Com mais de uma conta, cada uma grava em <saida>_<conta>_*
+        alvos = [(vault.token(c), f"{args.saida}_{c}" if len(contas) > 1 else args.saida) for c in contas]
+    else:
+        alvos = [(args.token, args.saida)]
+
+    falhas = 0
+    try:
+        for token, saida in alvos:
+            falhas += exportar(args, token, saida)
+    finally:
+        if args.metricas:
+            metrics.dump(args.metricas)
+
+    return 1 if falhas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,32 @@
 import streamlit as st
 from streamlit_js_eval import streamlit_js_eval
-from services.auth_service import encrypt_token, decrypt_token
+from services.auth_service import DEFAULT_ACCOUNT, TokenVault
+
+def open_session(vault: TokenVault, account=None):
+    """Guarda o cofre aberto na sessão: reruns e trocas de conta não repetem a derivação da chave."""
+    st.session_state.vault = vault
+    st.session_state.account = account if account is not None else vault.accounts[0]
+    st.session_state.token = vault.token(st.session_state.account)
+    st.session_state.authenticated = True
+
+def save_vault(vault: TokenVault):
+    # Salva o cofre criptografado no localStorage
+    streamlit_js_eval(js_expressions=f"localStorage.setItem('auth_token', '{vault.seal()}')", key="set_token")
+
+def show_account_selector():
+    """Seleção da conta na barra lateral, quando o cofre tem mais de um token."""
+    vault = st.session_state.get("vault")
+    if vault is None or len(vault.accounts) < 2:
+        return
+    account = st.sidebar.selectbox("🏢 Conta", options=vault.accounts, index=vault.accounts.index(st.session_state.account))
+    if account != st.session_state.account:
+        # Os dados já processados e o pré-carregamento são da conta anterior
+        st.session_state.pop("day_store", None)
+        prefetcher = st.session_state.pop("prefetcher", None)
+        if prefetcher is not None:
+            prefetcher.cancel()
+        open_session(vault, account)
+        st.rerun()
 
 def show_login_form():
     # st.set_page_config(page_title="Login", layout="centered")
@@ -15,6 +41,10 @@ def show_login_form():
         password = st.text_input("🔑 Senha", type="password")
 
         if encrypted_token:
+            with st.expander("➕ Adicionar outra conta (opcional)"):
+                new_account = st.text_input("🏢 Conta")
+                new_token = st.text_input("🔐 Token da conta", type="password")
+
             col1, col2 = st.columns(2)
             with col1:
                 submit = st.form_submit_button("Entrar")
@@ -23,13 +53,23 @@ def show_login_form():
 
             if submit:
                 try:
-                    decrypted = decrypt_token(encrypted_token, name, password)
-                    st.session_state.authenticated = True
-                    st.session_state.token = decrypted
+                    vault = TokenVault.unlock(encrypted_token, name, password)
+                except ValueError:
+                    st.error("❌ Credenciais inválidas ou token corrompido.")
+                else:
+                    save = False
+                    if vault.needs_upgrade:
+                        # Regrava blobs antigos (ou com menos iterações) no formato atual
+                        vault = vault.upgraded(name, password)
+                        save = True
+                    if new_account and new_token:
+                        vault.add(new_account, new_token)
+                        save = True
+                    if save:
+                        save_vault(vault)
+                    open_session(vault)
                     st.success("✅ Login realizado!")
                     st.rerun()
-                except Exception as e:
-                    st.error("❌ Credenciais inválidas ou token corrompido.")
 
             if clear:
                 streamlit_js_eval(js_expressions="localStorage.removeItem('auth_token')", key="clear_token")
@@ -37,6 +77,7 @@ def show_login_form():
 
         else:
             token = st.text_input("🔐 Token", type="password")
+            account = st.text_input("🏢 Conta (opcional)", placeholder=DEFAULT_ACCOUNT)
             submit = st.form_submit_button("Entrar")
 
             if submit:
@@ -44,12 +85,10 @@ def show_login_form():
                     st.error("⚠️ Preencha todos os campos.")
                 else:
                     try:
-                        encrypted = encrypt_token(token, name, password)
-                        # Salva o token criptografado no localStorage
-                        streamlit_js_eval(js_expressions=f"localStorage.setItem('auth_token', '{encrypted}')", key="set_token")
-                        st.session_state.authenticated = True
-                        st.session_state.token = token
+                        vault = TokenVault.create(name, password, {account or DEFAULT_ACCOUNT: token})
+                        save_vault(vault)
+                        open_session(vault)
                         st.success("✅ Login realizado! Recarregando...")
                         st.rerun()
                     except Exception as e:
-                        st.error("❌ Erro ao criptografar o token.")
\ No newline at end of file
+                        st.error("❌ Erro ao criptografar o token.")
@@ -1,8 +1,28 @@
 # components/main_dashboard.py
+import json
+import time
 import streamlit as st
 from datetime import datetime
-from utils.transformToDataframe import format_punches_as_dataframe, get_adjusts, adjusted_punches
-import pandas as pd
+from utils import metrics
+from utils.transformToDataframe import process_day_minutes, render_day_minutes
+from utils.batch import consolidate_reports
+from utils.summary import render_summary, summarize_day_minutes, summarize_reports
+from utils.utils import formatar_faixas_de_dias
+from components.table_styles import adjusted_css, apply_css, error_css
+
+# Tabelas com mais linhas que isto são exibidas em páginas
+TABLE_PAGE_SIZE = 500
+
+# Intervalo mínimo entre atualizações da prévia durante a busca
+PREVIEW_INTERVAL_SECONDS = 1.0
+
+# Formatação das colunas no st.dataframe (a Data continua datetime64, ordenável)
+COLUMN_CONFIG = {
+    "ID colaborador": st.column_config.NumberColumn("ID colaborador", format="%d"),
+    "Data": st.column_config.DateColumn("Data", format="DD/MM/YYYY"),
+    "Início": st.column_config.DateColumn("Início", format="DD/MM/YYYY"),
+    "Fim": st.column_config.DateColumn("Fim", format="DD/MM/YYYY"),
+}
 
 def show_date_selector():
     col1, col2 = st.columns(2)
@@ -21,42 +41,173 @@ def show_employee_selector(colaboradores):
 
 def display_dataframes(punches, holidays, colaborador_id):
     with st.spinner("Processando dados..."):
-        # 1) monta o df inicial e converte a Data para datetime
-        df_punches = format_punches_as_dataframe(punches, holidays)
-        df_punches["Data"] = pd.to_datetime(df_punches["Data"], format="%d/%m/%Y")
-        df_punches = df_punches.sort_values("Data")
-
-        # 2) aplica os cálculos de ajuste
-        error_df = get_adjusts(df_punches)
-        error_df["Data"] = pd.to_datetime(error_df["Data"], format="%d/%m/%Y")
-        error_df = error_df.sort_values("Data")
-
-        adjusted_df = adjusted_punches(error_df)
-        adjusted_df["Data"] = pd.to_datetime(adjusted_df["Data"], format="%d/%m/%Y")
-        adjusted_df = adjusted_df.sort_values("Data")
-
-        # 3) cria os Stylers mantendo datetime64 mas formatando a exibição
-        styled_error = (
-            error_df
-            .style
-            .format({"Data": lambda dt: dt.strftime("%d/%m/%Y")})
-            .applymap(style_error_cells, subset=["Trabalhadas", "Saldo"])
-        )
-        styled_adjusted = (
-            adjusted_df
-            .style
-            .format({"Data": lambda dt: dt.strftime("%d/%m/%Y")})
-            .applymap(style_adjusted_cells, subset=["Ajustado"])
-        )
-
-        # 4) exibe no Streamlit (ordenável)
-        st.subheader("Pré Ajustes")
-        st.write(styled_error, use_container_width=True)
-
-        st.subheader("Pontos Ajustados")
-        st.write(styled_adjusted, use_container_width=True)
-def style_error_cells(val):
-    return 'background-color: red; color: white;' if val == "Menos de 4 pontos batidos" else ''
-
-def style_adjusted_cells(val):
-    return 'background-color: #4CAF50; color: white;' if val == "AJUSTADO" else ''
\ No newline at end of file
+        # 1) e 2) monta os minutos de cada dia, ordena pela Data e aplica os ajustes
+        pre_adjusts, adjusted = process_day_minutes(punches, holidays)
+
+        display_day_minutes(pre_adjusts, adjusted)
+
+def display_day_minutes(pre_adjusts, adjusted):
+    show_summary(summarize_day_minutes(pre_adjusts, adjusted))
+
+    # os textos "HH:MM" só são gerados para exibição
+    error_df = render_day_minutes(pre_adjusts)
+    adjusted_df = render_day_minutes(adjusted)
+
+    show_tables(error_df, adjusted_df)
+
+def display_loading_preview(atualizacoes, montar):
+    """
+    Mostra o progresso da busca e uma prévia dos dias já processados, removidas ao final.
+
+    Args:
+        atualizacoes: Iterável de (dias concluídos, total de dias), como `iter_load_period`.
+        montar: Função que devolve as linhas processadas até o momento (formato de `prepare_day_minutes`).
+
+    Returns:
+        int: Número de dias buscados e processados (0 quando tudo já estava na sessão).
+    """
+    progresso = st.progress(0.0, text="Buscando dados da API...")
+    previa = st.empty()
+    ultima = 0.0
+    concluidos = 0
+
+    for concluidos, total in atualizacoes:
+        progresso.progress(concluidos / total if total else 1.0, text=f"{concluidos} de {total} dias buscados")
+        if time.monotonic() - ultima >= PREVIEW_INTERVAL_SECONDS:
+            ultima = time.monotonic()
+            with previa.container():
+                show_preview(montar())
+
+    progresso.empty()
+    previa.empty()
+    return concluidos
+
+def show_preview(pre_adjusts):
+    """Prévia "Pré Ajustes" dos dias já processados; os ajustes dependem do período completo."""
+    error_df = render_day_minutes(pre_adjusts)
+    st.subheader("Pré Ajustes (parcial)")
+    st.caption(f"{len(error_df)} dias processados até agora")
+    st.dataframe(apply_css(error_df.head(TABLE_PAGE_SIZE), error_css(error_df)), column_config=COLUMN_CONFIG,
+                 hide_index=True, use_container_width=True)
+
+def show_tables(error_df, adjusted_df, key="tabelas"):
+    with metrics.stage("show_tables", rows=len(error_df) + len(adjusted_df)):
+        # 3) os destaques são calculados de uma vez para a tabela toda (sem função por célula)
+        show_table("Pré Ajustes", error_df, error_css(error_df), f"{key}_pre")
+        show_table("Pontos Ajustados", adjusted_df, adjusted_css(adjusted_df), f"{key}_ajustados")
+
+def show_summary(resumo, titulo="Resumo do período"):
+    """Totais do período por colaborador (uma linha cada), sem renderizar as tabelas por dia."""
+    st.subheader(titulo)
+    st.dataframe(render_summary(resumo), column_config=COLUMN_CONFIG, hide_index=True, use_container_width=True)
+
+def show_table(titulo, df, css, key):
+    """Exibe a tabela com st.dataframe, paginando acima de TABLE_PAGE_SIZE linhas."""
+    st.subheader(titulo)
+
+    total = len(df)
+    if total > TABLE_PAGE_SIZE:
+        paginas = -(-total // TABLE_PAGE_SIZE)
+        pagina = st.number_input("Página", min_value=1, max_value=paginas, value=1, step=1, key=f"{key}_pagina")
+        inicio = (pagina - 1) * TABLE_PAGE_SIZE
+        df = df.iloc[inicio:inicio + TABLE_PAGE_SIZE]
+        st.caption(f"Linhas {inicio + 1} a {inicio + len(df)} de {total}")
+
+    # 4) exibe no Streamlit (ordenável); só as linhas da página passam pelo Styler
+    st.dataframe(apply_css(df, css), column_config=COLUMN_CONFIG, hide_index=True, use_container_width=True)
+
+def show_debug_panel():
+    """Painel opcional com as métricas de requisições e etapas desta sessão."""
+    if not st.sidebar.checkbox("🐞 Métricas de desempenho"):
+        return
+
+    # Em um servidor com vários usuários, cada sessão vê (e limpa) só os próprios eventos
+    sessao = st.session_state.get("metrics_session")
+    resumo = metrics.summary(sessao)
+    with st.expander("Métricas de desempenho", expanded=True):
+        st.markdown("**Requisições à API** (tempo total inclui esperas entre tentativas)")
+        st.dataframe(resumo["requests"], hide_index=True, use_container_width=True)
+        st.markdown("**Etapas**")
+        st.dataframe(resumo["stages"], hide_index=True, use_container_width=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Baixar métricas (JSON)", data=json.dumps(metrics.export(sessao), ensure_ascii=False, default=str),
+                               file_name="metricas.json", mime="application/json")
+        with col2:
+            if st.button("Limpar métricas"):
+                metrics.reset(sessao)
+
+def show_prefetch_toggle():
+    """Opção de pré-carregar, após cada relatório, os próximos colaboradores e os meses vizinhos."""
+    return st.sidebar.checkbox("⚡ Pré-carregar próximos colaboradores e meses",
+                               help="Busca em segundo plano os dados da próxima navegação provável.")
+
+def show_incomplete_days(dias):
+    """Avisa quais dias não puderam ser buscados na API e oferece nova tentativa só para eles."""
+    if not dias:
+        return
+    st.warning(f"Não foi possível buscar todos os pontos de {formatar_faixas_de_dias(dias)}. Esses dias podem estar incompletos.")
+    # O clique executa o app de novo; apenas os dias pendentes são buscados
+    st.button("🔁 Tentar novamente os dias incompletos")
+
+def show_batch_employee_selector(colaboradores):
+    todos = st.checkbox("Todos os colaboradores")
+    if todos:
+        return list(colaboradores)
+
+    nomes = {c['name']: c for c in colaboradores}
+    selecionados = st.multiselect("Colaboradores", options=list(nomes.keys()))
+    return [nomes[nome] for nome in selecionados]
+
+def show_summary_only_toggle():
+    """Opção de exibir no lote apenas os totais por colaborador, sem as tabelas por dia."""
+    return st.checkbox("Somente resumo por colaborador", help="Recomendado para muitos colaboradores ou períodos longos.")
+
+def show_bulk_toggle():
+    """Opção de buscar no lote os pontos da empresa inteira de uma vez."""
+    return st.checkbox(
+        "Buscar pontos da empresa inteira de uma vez",
+        help="Menos requisições para muitos colaboradores, mas baixa os pontos de todos os colaboradores da empresa "
+             "e só exibe os resultados depois que todas as janelas chegam. Se a busca falhar, volta para a busca por colaborador.",
+    )
+
+def display_batch_reports(reports, total, somente_resumo=False):
+    """
+    Exibe cada colaborador assim que termina e, ao final, o resumo e as tabelas consolidadas.
+
+    Com `somente_resumo`, as tabelas por dia não são renderizadas.
+    """
+    progresso = st.progress(0.0, text=f"0 de {total} colaboradores processados")
+    concluidos = []
+
+    for report in reports:
+        concluidos.append(report)
+        progresso.progress(len(concluidos) / total, text=f"{len(concluidos)} de {total} colaboradores processados")
+        if somente_resumo:
+            continue
+
+        with st.expander(f"{report.nome} ({report.colaborador_id})"):
+            if report.erro:
+                st.error(f"Erro ao processar colaborador: {report.erro}")
+            else:
+                if report.dias_incompletos:
+                    st.warning(f"Dias possivelmente incompletos: {formatar_faixas_de_dias(list(report.dias_incompletos))}")
+                show_tables(render_day_minutes(report.pre_adjusts), render_day_minutes(report.adjusted),
+                            key=f"colaborador_{report.colaborador_id}")
+
+    falhas = [r for r in concluidos if r.erro]
+    if falhas:
+        st.warning(f"{len(falhas)} colaborador(es) não puderam ser processados: " + ", ".join(r.nome for r in falhas))
+
+    incompletos = [r for r in concluidos if r.dias_incompletos]
+    if incompletos:
+        # Com o cache local, gerar o relatório de novo busca apenas os dias que falharam
+        st.warning(f"{len(incompletos)} colaborador(es) com dias incompletos: " + ", ".join(r.nome for r in incompletos)
+                   + ". Gere o relatório novamente para buscar apenas esses dias.")
+
+    st.header("Consolidado")
+    show_summary(summarize_reports(concluidos), titulo="Resumo por colaborador")
+    if not somente_resumo:
+        error_df, adjusted_df = consolidate_reports(concluidos)
+        show_tables(error_df, adjusted_df, key="consolidado")
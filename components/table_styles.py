@@ -0,0 +1,65 @@
+# components/table_styles.py
+# Estilos das tabelas, sem depender do Streamlit (reaproveitados no benchmark)
+import numpy as np
+import pandas as pd
+
+MENOS_DE_4_PONTOS = "Menos de 4 pontos batidos"
+
+# O motor de ajustes marca as linhas alteradas como "AJUSTAR"
+VALORES_AJUSTADOS = ("AJUSTADO", "AJUSTAR")
+
+ERROR_CSS = 'background-color: red; color: white;'
+ADJUSTED_CSS = 'background-color: #4CAF50; color: white;'
+
+def style_error_cells(val):
+    return ERROR_CSS if val == MENOS_DE_4_PONTOS else ''
+
+def style_adjusted_cells(val):
+    return ADJUSTED_CSS if val in VALORES_AJUSTADOS else ''
+
+def build_stylers(error_df, adjusted_df):
+    """Cria os Stylers das tabelas, mantendo datetime64 mas formatando a exibição da Data."""
+    styled_error = (
+        error_df
+        .style
+        .format({"Data": lambda dt: dt.strftime("%d/%m/%Y")})
+        .map(style_error_cells, subset=["Trabalhadas", "Saldo"])
+    )
+    styled_adjusted = (
+        adjusted_df
+        .style
+        .format({"Data": lambda dt: dt.strftime("%d/%m/%Y")})
+        .map(style_adjusted_cells, subset=["Ajustado"])
+    )
+    return styled_error, styled_adjusted
+
+def highlight_css(df: pd.DataFrame, colunas, valores, css: str) -> pd.DataFrame:
+    """
+    Calcula de uma vez o CSS de todas as células: `css` onde o valor está em `valores`.
+
+    Args:
+        df (pd.DataFrame): Tabela exibida.
+        colunas: Colunas verificadas; as demais ficam sem estilo.
+        valores: Valores destacados.
+        css (str): Estilo aplicado às células destacadas.
+
+    Returns:
+        pd.DataFrame: Mesmo formato de `df`, com o CSS de cada célula.
+    """
+    estilos = pd.DataFrame("", index=df.index, columns=df.columns)
+    for coluna in colunas:
+        if coluna in df:
+            estilos[coluna] = np.where(df[coluna].isin(valores), css, "")
+    return estilos
+
+def error_css(error_df: pd.DataFrame) -> pd.DataFrame:
+    """CSS da tabela "Pré Ajustes": vermelho nos dias com menos de 4 pontos."""
+    return highlight_css(error_df, ["Trabalhadas", "Saldo"], [MENOS_DE_4_PONTOS], ERROR_CSS)
+
+def adjusted_css(adjusted_df: pd.DataFrame) -> pd.DataFrame:
+    """CSS da tabela "Pontos Ajustados": verde nos dias ajustados."""
+    return highlight_css(adjusted_df, ["Ajustado"], list(VALORES_AJUSTADOS), ADJUSTED_CSS)
+
+def apply_css(df: pd.DataFrame, css: pd.DataFrame):
+    """Cria um Styler a partir do CSS já calculado (uma única chamada vetorizada, sem função por célula)."""
+    return df.style.apply(lambda _: css.loc[df.index, df.columns], axis=None)
@@ -1,17 +1,166 @@
 # services/auth_service.py
-from cryptography.fernet import Fernet
-import hashlib
+"""
+Cofre de tokens da API, cifrado com a senha do usuário.
+
+A chave é derivada do nome e da senha com PBKDF2-HMAC-SHA256, com salt aleatório
+e custo configurável (AUTH_KDF_ITERATIONS). A derivação é cara de propósito e por
+isso é feita uma única vez por login: o `TokenVault` aberto guarda o Fernet e os
+tokens decifrados, e pode ficar na sessão (st.session_state) ou ser usado por
+rotinas em lote para liberar várias contas de uma vez.
+
+Formato gravado (ex.: no localStorage):
+
+    v2$<iterações>$<salt em base64>$<Fernet de {"tokens": {conta: token}}>
+
+Blobs antigos (Fernet com chave SHA-256 de nome+senha, sem salt) continuam
+sendo abertos; `TokenVault.needs_upgrade` indica que devem ser regravados.
+"""
 import base64
+import hashlib
+import json
+import os
+import secrets
+from typing import Dict, List, Optional
+
+# Iterações do PBKDF2 em cofres novos; cada cofre guarda as suas, então mudar o valor não invalida os existentes
+KDF_ITERATIONS = int(os.getenv("AUTH_KDF_ITERATIONS", "600000"))
+
+# Tamanho do salt (bytes) em cofres novos
+SALT_BYTES = 16
+
+# Conta usada quando o cofre tem um único token (inclusive os blobs antigos)
+DEFAULT_ACCOUNT = "principal"
+
+_VERSAO = "v2"
+
+def _fernet(key: bytes):
+    # Importado no primeiro uso: a tela de login só precisa do cryptography ao enviar o formulário
+    from cryptography.fernet import Fernet
+    return Fernet(key)
+
+def _b64(dados: bytes) -> str:
+    return base64.urlsafe_b64encode(dados).decode().rstrip("=")
+
+def _unb64(texto: str) -> bytes:
+    return base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4))
 
 def generate_crypto_key(name: str, password: str) -> bytes:
+    """Chave dos blobs antigos (SHA-256 de nome+senha, sem salt); usada apenas para abri-los."""
     combined = f"{name}{password}".encode()
     digest = hashlib.sha256(combined).digest()
     return base64.urlsafe_b64encode(digest)
 
+def derive_key(name: str, password: str, salt: bytes, iterations: int = KDF_ITERATIONS) -> bytes:
+    """
+    Deriva a chave Fernet do nome e da senha com PBKDF2-HMAC-SHA256.
+
+    Args:
+        name (str): Nome do usuário.
+        password (str): Senha.
+        salt (bytes): Salt aleatório do cofre.
+        iterations (int): Custo da derivação.
+
+    Returns:
+        bytes: Chave de 32 bytes em base64 (formato do Fernet).
+    """
+    # O separador evita que ("ab", "c") e ("a", "bc") gerem a mesma chave
+    segredo = f"{name}\0{password}".encode()
+    return base64.urlsafe_b64encode(hashlib.pbkdf2_hmac("sha256", segredo, salt, iterations, dklen=32))
+
+class TokenVault:
+    """
+    Tokens de uma ou mais contas, já decifrados, com o Fernet derivado no login.
+
+    Use `create` para um cofre novo e `unlock` para abrir um blob gravado; as
+    demais operações (`seal`, `add`, `encrypt`, `decrypt`) reutilizam a chave e
+    nunca repetem a derivação.
+    """
+
+    def __init__(self, fernet, salt: Optional[bytes], iterations: int, tokens: Dict[str, str]):
+        self._fernet = fernet
+        self.salt = salt
+        self.iterations = iterations
+        self.tokens = dict(tokens)
+
+    @classmethod
+    def create(cls, name: str, password: str, tokens: Dict[str, str], iterations: int = KDF_ITERATIONS) -> "TokenVault":
+        """Cofre novo, com salt aleatório; deriva a chave uma vez."""
+        salt = secrets.token_bytes(SALT_BYTES)
+        return cls(_fernet(derive_key(name, password, salt, iterations)), salt, iterations, tokens)
+
+    @classmethod
+    def unlock(cls, blob: str, name: str, password: str) -> "TokenVault":
+        """
+        Abre um blob gravado por `seal` ou no formato antigo de `encrypt_token`.
+
+        Raises:
+            ValueError: Se as credenciais estiverem erradas ou o blob estiver corrompido.
+        """
+        from cryptography.fernet import InvalidToken
+
+        try:
+            if blob.startswith(f"{_VERSAO}$"):
+                _, iteracoes, salt, cifrado = blob.split("$", 3)
+                salt, iteracoes = _unb64(salt), int(iteracoes)
+                fernet = _fernet(derive_key(name, password, salt, iteracoes))
+                tokens = json.loads(fernet.decrypt(cifrado.encode()))["tokens"]
+                return cls(fernet, salt, iteracoes, tokens)
+
+            fernet = _fernet(generate_crypto_key(name, password))
+            return cls(fernet, None, 0, {DEFAULT_ACCOUNT: fernet.decrypt(blob.encode()).decode()})
+        except (InvalidToken, ValueError, KeyError, TypeError) as e:
+            raise ValueError("Credenciais inválidas ou cofre corrompido.") from e
+
+    @property
+    def needs_upgrade(self) -> bool:
+        """Blob antigo ou com menos iterações que KDF_ITERATIONS: deve ser regravado com `upgraded`."""
+        return self.salt is None or self.iterations < KDF_ITERATIONS
+
+    def upgraded(self, name: str, password: str) -> "TokenVault":
+        """Mesmos tokens em um cofre novo, com salt e KDF_ITERATIONS (uma nova derivação)."""
+        return TokenVault.create(name, password, self.tokens)
+
+    @property
+    def accounts(self) -> List[str]:
+        """Nomes das contas, na ordem em que foram adicionadas."""
+        return list(self.tokens)
+
+    def token(self, account: Optional[str] = None) -> str:
+        """Token da conta; sem conta, o da primeira."""
+        return self.tokens[account if account is not None else self.accounts[0]]
+
+    def add(self, account: str, token: str) -> None:
+        """Adiciona ou substitui o token de uma conta (grave com `seal`)."""
+        self.tokens[account] = token
+
+    def seal(self) -> str:
+        """
+        Cifra os tokens com a chave já derivada, no formato v2.
+
+        Raises:
+            ValueError: Se o cofre é do formato antigo (sem salt); use `upgraded` antes.
+        """
+        if self.salt is None:
+            raise ValueError("Cofre no formato antigo: use upgraded() antes de gravar.")
+        cifrado = self._fernet.encrypt(json.dumps({"tokens": self.tokens}).encode()).decode()
+        return f"{_VERSAO}${self.iterations}${_b64(self.salt)}${cifrado}"
+
+    def encrypt(self, texto: str) -> str:
+        """Cifra um texto qualquer com a chave do cofre."""
+        return self._fernet.encrypt(texto.encode()).decode()
+
+    def decrypt(self, cifrado: str) -> str:
+        """Decifra um texto cifrado por `encrypt`."""
+        return self._fernet.decrypt(cifrado.encode()).decode()
+
+    def __repr__(self) -> str:
+        # Nunca exibe os tokens
+        return f"TokenVault(contas={self.accounts}, iterations={self.iterations})"
+
 def encrypt_token(token: str, name: str, password: str) -> str:
-    key = generate_crypto_key(name, password)
-    return Fernet(key).encrypt(token.encode()).decode()
+    """Cofre novo com um único token (conta DEFAULT_ACCOUNT)."""
+    return TokenVault.create(name, password, {DEFAULT_ACCOUNT: token}).seal()
 
 def decrypt_token(encrypted_token: str, name: str, password: str) -> str:
-    key = generate_crypto_key(name, password)
-    return Fernet(key).decrypt(encrypted_token.encode()).decode()
\ No newline at end of file
+    """Token da primeira conta do blob (formato v2 ou antigo)."""
+    return TokenVault.unlock(encrypted_token, name, password).token()
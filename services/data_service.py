@@ -0,0 +1,53 @@
+# services/data_service.py
+import logging
+import os
+from typing import Dict, List
+
+import streamlit as st
+
+from api.api import fetch_colaboradores, fetch_holidays_for_year, years_between
+
+logger = logging.getLogger(__name__)
+
+# Tempo de vida (em segundos) de colaboradores e feriados em memória
+DATA_CACHE_TTL = int(os.getenv("DATA_CACHE_TTL_SECONDS", "3600"))
+
+@st.cache_data(ttl=DATA_CACHE_TTL, show_spinner=False)
+def _cached_colaboradores(token: str) -> List[Dict]:
+    return fetch_colaboradores(token)
+
+@st.cache_data(ttl=DATA_CACHE_TTL, show_spinner=False)
+def _cached_holidays_for_year(year: int, token: str) -> List[str]:
+    return fetch_holidays_for_year(year, token)
+
+def get_colaboradores_cached(token: str) -> List[Dict]:
+    """
+    Lista de colaboradores servida da memória por até DATA_CACHE_TTL segundos.
+
+    O cache é separado por token; falhas não são armazenadas e a próxima
+    execução tenta novamente.
+    """
+    try:
+        return _cached_colaboradores(token)
+    except Exception as e:
+        logger.error("Erro ao buscar colaboradores: %s", e)
+        return []
+
+def get_holidays_between_cached(start_ms: int, end_ms: int, token: str) -> List[str]:
+    """
+    Feriados do período, com um cache por ano e por token.
+
+    Ao mudar o período, apenas os anos ainda não vistos são buscados na API.
+    """
+    holidays = []
+    for year in years_between(start_ms, end_ms):
+        try:
+            holidays.extend(_cached_holidays_for_year(year, token))
+        except Exception as e:
+            logger.error("Erro ao buscar feriados para %s: %s", year, e)
+    return holidays
+
+def refresh_cached_data() -> None:
+    """Descarta colaboradores e feriados em memória, forçando nova busca na API."""
+    _cached_colaboradores.clear()
+    _cached_holidays_for_year.clear()
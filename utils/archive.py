@@ -0,0 +1,261 @@
+# utils/archive.py
+"""
+Arquivo colunar (Parquet) das linhas processadas, para relatórios históricos.
+
+Cada dia processado vira uma linha com os minutos em colunas numéricas, antes e
+depois dos ajustes. Os arquivos são particionados no estilo Hive por ano, mês e
+colaborador:
+
+    <raiz>/year=2025/month=5/employee=123/data.parquet
+
+`query` lê apenas as partições e colunas necessárias e aplica os filtros na
+leitura (predicate pushdown). Requer o pacote opcional `pyarrow`.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Raiz do arquivo Parquet; cada conta grava em `<raiz>-<conta>` (ver account_archive_path). Vazio desativa o arquivamento
+DEFAULT_ARCHIVE_PATH = os.getenv("PUNCH_ARCHIVE_PATH", os.path.join(".cache", "archive"))
+
+# Colunas de minutos copiadas da representação intermediária: (coluna no arquivo, coluna na IR)
+_MINUTOS_PRE = [
+    ("trabalhadas_min", "trabalhadas_min"),
+    ("abono_min", "abono_min"),
+    ("saldo_min", "saldo_min"),
+    ("intervalo_min", "intervalo_min"),
+    ("excedentes_min", "excedentes_min"),
+    ("disponiveis_min", "disponiveis_min"),
+]
+_MINUTOS_AJUSTADOS = [
+    ("intervalo_ajustado_min", "intervalo_min"),
+    ("excedentes_ajustados_min", "excedentes_min"),
+    ("disponiveis_ajustados_min", "disponiveis_min"),
+]
+
+def _schema():
+    import pyarrow as pa
+    horarios = pa.list_(pa.int16())
+    return pa.schema(
+        [
+            ("employee_id", pa.int64()),
+            ("employee_name", pa.string()),
+            ("date", pa.date32()),
+            ("weekday", pa.int8()),
+            ("ajustado_api", pa.bool_()),
+            ("compensacao", pa.bool_()),
+            ("menos_de_4", pa.bool_()),
+            ("pares", pa.int8()),
+        ]
+        + [(nome, pa.int32()) for nome, _ in _MINUTOS_PRE]
+        + [("entradas", horarios), ("saidas", horarios)]
+        + [(nome, pa.int32()) for nome, _ in _MINUTOS_AJUSTADOS]
+        + [
+            ("entradas_ajustadas", horarios),
+            ("saidas_ajustadas", horarios),
+            ("ajustar", pa.bool_()),
+            ("archived_at", pa.timestamp("s")),
+        ]
+    )
+
+def _horarios(pares: pd.Series, posicao: int) -> List[List[Optional[int]]]:
+    return [[par[posicao] for par in p] for p in pares]
+
+def archive_rows(pre_adjusts: pd.DataFrame, adjusted: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte as tabelas em minutos de um colaborador nas linhas do arquivo.
+
+    Args:
+        pre_adjusts (pd.DataFrame): Resultado de `compute_adjusts`, com Data em datetime.
+        adjusted (pd.DataFrame): Resultado de `compute_adjusted` sobre `pre_adjusts` (mesmas linhas).
+
+    Returns:
+        pd.DataFrame: Uma linha por dia, nas colunas do arquivo (sem as de partição).
+    """
+    datas = pd.to_datetime(pre_adjusts["Data"])
+    linhas = pd.DataFrame({
+        "employee_id": pre_adjusts["ID colaborador"].astype("int64").to_numpy(),
+        "employee_name": pre_adjusts["Colaborador"].astype(str).to_numpy(),
+        "date": datas.dt.date.to_numpy(),
+        "weekday": datas.dt.dayofweek.astype("int8").to_numpy(),
+        "ajustado_api": (pre_adjusts["Ajustado"] == "Sim").to_numpy(),
+        "compensacao": pre_adjusts["compensacao"].astype(bool).to_numpy(),
+        "menos_de_4": pre_adjusts["menos_de_4"].astype(bool).to_numpy(),
+        "pares": pre_adjusts["pares"].map(len).astype("int8").to_numpy(),
+    })
+    for nome, coluna in _MINUTOS_PRE:
+        linhas[nome] = pd.array(pre_adjusts[coluna], dtype="Int32")
+    linhas["entradas"] = _horarios(pre_adjusts["pares"], 0)
+    linhas["saidas"] = _horarios(pre_adjusts["pares"], 1)
+    for nome, coluna in _MINUTOS_AJUSTADOS:
+        linhas[nome] = pd.array(adjusted[coluna], dtype="Int32")
+    linhas["entradas_ajustadas"] = _horarios(adjusted["pares"], 0)
+    linhas["saidas_ajustadas"] = _horarios(adjusted["pares"], 1)
+    linhas["ajustar"] = adjusted["ajustar"].astype(bool).to_numpy()
+    linhas["archived_at"] = pd.Timestamp(int(time.time()), unit="s")
+    return linhas
+
+class TimesheetArchive:
+    """
+    Arquivo Parquet das linhas processadas, particionado por ano, mês e colaborador.
+
+    Gravar um período substitui apenas os dias gravados: cada partição
+    (colaborador e mês) é relida, os dias novos substituem os antigos e o arquivo
+    é trocado de uma vez. As horas extras distribuídas (`*_ajustados_min`)
+    dependem do período processado; vale o último período gravado para cada dia.
+    """
+
+    def __init__(self, path: str = DEFAULT_ARCHIVE_PATH):
+        import pyarrow  # noqa: F401  (falha cedo quando o pacote opcional não está instalado)
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _arquivo(self, ano: int, mes: int, colaborador_id: int) -> str:
+        return os.path.join(self.path, f"year={ano}", f"month={mes}", f"employee={colaborador_id}", "data.parquet")
+
+    def write(self, pre_adjusts: pd.DataFrame, adjusted: pd.DataFrame, excluir: Iterable[date] = ()) -> int:
+        """
+        Grava os dias processados de um colaborador.
+
+        Args:
+            pre_adjusts (pd.DataFrame): Resultado de `compute_adjusts`, com Data em datetime.
+            adjusted (pd.DataFrame): Resultado de `compute_adjusted` sobre `pre_adjusts`.
+            excluir (Iterable[date]): Dias que não devem ser gravados (por exemplo, incompletos).
+
+        Returns:
+            int: Número de dias gravados.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        linhas = archive_rows(pre_adjusts, adjusted)
+        excluir = set(excluir)
+        if excluir:
+            linhas = linhas[~linhas["date"].isin(excluir)]
+        if linhas.empty:
+            return 0
+
+        schema = _schema()
+        chaves = pd.DataFrame({
+            "ano": [d.year for d in linhas["date"]],
+            "mes": [d.month for d in linhas["date"]],
+            "colaborador": linhas["employee_id"].to_numpy(),
+        }, index=linhas.index)
+
+        with self._lock:
+            for (ano, mes, colaborador_id), indices in chaves.groupby(["ano", "mes", "colaborador"]).groups.items():
+                novas = linhas.loc[indices]
+                arquivo = self._arquivo(ano, mes, colaborador_id)
+                if os.path.exists(arquivo):
+                    antigas = pq.read_table(arquivo).to_pandas(types_mapper={pa.int32(): pd.Int32Dtype()}.get)
+                    novas = pd.concat([antigas[~antigas["date"].isin(set(novas["date"]))], novas], ignore_index=True)
+                novas = novas.sort_values("date", kind="stable")
+
+                os.makedirs(os.path.dirname(arquivo), exist_ok=True)
+                temporario = f"{arquivo}.{os.getpid()}.{threading.get_ident()}.tmp"
+                pq.write_table(pa.Table.from_pandas(novas, schema=schema, preserve_index=False), temporario)
+                os.replace(temporario, arquivo)
+
+        return len(linhas)
+
+    def query(self, columns: Optional[Sequence[str]] = None, colaboradores: Optional[Iterable[int]] = None,
+              inicio: Optional[date] = None, fim: Optional[date] = None, filtro=None) -> pd.DataFrame:
+        """
+        Lê as linhas arquivadas, apenas das partições e colunas necessárias.
+
+        Exemplo (horas extras excedentes por colaborador no ano):
+
+            archive.query(["employee_name", "excedentes_min"], inicio=date(2025, 1, 1), fim=date(2025, 12, 31))
+                   .groupby("employee_name")["excedentes_min"].sum()
+
+        Args:
+            columns (Optional[Sequence[str]]): Colunas lidas; por padrão, todas (sem as de partição).
+            colaboradores (Optional[Iterable[int]]): IDs dos colaboradores; por padrão, todos.
+            inicio (Optional[date]): Primeiro dia (inclusive).
+            fim (Optional[date]): Último dia (inclusive).
+            filtro (Optional[pyarrow.dataset.Expression]): Filtro adicional aplicado na leitura,
+                ex.: `pyarrow.dataset.field("excedentes_min") > 0`.
+
+        Returns:
+            pd.DataFrame: Linhas encontradas, em ordem de colaborador e data quando essas colunas são lidas.
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        schema = _schema()
+        colunas = list(columns) if columns is not None else schema.names
+        # Minutos continuam inteiros (nulos como <NA>) e a data vira datetime64
+        para_pandas = dict(types_mapper={pa.int32(): pd.Int32Dtype()}.get, date_as_object=False)
+        if not os.path.isdir(self.path):
+            return schema.empty_table().select(colunas).to_pandas(**para_pandas)
+
+        particionamento = ds.partitioning(
+            pa.schema([("year", pa.int16()), ("month", pa.int8()), ("employee", pa.int64())]), flavor="hive")
+        dataset = ds.dataset(self.path, schema=pa.unify_schemas([schema, particionamento.schema]),
+                             format="parquet", partitioning=particionamento)
+
+        # As condições sobre as colunas de partição descartam diretórios inteiros antes da leitura
+        condicoes = []
+        if colaboradores is not None:
+            condicoes.append(ds.field("employee").isin(list(colaboradores)))
+        if inicio is not None:
+            condicoes.append((ds.field("year") > inicio.year) | ((ds.field("year") == inicio.year) & (ds.field("month") >= inicio.month)))
+            condicoes.append(ds.field("date") >= pa.scalar(inicio, pa.date32()))
+        if fim is not None:
+            condicoes.append((ds.field("year") < fim.year) | ((ds.field("year") == fim.year) & (ds.field("month") <= fim.month)))
+            condicoes.append(ds.field("date") <= pa.scalar(fim, pa.date32()))
+        if filtro is not None:
+            condicoes.append(filtro)
+
+        expressao = None
+        for condicao in condicoes:
+            expressao = condicao if expressao is None else expressao & condicao
+
+        df = dataset.to_table(columns=colunas, filter=expressao).to_pandas(**para_pandas)
+        ordem = [c for c in ("employee_id", "date") if c in df]
+        if ordem:
+            df = df.sort_values(ordem, kind="stable").reset_index(drop=True)
+        return df
+
+_default_archives: Dict[str, TimesheetArchive] = {}
+
+def account_archive_path(namespace: str) -> str:
+    """
+    Raiz do arquivo de uma conta: `<PUNCH_ARCHIVE_PATH>-<namespace>`.
+
+    As raízes das contas ficam ao lado de PUNCH_ARCHIVE_PATH, e não dentro dele,
+    para que uma consulta em uma raiz nunca leia as partições de outra conta. O
+    que foi gravado em PUNCH_ARCHIVE_PATH antes da separação por conta não tem
+    dono conhecido e fica onde está (consulte com `TimesheetArchive()`).
+    """
+    return f"{DEFAULT_ARCHIVE_PATH.rstrip(os.sep)}-{namespace}"
+
+def get_default_archive(namespace: str) -> Optional[TimesheetArchive]:
+    """
+    Retorna o arquivo padrão da conta, criado na primeira chamada.
+
+    Args:
+        namespace (str): Conta dona dos dados (`utils.utils.namespace_da_conta`).
+            IDs de colaboradores podem se repetir entre empresas, então não há arquivo compartilhado.
+
+    Devolve None quando PUNCH_ARCHIVE_PATH está vazio ou o `pyarrow` não está instalado.
+
+    Raises:
+        ValueError: Se `namespace` estiver vazio.
+    """
+    if not namespace:
+        raise ValueError("Informe a conta (namespace_da_conta) do arquivo histórico.")
+    archive = _default_archives.get(namespace)
+    if archive is None and DEFAULT_ARCHIVE_PATH:
+        try:
+            archive = _default_archives[namespace] = TimesheetArchive(account_archive_path(namespace))
+        except ImportError:
+            logger.info("Arquivo Parquet desativado: o pacote 'pyarrow' não está instalado.")
+    return archive
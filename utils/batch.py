@@ -0,0 +1,234 @@
+import logging
+from concurrent.futures import as_completed
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import pandas as pd
+import requests
+
+from api.api import iter_punch_pages
+from utils import metrics
+from utils.punch_records import PunchRecords
+from utils.transformToDataframe import process_day_minutes, render_day_minutes
+from utils.utils import (
+    ChunkResult, FetchResult, buscar_janelas, dia_local, dias_entre, faixas_de_dias,
+    fetch_punches_with_status, mesclar_blocos, repetir_falhas, split_em_blocos,
+)
+
+logger = logging.getLogger(__name__)
+
+# Número padrão de colaboradores processados em paralelo
+BATCH_WORKERS = 4
+
+# Blocos buscados em paralelo para cada colaborador dentro do lote
+BATCH_CHUNK_WORKERS = 2
+
+# Tamanho das janelas da busca da empresa inteira; cada janela segue a paginação da API
+BULK_CHUNK_DAYS = 31
+
+class EmployeeReport(NamedTuple):
+    """Resultado do processamento de um colaborador no modo em lote."""
+    colaborador_id: int
+    nome: str
+    pre_adjusts: Optional[pd.DataFrame]
+    adjusted: Optional[pd.DataFrame]
+    erro: Optional[str] = None
+    dias_incompletos: Tuple[date, ...] = ()
+
+def process_employee(colaborador: Dict, start_ms: int, end_ms: int, token: str, holidays: List,
+                     cache=None, chunk_workers: int = BATCH_CHUNK_WORKERS) -> EmployeeReport:
+    """
+    Busca os pontos de um colaborador e executa o pipeline de ajustes.
+
+    Args:
+        colaborador (Dict): Colaborador no formato da API (com "id" e "name").
+        start_ms (int): Timestamp inicial em milissegundos.
+        end_ms (int): Timestamp final em milissegundos.
+        token (str): Token de autenticação.
+        holidays (List): Lista de feriados no formato "YYYY-MM-DD".
+        cache (Optional[PunchCache]): Cache local de pontos.
+        chunk_workers (int): Blocos buscados em paralelo para este colaborador.
+
+    Returns:
+        EmployeeReport: Tabelas em minutos antes e depois dos ajustes, ou a mensagem de erro.
+        Dias cuja busca falhou são listados em `dias_incompletos`.
+    """
+    try:
+        resultado = fetch_punches_with_status(start_ms, end_ms, colaborador["id"], token, max_workers=chunk_workers, cache=cache)
+    except Exception as e:
+        return EmployeeReport(colaborador["id"], colaborador["name"], None, None, str(e))
+    return process_fetched(colaborador, resultado, holidays)
+
+def process_fetched(colaborador: Dict, resultado: FetchResult, holidays: List) -> EmployeeReport:
+    """Executa o pipeline de ajustes sobre pontos já buscados."""
+    try:
+        pre_adjusts, adjusted = process_day_minutes(resultado.punches, holidays)
+        return EmployeeReport(colaborador["id"], colaborador["name"], pre_adjusts, adjusted,
+                              dias_incompletos=tuple(resultado.dias_incompletos))
+    except Exception as e:
+        return EmployeeReport(colaborador["id"], colaborador["name"], None, None, str(e))
+
+def particionar_por_colaborador(punches: Union[PunchRecords, Iterable[Dict]]) -> Dict[int, PunchRecords]:
+    """
+    Separa os registros de ponto por `employee.id`.
+
+    Cada parte fica na ordem do endpoint por colaborador (dias em ordem crescente e,
+    dentro do dia, do ponto mais recente para o mais antigo), da qual o pipeline
+    depende para montar os pares do dia.
+    """
+    return PunchRecords.coerce(punches).partition_by_employee()
+
+def _buscar_janela_empresa(start_ms: int, end_ms: int, _colaborador, token: str) -> ChunkResult:
+    """Busca todas as páginas de uma janela da empresa inteira, devolvendo o status."""
+    try:
+        # Cada página é convertida ao chegar, sem acumular os dicionários da janela inteira
+        paginas = iter_punch_pages(start_ms, end_ms, token)
+        return ChunkResult(start_ms, end_ms, PunchRecords.from_punches(p for pagina in paginas for p in pagina))
+    except requests.exceptions.RequestException as e:
+        logger.error("Erro ao buscar pontos da empresa: %s", e)
+        return ChunkResult(start_ms, end_ms, None, str(e))
+
+def fetch_company_punches(colaborador_ids: Iterable[int], start_ms: int, end_ms: int, token: str,
+                          max_workers: int = BATCH_WORKERS, cache=None) -> Dict[int, FetchResult]:
+    """
+    Busca os pontos de todos os colaboradores de uma vez (sem `employeeId`) e separa por colaborador.
+
+    O período é dividido em janelas de BULK_CHUNK_DAYS dias, buscadas em paralelo;
+    cada janela segue a paginação da API. Com `cache`, apenas os dias pendentes de
+    algum dos colaboradores são buscados, e o resultado é gravado para todos eles.
+
+    Args:
+        colaborador_ids (Iterable[int]): Colaboradores de interesse; os demais são descartados.
+        start_ms (int): Timestamp inicial em milissegundos.
+        end_ms (int): Timestamp final em milissegundos.
+        token (str): Token de autenticação.
+        max_workers (int): Número máximo de janelas buscadas simultaneamente.
+        cache (Optional[PunchCache]): Cache local de pontos.
+
+    Returns:
+        Dict[int, FetchResult]: Pontos de cada colaborador; as janelas com falha valem para todos.
+    """
+    with metrics.stage("fetch_company_punches", cache=cache is not None) as evento:
+        resultados = _fetch_company_punches(list(colaborador_ids), start_ms, end_ms, token, max_workers, cache)
+        evento.update(rows=sum(len(r.punches) for r in resultados.values()), employees=len(resultados),
+                      chunks=next(iter(resultados.values())).blocos if resultados else 0)
+    return resultados
+
+def _fetch_company_punches(ids: List[int], start_ms: int, end_ms: int, token: str, max_workers: int, cache) -> Dict[int, FetchResult]:
+    inicio, fim = dia_local(start_ms), dia_local(end_ms)
+
+    faixas = [(start_ms, end_ms)]
+    if cache is not None:
+        pendentes = sorted(set().union(*(cache.missing_days(i, dias_entre(inicio, fim)) for i in ids)))
+        faixas = faixas_de_dias(pendentes)
+
+    janelas = [janela for s, e in faixas for janela in split_em_blocos(s, e, BULK_CHUNK_DAYS)]
+    resultados = buscar_janelas(janelas, None, token, max_workers, buscar=_buscar_janela_empresa)
+    resultados = repetir_falhas(resultados, None, token, max_workers, buscar=_buscar_janela_empresa)
+    falhas = [r for r in resultados if not r.ok]
+
+    if cache is None:
+        por_colaborador = particionar_por_colaborador(mesclar_blocos([r.punches for r in resultados if r.ok]))
+    else:
+        for resultado in resultados:
+            if resultado.ok:
+                partes = particionar_por_colaborador(resultado.punches)
+                cache.store_many(resultado.dias, {i: partes.get(i, PunchRecords()) for i in ids})
+        por_colaborador = {i: cache.load(i, inicio, fim) for i in ids}
+
+    return {i: FetchResult(por_colaborador.get(i, PunchRecords()), falhas, len(resultados)) for i in ids}
+
+def _empresa_falhou(resultados: Dict[int, FetchResult]) -> bool:
+    """Indica se nenhuma janela da busca da empresa inteira teve sucesso (ex.: a API recusa a busca sem `employeeId`)."""
+    resultado = next(iter(resultados.values()), None)
+    return resultado is not None and resultado.blocos > 0 and len(resultado.falhas) == resultado.blocos
+
+def archive_report(archive, report: EmployeeReport) -> None:
+    """Grava o resultado no arquivo Parquet, sem os dias incompletos; uma falha aqui não interrompe o lote."""
+    if archive is None or report.erro:
+        return
+    try:
+        with metrics.stage("archive", colaborador=report.colaborador_id) as evento:
+            evento["rows"] = archive.write(report.pre_adjusts, report.adjusted, excluir=report.dias_incompletos)
+    except Exception as e:
+        logger.warning("Erro ao arquivar colaborador %s: %s", report.colaborador_id, e)
+
+def iter_batch_reports(colaboradores: Iterable[Dict], start_ms: int, end_ms: int, token: str, holidays: List,
+                       max_workers: int = BATCH_WORKERS, cache=None, bulk: bool = False,
+                       archive=None) -> Iterator[EmployeeReport]:
+    """
+    Processa vários colaboradores em paralelo, entregando cada um assim que termina.
+
+    Todas as requisições continuam sujeitas ao limite por token da camada de API.
+    Uma falha em um colaborador não interrompe os demais: ela é devolvida no
+    campo `erro` do respectivo EmployeeReport.
+
+    Na busca da empresa inteira (`bulk`, opcional), os pontos de todos são obtidos
+    com poucas requisições por janela (`fetch_company_punches`) e só então processados,
+    um a um. A API não documenta a busca sem `employeeId`: se todas as janelas da
+    empresa falharem, o lote volta para a busca por colaborador.
+
+    Args:
+        colaboradores (Iterable[Dict]): Colaboradores no formato da API (com "id" e "name").
+        start_ms (int): Timestamp inicial em milissegundos.
+        end_ms (int): Timestamp final em milissegundos.
+        token (str): Token de autenticação.
+        holidays (List): Lista de feriados no formato "YYYY-MM-DD", compartilhada por todos.
+        max_workers (int): Número máximo de colaboradores processados simultaneamente.
+        cache (Optional[PunchCache]): Cache local de pontos.
+        bulk (bool): Busca os pontos da empresa inteira de uma vez em vez de colaborador a colaborador.
+        archive (Optional[TimesheetArchive]): Arquivo Parquet onde cada colaborador é gravado ao terminar.
+
+    Yields:
+        EmployeeReport: Resultado de cada colaborador, na ordem de conclusão.
+    """
+    colaboradores = list(colaboradores)
+    if not colaboradores:
+        return
+
+    resultados = None
+    if bulk:
+        resultados = fetch_company_punches([c["id"] for c in colaboradores], start_ms, end_ms, token, max_workers, cache)
+        if _empresa_falhou(resultados):
+            logger.warning("Busca da empresa inteira falhou em todas as janelas; buscando por colaborador.")
+            resultados = None
+    if resultados is not None:
+        for colaborador in colaboradores:
+            report = process_fetched(colaborador, resultados[colaborador["id"]], holidays)
+            archive_report(archive, report)
+            yield report
+        return
+
+    with metrics.ContextExecutor(max_workers=min(max_workers, len(colaboradores))) as executor:
+        futures = [
+            executor.submit(process_employee, colaborador, start_ms, end_ms, token, holidays, cache)
+            for colaborador in colaboradores
+        ]
+        for future in as_completed(futures):
+            report = future.result()
+            archive_report(archive, report)
+            yield report
+
+def consolidate_reports(reports: Iterable[EmployeeReport]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Junta os resultados dos colaboradores em duas tabelas únicas.
+
+    Args:
+        reports (Iterable[EmployeeReport]): Resultados de `iter_batch_reports`.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Tabelas "Pré Ajustes" e "Pontos Ajustados" de todos
+        os colaboradores, ordenadas por nome e ID do colaborador e por data.
+    """
+    concluidos = [r for r in reports if r.erro is None]
+    if not concluidos:
+        vazio = render_day_minutes(process_day_minutes([], [])[0])
+        return vazio, vazio.copy()
+
+    tabelas = []
+    for coluna in ("pre_adjusts", "adjusted"):
+        ir = pd.concat([getattr(r, coluna) for r in concluidos], ignore_index=True)
+        # O ID desempata colaboradores com o mesmo nome, que de outra forma teriam os dias intercalados
+        ir = ir.sort_values(["Colaborador", "ID colaborador", "Data"], kind="stable").reset_index(drop=True)
+        tabelas.append(render_day_minutes(ir))
+    return tabelas[0], tabelas[1]
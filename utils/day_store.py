@@ -0,0 +1,178 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+import pandas as pd
+
+from utils.punch_cache import DEFAULT_OPEN_DAYS
+from utils.transformToDataframe import prepare_day_minutes
+from utils.utils import agrupar_dias_consecutivos, dias_entre, iter_punch_chunks
+
+class DayStore:
+    """
+    Linhas já processadas (`prepare_day_minutes`) indexadas por (colaborador, dia).
+
+    Guardado na sessão do Streamlit: ao ampliar o período, apenas os dias novos
+    são buscados e processados. Dias abertos (os últimos `open_days`) e dias cujo
+    status de feriado mudou são sempre recalculados. A distribuição das horas
+    excedentes depende do período inteiro e por isso não é guardada; ela é
+    refeita por `compute_adjusted` sobre as linhas montadas por `assemble`.
+
+    Dias cuja busca falhou ficam marcados como incompletos: suas linhas parciais
+    são exibidas, mas o dia continua pendente e é buscado de novo na próxima execução.
+    """
+
+    def __init__(self, open_days: int = DEFAULT_OPEN_DAYS):
+        self.open_days = open_days
+        self._linhas: Dict[Tuple[int, date], Dict] = {}
+        self._cobertos: Dict[Tuple[int, date], bool] = {}
+        self._incompletos: Set[Tuple[int, date]] = set()
+        self._colunas: List[str] = []
+        self._dtypes: Dict[str, object] = {}
+
+    def missing_days(self, colaborador_id, dias: Iterable[date], holidays: Iterable[str]) -> List[date]:
+        """
+        Retorna os dias que ainda precisam ser buscados e processados.
+
+        Args:
+            colaborador_id: ID do colaborador.
+            dias (Iterable[date]): Dias do período solicitado.
+            holidays (Iterable[str]): Feriados no formato "YYYY-MM-DD".
+
+        Returns:
+            List[date]: Dias pendentes, em ordem crescente.
+        """
+        feriados: Set[str] = set(holidays)
+        limite_aberto = date.today() - timedelta(days=self.open_days - 1)
+        pendentes = []
+        for dia in sorted(dias):
+            feriado = self._cobertos.get((colaborador_id, dia))
+            if (dia >= limite_aberto or feriado is None or feriado != (dia.isoformat() in feriados)
+                    or (colaborador_id, dia) in self._incompletos):
+                pendentes.append(dia)
+        return pendentes
+
+    def update(self, colaborador_id, dias: Iterable[date], pre_adjusts: pd.DataFrame, holidays: Iterable[str],
+               incompletos: Iterable[date] = ()) -> None:
+        """
+        Guarda as linhas processadas dos dias informados.
+
+        Dias sem nenhuma linha (sem batidas) também são marcados como cobertos.
+        Linhas fora de `dias` são ignoradas, pois o dia pode não ter sido buscado por completo.
+
+        Args:
+            colaborador_id: ID do colaborador.
+            dias (Iterable[date]): Dias buscados.
+            pre_adjusts (pd.DataFrame): Resultado de `prepare_day_minutes` para esses dias.
+            holidays (Iterable[str]): Feriados usados no processamento.
+            incompletos (Iterable[date]): Dias cuja busca falhou, mantidos como pendentes.
+        """
+        dias = set(dias)
+        incompletos = set(incompletos)
+        feriados = set(holidays)
+        if not self._colunas:
+            self._colunas = list(pre_adjusts.columns)
+        if not self._dtypes and not pre_adjusts.empty:
+            self._dtypes = pre_adjusts.dtypes.to_dict()
+
+        for dia in dias:
+            self._linhas.pop((colaborador_id, dia), None)
+            self._cobertos[(colaborador_id, dia)] = dia.isoformat() in feriados
+            if dia in incompletos:
+                self._incompletos.add((colaborador_id, dia))
+            else:
+                self._incompletos.discard((colaborador_id, dia))
+
+        for linha in pre_adjusts.to_dict("records"):
+            dia = linha["Data"].date()
+            if dia in dias:
+                self._linhas[(colaborador_id, dia)] = linha
+
+    def assemble(self, colaborador_id, inicio: date, fim: date) -> pd.DataFrame:
+        """
+        Remonta as linhas do colaborador entre duas datas (inclusive), em ordem de Data.
+
+        Args:
+            colaborador_id: ID do colaborador.
+            inicio (date): Primeiro dia.
+            fim (date): Último dia.
+
+        Returns:
+            pd.DataFrame: Linhas no formato de `prepare_day_minutes`.
+        """
+        linhas = [
+            self._linhas[(colaborador_id, inicio + timedelta(days=i))]
+            for i in range((fim - inicio).days + 1)
+            if (colaborador_id, inicio + timedelta(days=i)) in self._linhas
+        ]
+        return pd.DataFrame(linhas, columns=self._colunas).astype(self._dtypes)
+
+    def incomplete_days(self, colaborador_id, inicio: date, fim: date) -> List[date]:
+        """Retorna os dias do período cuja última busca falhou, em ordem crescente."""
+        return sorted(dia for colaborador, dia in self._incompletos if colaborador == colaborador_id and inicio <= dia <= fim)
+
+    def invalidate(self, colaborador_id=None, inicio: date = None, fim: date = None) -> None:
+        """Descarta os dias do colaborador (ou de todos) no intervalo informado."""
+        for chave in list(self._cobertos):
+            colaborador, dia = chave
+            if colaborador_id is not None and colaborador != colaborador_id:
+                continue
+            if (inicio is not None and dia < inicio) or (fim is not None and dia > fim):
+                continue
+            self._cobertos.pop(chave, None)
+            self._linhas.pop(chave, None)
+            self._incompletos.discard(chave)
+
+def iter_load_period(store: DayStore, colaborador_id, inicio: date, fim: date, token: str, holidays: List[str],
+                     cache=None) -> Iterator[Tuple[int, int]]:
+    """
+    Versão em fluxo de `load_period`: processa e guarda cada janela assim que ela chega.
+
+    Depois de cada janela, `store.assemble` já devolve os dias concluídos, o que
+    permite exibir o período aos poucos.
+
+    Args:
+        store (DayStore): Linhas já processadas na sessão.
+        colaborador_id: ID do colaborador.
+        inicio (date): Data inicial.
+        fim (date): Data final.
+        token (str): Token de autenticação.
+        holidays (List[str]): Feriados do período no formato "YYYY-MM-DD".
+        cache (Optional[PunchCache]): Cache local de pontos.
+
+    Yields:
+        Tuple[int, int]: Dias pendentes já concluídos e total de dias pendentes.
+    """
+    pendentes = store.missing_days(colaborador_id, dias_entre(inicio, fim), holidays)
+    concluidos = 0
+
+    for primeiro, ultimo in agrupar_dias_consecutivos(pendentes):
+        start_ms = int(datetime.combine(primeiro, time.min).timestamp() * 1000)
+        end_ms = int(datetime.combine(ultimo, time.max).timestamp() * 1000)
+        for bloco in iter_punch_chunks(start_ms, end_ms, colaborador_id, token, cache=cache):
+            dias = bloco.dias
+            incompletos = [] if bloco.ok else dias
+            store.update(colaborador_id, dias, prepare_day_minutes(bloco.punches or [], holidays), holidays,
+                         incompletos=incompletos)
+            concluidos += len(dias)
+            yield concluidos, len(pendentes)
+
+def load_period(store: DayStore, colaborador_id, inicio: date, fim: date, token: str, holidays: List[str], cache=None) -> pd.DataFrame:
+    """
+    Retorna as linhas processadas do período, buscando e processando apenas os dias pendentes.
+
+    Args:
+        store (DayStore): Linhas já processadas na sessão.
+        colaborador_id: ID do colaborador.
+        inicio (date): Data inicial.
+        fim (date): Data final.
+        token (str): Token de autenticação.
+        holidays (List[str]): Feriados do período no formato "YYYY-MM-DD".
+        cache (Optional[PunchCache]): Cache local de pontos.
+
+    Returns:
+        pd.DataFrame: Linhas no formato de `prepare_day_minutes`, prontas para `compute_adjusted`.
+        Dias que não puderam ser buscados ficam em `store.incomplete_days`.
+    """
+    for _ in iter_load_period(store, colaborador_id, inicio, fim, token, holidays, cache=cache):
+        pass
+    return store.assemble(colaborador_id, inicio, fim)
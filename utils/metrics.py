@@ -0,0 +1,207 @@
+# utils/metrics.py
+"""
+Métricas de execução: requisições à API e tempo de cada etapa do pipeline.
+
+Os eventos ficam em memória (os últimos MAX_EVENTS) e também são emitidos como
+logs estruturados (JSON) no logger "controle_ponto.metrics", em nível DEBUG.
+`summary()` agrega por endpoint e por etapa; `dump()` grava tudo em JSON.
+
+Cada evento leva a sessão ativa (`set_session`), para que o painel do dashboard
+mostre e limpe apenas os eventos da sessão do usuário. As tarefas enviadas a um
+`ContextExecutor` herdam a sessão de quem as enviou.
+"""
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Quantidade máxima de eventos mantidos em memória
+MAX_EVENTS = int(os.getenv("METRICS_MAX_EVENTS", "5000"))
+
+logger = logging.getLogger("controle_ponto.metrics")
+
+_eventos: deque = deque(maxlen=MAX_EVENTS)
+_lock = threading.Lock()
+
+# Sessão (ex.: do Streamlit) dos eventos registrados no contexto atual; None fora do dashboard
+_sessao: contextvars.ContextVar = contextvars.ContextVar("metrics_session", default=None)
+
+def set_session(session_id: Optional[str]) -> None:
+    """Marca com `session_id` os eventos registrados a partir do contexto atual."""
+    _sessao.set(session_id)
+
+class ContextExecutor(ThreadPoolExecutor):
+    """`ThreadPoolExecutor` que executa cada tarefa no contexto de quem a enviou (e, portanto, na mesma sessão)."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+def configure_logging(level: Optional[str] = None) -> None:
+    """
+    Configura o logging do app (formato e nível), uma única vez por processo.
+
+    Args:
+        level (Optional[str]): Nível do logging; por padrão, a variável LOG_LEVEL ou "WARNING".
+    """
+    logging.basicConfig(
+        level=(level or os.getenv("LOG_LEVEL", "WARNING")).upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+def _registrar(evento: Dict) -> None:
+    evento["ts"] = round(time.time(), 3)
+    evento["session"] = _sessao.get()
+    with _lock:
+        _eventos.append(evento)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(json.dumps(evento, ensure_ascii=False, default=str))
+
+def record_request(endpoint: str, status, seconds: float, size: int = 0, retries: int = 0) -> None:
+    """
+    Registra uma requisição à API (após todas as tentativas).
+
+    Args:
+        endpoint (str): Caminho da URL, sem a query string.
+        status: Status HTTP final, ou o nome da exceção quando não houve resposta.
+        seconds (float): Tempo total, incluindo esperas entre tentativas.
+        size (int): Tamanho do corpo da resposta em bytes.
+        retries (int): Número de novas tentativas.
+    """
+    _registrar({"tipo": "request", "endpoint": endpoint, "status": status, "seconds": round(seconds, 6),
+                "bytes": size, "retries": retries})
+
+@contextmanager
+def stage(nome: str, **extra) -> Iterator[Dict]:
+    """
+    Mede o tempo de uma etapa.
+
+    O dicionário devolvido pode receber "rows" e outros campos antes do fim do bloco:
+
+        with stage("fetch_punches") as m:
+            punches = ...
+            m["rows"] = len(punches)
+
+    Args:
+        nome (str): Nome da etapa.
+        **extra: Campos adicionais do evento.
+    """
+    evento = {"tipo": "stage", "stage": nome, "rows": None, **extra}
+    inicio = time.perf_counter()
+    try:
+        yield evento
+    finally:
+        evento["seconds"] = round(time.perf_counter() - inicio, 6)
+        _registrar(evento)
+
+def _linhas(resultado) -> Optional[int]:
+    if isinstance(resultado, tuple):
+        resultado = resultado[0] if resultado else None
+    try:
+        return len(resultado)
+    except TypeError:
+        return None
+
+def timed(nome: str) -> Callable:
+    """Decorador que registra a função como etapa, com o número de linhas do resultado."""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(nome) as evento:
+                resultado = func(*args, **kwargs)
+                evento["rows"] = _linhas(resultado)
+            return resultado
+        return wrapper
+    return decorator
+
+def events(tipo: Optional[str] = None, session: Optional[str] = None) -> List[Dict]:
+    """
+    Retorna uma cópia dos eventos em memória.
+
+    Args:
+        tipo (Optional[str]): Apenas os eventos deste tipo ("request" ou "stage").
+        session (Optional[str]): Apenas os eventos desta sessão; por padrão, de todas.
+    """
+    with _lock:
+        return [dict(e) for e in _eventos
+                if (tipo is None or e["tipo"] == tipo) and (session is None or e["session"] == session)]
+
+def _percentil(valores: List[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p * (len(ordenados) - 1))))]
+
+def summary(session: Optional[str] = None) -> Dict[str, List[Dict]]:
+    """
+    Agrega os eventos em memória (só os da sessão `session`, se informada).
+
+    Returns:
+        Dict[str, List[Dict]]: "requests" (por endpoint: quantidade, tempos, bytes,
+        novas tentativas e contagem por status) e "stages" (por etapa: execuções, tempos e linhas).
+    """
+    requisicoes = defaultdict(list)
+    etapas = defaultdict(list)
+    for evento in events(session=session):
+        if evento["tipo"] == "request":
+            requisicoes[evento["endpoint"]].append(evento)
+        else:
+            etapas[evento["stage"]].append(evento)
+
+    resumo_requisicoes = []
+    for endpoint, lista in requisicoes.items():
+        tempos = [e["seconds"] for e in lista]
+        status = defaultdict(int)
+        for e in lista:
+            status[str(e["status"])] += 1
+        resumo_requisicoes.append({
+            "endpoint": endpoint,
+            "count": len(lista),
+            "total_s": round(sum(tempos), 3),
+            "p50_s": round(_percentil(tempos, 0.5), 3),
+            "p95_s": round(_percentil(tempos, 0.95), 3),
+            "bytes": sum(e["bytes"] for e in lista),
+            "retries": sum(e["retries"] for e in lista),
+            "status": dict(status),
+        })
+
+    resumo_etapas = []
+    for nome, lista in etapas.items():
+        tempos = [e["seconds"] for e in lista]
+        resumo_etapas.append({
+            "stage": nome,
+            "count": len(lista),
+            "total_s": round(sum(tempos), 3),
+            "max_s": round(max(tempos), 3),
+            "rows": sum(e["rows"] or 0 for e in lista),
+        })
+
+    return {
+        "requests": sorted(resumo_requisicoes, key=lambda r: -r["total_s"]),
+        "stages": sorted(resumo_etapas, key=lambda r: -r["total_s"]),
+    }
+
+def export(session: Optional[str] = None) -> Dict:
+    """Resumo e eventos em memória (só os da sessão `session`, se informada), no formato gravado por `dump`."""
+    return {"summary": summary(session), "events": events(session=session)}
+
+def dump(path: str) -> None:
+    """Grava o resumo e os eventos em memória em um arquivo JSON."""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(export(), f, indent=2, ensure_ascii=False, default=str)
+
+def reset(session: Optional[str] = None) -> None:
+    """Descarta os eventos em memória (só os da sessão `session`, se informada)."""
+    with _lock:
+        if session is None:
+            _eventos.clear()
+            return
+        restantes = [e for e in _eventos if e["session"] != session]
+        _eventos.clear()
+        _eventos.extend(restantes)
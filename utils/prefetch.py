@@ -0,0 +1,157 @@
+# utils/prefetch.py
+"""
+Pré-carregamento em segundo plano do cache de pontos.
+
+Depois que um relatório é exibido, os próximos colaboradores da lista e os
+períodos vizinhos do colaborador atual são buscados em segundo plano e gravados
+no PunchCache; ao navegar até eles, os dias já estão no disco.
+"""
+import calendar
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from utils import metrics
+from utils.utils import dias_entre, faixas_de_dias, iter_punch_chunks
+
+logger = logging.getLogger(__name__)
+
+# Buscas de pré-carregamento simultâneas no processo inteiro (somadas a todas as sessões)
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "1"))
+
+# Quantos colaboradores seguintes da lista são pré-carregados
+PREFETCH_EMPLOYEES = int(os.getenv("PREFETCH_EMPLOYEES", "2"))
+
+# Um mesmo alvo não é pré-carregado de novo antes deste prazo (os dias abertos sempre estão pendentes)
+PREFETCH_TTL_SECONDS = float(os.getenv("PREFETCH_TTL_SECONDS", "300"))
+
+Alvo = Tuple[int, date, date]
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = metrics.ContextExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+        return _executor
+
+def _mes_inteiro(inicio: date, fim: date) -> bool:
+    return inicio.day == 1 and fim == inicio.replace(day=calendar.monthrange(inicio.year, inicio.month)[1])
+
+def periodo_adjacente(inicio: date, fim: date, passo: int) -> Tuple[date, date]:
+    """
+    Retorna o período anterior (`passo=-1`) ou seguinte (`passo=1`).
+
+    Um mês completo avança para o mês vizinho; outros períodos são deslocados pelo próprio tamanho.
+    """
+    if _mes_inteiro(inicio, fim):
+        ano, mes = divmod(inicio.year * 12 + inicio.month - 1 + passo, 12)
+        novo_inicio = date(ano, mes + 1, 1)
+        return novo_inicio, novo_inicio.replace(day=calendar.monthrange(ano, mes + 1)[1])
+    tamanho = timedelta(days=(fim - inicio).days + 1)
+    return inicio + passo * tamanho, fim + passo * tamanho
+
+def prefetch_targets(colaboradores: List[Dict], colaborador_id, inicio: date, fim: date,
+                     n_colaboradores: int = PREFETCH_EMPLOYEES) -> List[Alvo]:
+    """
+    Escolhe o que pré-carregar a partir da seleção atual, na ordem de prioridade.
+
+    Args:
+        colaboradores (List[Dict]): Lista exibida no seletor (com "id").
+        colaborador_id: Colaborador exibido.
+        inicio (date): Data inicial exibida.
+        fim (date): Data final exibida.
+        n_colaboradores (int): Quantos colaboradores seguintes incluir.
+
+    Returns:
+        List[Alvo]: (colaborador, início, fim) dos próximos colaboradores no mesmo período e
+        do colaborador atual nos períodos seguinte e anterior. Períodos futuros são ignorados.
+    """
+    ids = [c["id"] for c in colaboradores]
+    alvos: List[Alvo] = []
+    if colaborador_id in ids:
+        posicao = ids.index(colaborador_id)
+        alvos.extend((i, inicio, fim) for i in ids[posicao + 1:posicao + 1 + n_colaboradores])
+
+    hoje = date.today()
+    for passo in (1, -1):
+        vizinho_inicio, vizinho_fim = periodo_adjacente(inicio, fim, passo)
+        if vizinho_inicio <= hoje:
+            alvos.append((colaborador_id, vizinho_inicio, min(vizinho_fim, hoje)))
+    return alvos
+
+class Prefetcher:
+    """
+    Agenda o pré-carregamento de uma sessão.
+
+    Cada `schedule` cancela o agendamento anterior: buscas ainda na fila são
+    descartadas e a que está em andamento para na próxima janela. A concorrência
+    é limitada pelo executor compartilhado (PREFETCH_WORKERS) e todas as
+    requisições respeitam o limite por token da camada de API.
+    """
+
+    def __init__(self, cache, ttl_seconds: float = PREFETCH_TTL_SECONDS):
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+        self._geracao = 0
+        self._futures: List[Future] = []
+        self._aquecidos: Dict[Alvo, float] = {}
+        self._lock = threading.Lock()
+
+    def schedule(self, token: str, alvos: List[Alvo]) -> None:
+        """Cancela o agendamento anterior e pré-carrega `alvos`, em ordem."""
+        self.cancel()
+        agora = time.monotonic()
+        with self._lock:
+            geracao = self._geracao
+            for alvo in alvos:
+                if agora - self._aquecidos.get(alvo, float("-inf")) < self.ttl_seconds:
+                    continue
+                self._futures.append(_get_executor().submit(self._aquecer, geracao, token, alvo))
+
+    def cancel(self) -> None:
+        """Descarta as buscas pendentes e interrompe a atual na próxima janela."""
+        with self._lock:
+            self._geracao += 1
+            for future in self._futures:
+                future.cancel()
+            self._futures = []
+
+    def pending(self) -> int:
+        """Número de alvos ainda não concluídos."""
+        with self._lock:
+            return sum(not f.done() for f in self._futures)
+
+    def _ativo(self, geracao: int) -> bool:
+        return self._geracao == geracao
+
+    def _aquecer(self, geracao: int, token: str, alvo: Alvo) -> None:
+        colaborador_id, inicio, fim = alvo
+        if not self._ativo(geracao):
+            return
+
+        try:
+            # Só os trechos pendentes são buscados: os dias já cobertos nem são lidos do disco
+            pendentes = self.cache.missing_days(colaborador_id, dias_entre(inicio, fim))
+            with metrics.stage("prefetch", colaborador=colaborador_id) as evento:
+                linhas = 0
+                for start_ms, end_ms in faixas_de_dias(pendentes):
+                    for bloco in iter_punch_chunks(start_ms, end_ms, colaborador_id, token, max_workers=1, cache=self.cache):
+                        linhas += len(bloco.punches or [])
+                        if not self._ativo(geracao):
+                            break
+                    if not self._ativo(geracao):
+                        evento["cancelled"] = True
+                        break
+                evento["rows"] = linhas
+            if self._ativo(geracao):
+                with self._lock:
+                    self._aquecidos[alvo] = time.monotonic()
+        except Exception as e:
+            logger.warning("Erro no pré-carregamento de %s (%s a %s): %s", colaborador_id, inicio, fim, e)
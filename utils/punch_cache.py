@@ -0,0 +1,224 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from utils.punch_records import PunchRecords
+from utils.utils import chave_ponto
+
+# Local padrão do banco de cache (pode ser alterado via .env)
+DEFAULT_CACHE_PATH = os.getenv("PUNCH_CACHE_PATH", os.path.join(".cache", "punches.sqlite3"))
+
+# Dias fechados expiram após este prazo e são buscados novamente
+DEFAULT_TTL_DAYS = float(os.getenv("PUNCH_CACHE_TTL_DAYS", "30"))
+
+# Últimos dias considerados "abertos": sempre buscados na API
+DEFAULT_OPEN_DAYS = int(os.getenv("PUNCH_CACHE_OPEN_DAYS", "3"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS punches (
+    employee_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (employee_id, key)
+);
+CREATE INDEX IF NOT EXISTS punches_by_day ON punches (employee_id, day);
+CREATE TABLE IF NOT EXISTS coverage (
+    employee_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (employee_id, day)
+);
+"""
+
+class PunchCache:
+    """
+    Cache local (SQLite) dos registros de ponto por colaborador e dia.
+
+    Cada dia buscado com sucesso é registrado na tabela `coverage`. Dias fechados
+    são servidos do disco até expirarem (`ttl_days`); os últimos `open_days`
+    dias ainda podem receber batidas e por isso são sempre buscados na API.
+
+    Cada operação abre a sua própria conexão, então a mesma instância pode ser
+    usada por várias threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_days: float = DEFAULT_TTL_DAYS, open_days: int = DEFAULT_OPEN_DAYS):
+        self.path = path
+        self.ttl_seconds = ttl_days * 24 * 60 * 60
+        self.open_days = open_days
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+        self.evict_expired()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def missing_days(self, colaborador_id, dias: Iterable[date]) -> List[date]:
+        """
+        Retorna os dias que precisam ser buscados na API.
+
+        Um dia é buscado se nunca foi coberto, se a cobertura expirou ou se ele
+        está entre os últimos `open_days` dias (ainda aberto).
+
+        Args:
+            colaborador_id: ID do colaborador.
+            dias (Iterable[date]): Dias do período solicitado.
+
+        Returns:
+            List[date]: Dias pendentes, em ordem crescente.
+        """
+        dias = sorted(dias)
+        if not dias:
+            return []
+
+        limite_aberto = date.today() - timedelta(days=self.open_days - 1)
+        limite_ttl = time.time() - self.ttl_seconds
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT day FROM coverage WHERE employee_id = ? AND day BETWEEN ? AND ? AND fetched_at >= ?",
+                (str(colaborador_id), dias[0].isoformat(), dias[-1].isoformat(), limite_ttl),
+            ).fetchall()
+        cobertos = {row[0] for row in rows}
+
+        return [dia for dia in dias if dia >= limite_aberto or dia.isoformat() not in cobertos]
+
+    def store(self, colaborador_id, dias: Iterable[date], punches: Iterable[Dict]) -> None:
+        """
+        Grava os pontos buscados e marca os dias como cobertos.
+
+        Os pontos já existentes nesses dias são substituídos, para que batidas
+        removidas ou alteradas no Tangerino não permaneçam no cache.
+
+        Args:
+            colaborador_id: ID do colaborador.
+            dias (Iterable[date]): Dias cobertos pela busca.
+            punches (Iterable[Dict]): Registros desses dias (lista da API ou PunchRecords).
+        """
+        self.store_many(dias, {colaborador_id: punches})
+
+    def store_many(self, dias: Iterable[date], por_colaborador: Dict[object, List[Dict]]) -> None:
+        """
+        Como `store`, para vários colaboradores buscados juntos, em uma única transação.
+
+        Args:
+            dias (Iterable[date]): Dias cobertos pela busca.
+            por_colaborador (Dict): Registros de cada colaborador nesses dias; colaboradores
+                sem batidas devem aparecer com lista vazia para que os dias sejam marcados como cobertos.
+        """
+        dias = sorted(dias)
+        if not dias:
+            return
+
+        agora = time.time()
+        with self._connect() as conn:
+            for colaborador_id, punches in por_colaborador.items():
+                employee_id = str(colaborador_id)
+                conn.execute(
+                    "DELETE FROM punches WHERE employee_id = ? AND day BETWEEN ? AND ?",
+                    (employee_id, dias[0].isoformat(), dias[-1].isoformat()),
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO punches (employee_id, day, key, seq, payload) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (employee_id, p.get("date", ""), json.dumps(chave_ponto(p)), seq, json.dumps(p))
+                        for seq, p in enumerate(punches)
+                    ],
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO coverage (employee_id, day, fetched_at) VALUES (?, ?, ?)",
+                    [(employee_id, dia.isoformat(), agora) for dia in dias],
+                )
+
+    def load(self, colaborador_id, inicio: date, fim: date) -> PunchRecords:
+        """
+        Lê do cache os pontos do colaborador entre duas datas (inclusive).
+
+        Args:
+            colaborador_id: ID do colaborador.
+            inicio (date): Primeiro dia.
+            fim (date): Último dia.
+
+        Returns:
+            PunchRecords: Registros de ponto, ordenados por dia.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT payload FROM punches WHERE employee_id = ? AND day BETWEEN ? AND ? ORDER BY day, seq",
+                (str(colaborador_id), inicio.isoformat(), fim.isoformat()),
+            ).fetchall()
+        return PunchRecords.from_punches(json.loads(row[0]) for row in rows)
+
+    def invalidate(self, colaborador_id=None, inicio: Optional[date] = None, fim: Optional[date] = None) -> None:
+        """
+        Remove entradas do cache, forçando uma nova busca na próxima consulta.
+
+        Sem argumentos, limpa todo o cache.
+
+        Args:
+            colaborador_id: ID do colaborador, ou None para todos.
+            inicio (Optional[date]): Primeiro dia a invalidar, ou None para sem limite.
+            fim (Optional[date]): Último dia a invalidar, ou None para sem limite.
+        """
+        filtros, params = [], []
+        if colaborador_id is not None:
+            filtros.append("employee_id = ?")
+            params.append(str(colaborador_id))
+        if inicio is not None:
+            filtros.append("day >= ?")
+            params.append(inicio.isoformat())
+        if fim is not None:
+            filtros.append("day <= ?")
+            params.append(fim.isoformat())
+        where = f" WHERE {' AND '.join(filtros)}" if filtros else ""
+
+        with self._connect() as conn:
+            conn.execute(f"DELETE FROM punches{where}", params)
+            conn.execute(f"DELETE FROM coverage{where}", params)
+
+    def evict_expired(self) -> None:
+        """Remove os dias cuja cobertura expirou (TTL) e os seus pontos."""
+        limite_ttl = time.time() - self.ttl_seconds
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM punches WHERE EXISTS ("
+                " SELECT 1 FROM coverage c WHERE c.employee_id = punches.employee_id"
+                " AND c.day = punches.day AND c.fetched_at < ?)",
+                (limite_ttl,),
+            )
+            conn.execute("DELETE FROM coverage WHERE fetched_at < ?", (limite_ttl,))
+
+_default_caches: Dict[Optional[str], PunchCache] = {}
+
+def get_default_cache(namespace: Optional[str] = None) -> PunchCache:
+    """
+    Retorna o cache padrão do processo, criado na primeira chamada.
+
+    Args:
+        namespace (Optional[str]): Conta dona dos dados (`utils.utils.namespace_da_conta`);
+            cada conta usa um banco próprio, ao lado de DEFAULT_CACHE_PATH.
+    """
+    cache = _default_caches.get(namespace)
+    if cache is None:
+        path = DEFAULT_CACHE_PATH
+        if namespace:
+            base, extensao = os.path.splitext(path)
+            path = f"{base}-{namespace}{extensao}"
+        cache = _default_caches[namespace] = PunchCache(path)
+    return cache
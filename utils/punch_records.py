@@ -0,0 +1,230 @@
+# utils/punch_records.py
+"""
+Representação compacta dos registros de ponto.
+
+A resposta do /punch/ traz, para cada batida, um dicionário com o objeto
+`employee` e o `adjustmentReason` aninhados. Em buscas grandes (empresa inteira,
+ano inteiro) isso custa muito mais memória do que os dados exigem. PunchRecords
+guarda apenas os campos usados pelo pipeline em colunas `array` (8 bytes ou
+menos por campo) e mantém o nome de cada colaborador e cada motivo de ajuste
+uma única vez.
+
+O pipeline (`punches_to_frame`) lê as colunas diretamente; iterar devolve
+dicionários no formato da API, para quem ainda precisa deles (ex.: o cache).
+"""
+import sys
+from array import array
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# Marca de valor ausente nas colunas inteiras (id, dateIn, dateOut)
+NULO = -(2 ** 63)
+
+# Marca, na coluna `ids`, de um id não inteiro (ex.: texto), guardado como veio em `ids_originais`
+ID_ORIGINAL = NULO + 1
+
+def _inteiro(valor) -> int:
+    """Converte IDs de colaborador para inteiro; ausentes ou não numéricos viram NULO."""
+    try:
+        return NULO if valor is None else int(valor)
+    except (TypeError, ValueError):
+        return NULO
+
+class PunchRecords:
+    """
+    Registros de ponto em colunas: id, colaborador, dia (ordinal), dateIn/dateOut (ms) e ajuste.
+
+    Os nomes ficam em um dicionário por ID de colaborador e os motivos de ajuste
+    em uma tabela indexada, ambos com as strings internadas (`sys.intern`). IDs de
+    registro que não são inteiros ficam, sem conversão, em `ids_originais` (por
+    linha), para que a deduplicação e o cache usem o mesmo id da API.
+    """
+
+    __slots__ = ("ids", "ids_originais", "colaboradores", "dias", "entradas", "saidas", "ajustes", "motivos", "nomes", "_motivos", "_indice_motivos")
+
+    def __init__(self):
+        self.ids = array("q")
+        self.ids_originais: Dict[int, object] = {}
+        self.colaboradores = array("q")
+        self.dias = array("i")
+        self.entradas = array("q")
+        self.saidas = array("q")
+        self.ajustes = array("b")
+        # Índice em `_motivos`, ou -1 sem motivo
+        self.motivos = array("h")
+        self.nomes: Dict[int, str] = {}
+        self._motivos: List[str] = []
+        self._indice_motivos: Dict[str, int] = {}
+
+    @classmethod
+    def from_punches(cls, punches: Iterable[Dict]) -> "PunchRecords":
+        """Converte registros no formato da API (dicionários), um a um, sem manter a lista original."""
+        registros = cls()
+        for punch in punches:
+            registros.append(punch)
+        return registros
+
+    @classmethod
+    def coerce(cls, punches: Union["PunchRecords", Iterable[Dict]]) -> "PunchRecords":
+        """Devolve `punches` como PunchRecords, convertendo listas de dicionários."""
+        return punches if isinstance(punches, cls) else cls.from_punches(punches)
+
+    def _motivo(self, descricao: Optional[str]) -> int:
+        if descricao is None:
+            return -1
+        indice = self._indice_motivos.get(descricao)
+        if indice is None:
+            indice = self._indice_motivos[descricao] = len(self._motivos)
+            self._motivos.append(sys.intern(descricao))
+        return indice
+
+    def append(self, punch: Dict) -> None:
+        """Acrescenta um registro no formato da API."""
+        employee = punch.get("employee") or {}
+        colaborador = _inteiro(employee.get("id"))
+        if colaborador not in self.nomes:
+            self.nomes[colaborador] = sys.intern(employee.get("name") or "")
+        entrada, saida = punch.get("dateIn"), punch.get("dateOut")
+
+        self._append_id(punch.get("id"))
+        self.colaboradores.append(colaborador)
+        self.dias.append(date.fromisoformat(punch["date"]).toordinal())
+        self.entradas.append(NULO if entrada is None else entrada)
+        self.saidas.append(NULO if saida is None else saida)
+        self.ajustes.append(bool(punch.get("adjust")))
+        self.motivos.append(self._motivo((punch.get("adjustmentReason") or {}).get("description")))
+
+    def _append_id(self, valor) -> None:
+        if valor is None:
+            self.ids.append(NULO)
+        elif type(valor) is int and valor > ID_ORIGINAL:
+            self.ids.append(valor)
+        else:
+            # Texto (ou inteiro fora da faixa): mantido como veio, sem cair em NULO
+            self.ids_originais[len(self.ids)] = valor
+            self.ids.append(ID_ORIGINAL)
+
+    def _id(self, i: int):
+        """ID do registro na linha `i`, como veio da API (None se ausente)."""
+        if self.ids[i] == NULO:
+            return None
+        if self.ids[i] == ID_ORIGINAL:
+            return self.ids_originais[i]
+        return self.ids[i]
+
+    def __len__(self) -> int:
+        return len(self.dias)
+
+    def _chave(self, i: int) -> tuple:
+        # Mesma identidade de `utils.utils.chave_ponto`
+        id_ = self._id(i)
+        if id_ is not None:
+            return ("id", id_)
+        return (self.colaboradores[i], self.dias[i], self.entradas[i], self.saidas[i])
+
+    def _copiar_de(self, origem: "PunchRecords", indices: Iterable[int]) -> None:
+        for i in indices:
+            colaborador = origem.colaboradores[i]
+            if colaborador not in self.nomes:
+                self.nomes[colaborador] = origem.nomes[colaborador]
+            self._append_id(origem._id(i))
+            self.colaboradores.append(colaborador)
+            self.dias.append(origem.dias[i])
+            self.entradas.append(origem.entradas[i])
+            self.saidas.append(origem.saidas[i])
+            self.ajustes.append(origem.ajustes[i])
+            motivo = origem.motivos[i]
+            self.motivos.append(-1 if motivo < 0 else self._motivo(origem._motivos[motivo]))
+
+    def take(self, indices: Iterable[int]) -> "PunchRecords":
+        """Novo PunchRecords com as linhas indicadas, na ordem informada."""
+        registros = PunchRecords()
+        registros._copiar_de(self, indices)
+        return registros
+
+    @classmethod
+    def merge(cls, blocos: Sequence[Union["PunchRecords", Iterable[Dict]]]) -> "PunchRecords":
+        """
+        Junta os blocos na ordem informada, mantendo apenas a primeira ocorrência de cada registro.
+
+        Args:
+            blocos: PunchRecords ou listas de dicionários da API, em ordem cronológica.
+
+        Returns:
+            PunchRecords: Registros únicos.
+        """
+        registros = cls()
+        vistos = set()
+        for bloco in blocos:
+            bloco = cls.coerce(bloco)
+            novos = []
+            for i in range(len(bloco)):
+                chave = bloco._chave(i)
+                if chave not in vistos:
+                    vistos.add(chave)
+                    novos.append(i)
+            registros._copiar_de(bloco, novos)
+        return registros
+
+    def partition_by_employee(self) -> Dict[int, "PunchRecords"]:
+        """
+        Separa os registros por colaborador, na ordem do endpoint por colaborador.
+
+        Dias em ordem crescente e, dentro do dia, do ponto mais recente para o mais
+        antigo (registros sem dateIn por último), como `particionar_por_colaborador`.
+        """
+        if not len(self):
+            return {}
+        colaboradores = np.frombuffer(self.colaboradores, dtype=np.int64)
+        dias = np.frombuffer(self.dias, dtype=np.int32)
+        entradas = np.frombuffer(self.entradas, dtype=np.int64)
+        # lexsort é estável: empates mantêm a ordem de chegada
+        ordem = np.lexsort((-np.where(entradas == NULO, 0, entradas), dias, colaboradores))
+        colaboradores_ordenados = colaboradores[ordem]
+        inicios = np.flatnonzero(np.r_[True, colaboradores_ordenados[1:] != colaboradores_ordenados[:-1]])
+        fins = np.r_[inicios[1:], len(ordem)]
+        return {int(colaboradores_ordenados[a]): self.take(ordem[a:b].tolist()) for a, b in zip(inicios, fins)}
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame no formato de `punches_to_frame`, montado direto das colunas."""
+        colaboradores = np.frombuffer(self.colaboradores, dtype=np.int64).copy()
+        entradas = np.frombuffer(self.entradas, dtype=np.int64)
+        saidas = np.frombuffer(self.saidas, dtype=np.int64)
+        dias_unicos, posicao_dia = np.unique(np.frombuffer(self.dias, dtype=np.int32), return_inverse=True)
+        datas = np.array([date.fromordinal(int(d)).isoformat() for d in dias_unicos], dtype=object)
+        ids_unicos, posicao_colaborador = np.unique(colaboradores, return_inverse=True)
+        nomes = np.array([self.nomes[int(i)] for i in ids_unicos], dtype=object)
+        motivos = np.array([None] + self._motivos, dtype=object)
+
+        return pd.DataFrame({
+            "employee_id": colaboradores,
+            "employee_name": nomes[posicao_colaborador] if len(self) else np.array([], dtype=object),
+            "date": datas[posicao_dia] if len(self) else np.array([], dtype=object),
+            "dateIn": pd.arrays.IntegerArray(entradas.copy(), entradas == NULO),
+            "dateOut": pd.arrays.IntegerArray(saidas.copy(), saidas == NULO),
+            "adjust": np.frombuffer(self.ajustes, dtype=np.int8).astype(bool),
+            "reason": motivos[np.frombuffer(self.motivos, dtype=np.int16) + 1],
+        })
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Registros no formato da API, apenas com os campos usados pelo pipeline."""
+        for i in range(len(self)):
+            punch = {
+                "employee": {"id": None if self.colaboradores[i] == NULO else self.colaboradores[i],
+                             "name": self.nomes[self.colaboradores[i]]},
+                "date": date.fromordinal(self.dias[i]).isoformat(),
+                "dateIn": None if self.entradas[i] == NULO else self.entradas[i],
+                "dateOut": None if self.saidas[i] == NULO else self.saidas[i],
+                "adjust": bool(self.ajustes[i]),
+                "adjustmentReason": None if self.motivos[i] < 0 else {"description": self._motivos[self.motivos[i]]},
+            }
+            id_ = self._id(i)
+            if id_ is not None:
+                punch = {"id": id_, **punch}
+            yield punch
+
+    def __repr__(self) -> str:
+        return f"PunchRecords({len(self)} registros, {len(self.nomes)} colaboradores)"
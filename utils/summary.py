@@ -0,0 +1,120 @@
+# utils/summary.py
+"""
+Totais do período por colaborador, calculados sobre a representação em minutos.
+
+Em vez de exibir as tabelas por dia, o resumo agrega de uma vez (groupby
+vetorizado) as colunas numéricas de `compute_adjusts` e `compute_adjusted`,
+e por isso escala para todos os colaboradores ao longo de um ano.
+"""
+from typing import Iterable
+
+import pandas as pd
+
+from utils import metrics
+from utils.transformToDataframe import formatar_minutos
+
+# Colunas de minutos do resumo e os títulos exibidos
+COLUNAS_RESUMO_MINUTOS = {
+    "trabalhadas_min": "Trabalhadas",
+    "abono_min": "Abono Previstas",
+    "saldo_min": "Saldo",
+    "excedentes_min": "Hrs Extras Excedentes",
+    "disponiveis_min": "Hrs Extras Disponíveis",
+    "disponiveis_restantes_min": "Hrs Extras Disponíveis após Ajustes",
+}
+
+# Colunas com sinal ("+HH:MM"/"-HH:MM") na exibição
+_COM_SINAL = {"saldo_min", "excedentes_min", "disponiveis_min", "disponiveis_restantes_min"}
+
+COLUNAS_RESUMO = ["ID colaborador", "Colaborador", "Início", "Fim", "dias", "dias_menos_de_4", "dias_ajustados"] + list(COLUNAS_RESUMO_MINUTOS)
+
+@metrics.timed("summarize_day_minutes")
+def summarize_day_minutes(pre_adjusts: pd.DataFrame, adjusted: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega os dias de um ou mais colaboradores em uma linha por colaborador.
+
+    Dias com menos de 4 pontos não entram em Trabalhadas, Abono Previstas nem no
+    Saldo (na tabela eles aparecem como texto) e são contados em `dias_menos_de_4`;
+    dias de compensação de feriado não somam horas trabalhadas, como na tabela.
+    Assim, Trabalhadas - Abono Previstas = Saldo no resumo.
+
+    Args:
+        pre_adjusts (pd.DataFrame): Resultado de `compute_adjusts` (uma ou mais pessoas).
+        adjusted (pd.DataFrame): Resultado de `compute_adjusted` sobre as mesmas linhas.
+
+    Returns:
+        pd.DataFrame: Colunas de `COLUNAS_RESUMO`, com os minutos como inteiros, ordenado por Colaborador.
+    """
+    if pre_adjusts.empty:
+        return pd.DataFrame(columns=COLUNAS_RESUMO)
+
+    menos_de_4 = pre_adjusts["menos_de_4"].astype(bool)
+    compensacao = pre_adjusts["compensacao"].astype(bool)
+
+    dias = pd.DataFrame({
+        "ID colaborador": pre_adjusts["ID colaborador"],
+        "Colaborador": pre_adjusts["Colaborador"],
+        "Data": pd.to_datetime(pre_adjusts["Data"]),
+        "menos_de_4": menos_de_4,
+        "ajustar": adjusted["ajustar"].astype(bool).to_numpy(),
+        "trabalhadas_min": pre_adjusts["trabalhadas_min"].where(~menos_de_4 & ~compensacao, 0),
+        "abono_min": pre_adjusts["abono_min"].where(~menos_de_4, 0),
+        "saldo_min": pre_adjusts["saldo_min"].where(~menos_de_4, 0),
+        "excedentes_min": pre_adjusts["excedentes_min"].fillna(0),
+        "disponiveis_min": pre_adjusts["disponiveis_min"].fillna(0),
+        "disponiveis_restantes_min": adjusted["disponiveis_min"].fillna(0).to_numpy(),
+    })
+
+    resumo = dias.groupby(["ID colaborador", "Colaborador"], sort=False).agg(
+        **{
+            "Início": ("Data", "min"),
+            "Fim": ("Data", "max"),
+            "dias": ("Data", "size"),
+            "dias_menos_de_4": ("menos_de_4", "sum"),
+            "dias_ajustados": ("ajustar", "sum"),
+        },
+        **{coluna: (coluna, "sum") for coluna in COLUNAS_RESUMO_MINUTOS},
+    ).reset_index()
+
+    minutos = list(COLUNAS_RESUMO_MINUTOS)
+    resumo[minutos] = resumo[minutos].astype("int64")
+    return resumo.sort_values("Colaborador", kind="stable").reset_index(drop=True)[COLUNAS_RESUMO]
+
+def summarize_reports(reports: Iterable) -> pd.DataFrame:
+    """
+    Resumo de vários resultados do modo em lote (EmployeeReport), em uma única agregação.
+
+    Args:
+        reports (Iterable[EmployeeReport]): Resultados de `iter_batch_reports`; os com erro são ignorados.
+
+    Returns:
+        pd.DataFrame: Formato de `summarize_day_minutes`.
+    """
+    concluidos = [r for r in reports if r.erro is None and r.pre_adjusts is not None and not r.pre_adjusts.empty]
+    if not concluidos:
+        return pd.DataFrame(columns=COLUNAS_RESUMO)
+
+    # Só as colunas usadas no resumo são concatenadas
+    colunas = ["ID colaborador", "Colaborador", "Data", "menos_de_4", "compensacao", "trabalhadas_min", "abono_min",
+               "saldo_min", "excedentes_min", "disponiveis_min"]
+    pre_adjusts = pd.concat([r.pre_adjusts[colunas] for r in concluidos], ignore_index=True)
+    adjusted = pd.concat([r.adjusted[["ajustar", "disponiveis_min"]] for r in concluidos], ignore_index=True)
+    return summarize_day_minutes(pre_adjusts, adjusted)
+
+def render_summary(resumo: pd.DataFrame) -> pd.DataFrame:
+    """
+    Gera a tabela de exibição do resumo, com os minutos em "HH:MM".
+
+    Args:
+        resumo (pd.DataFrame): Resultado de `summarize_day_minutes`.
+
+    Returns:
+        pd.DataFrame: Mesmas linhas, com títulos em português e durações formatadas.
+    """
+    df = resumo[["ID colaborador", "Colaborador", "Início", "Fim"]].copy()
+    df["Dias"] = resumo["dias"]
+    df["Dias com menos de 4 pontos"] = resumo["dias_menos_de_4"]
+    df["Dias ajustados"] = resumo["dias_ajustados"]
+    for coluna, titulo in COLUNAS_RESUMO_MINUTOS.items():
+        df[titulo] = formatar_minutos(resumo[coluna], sinal=coluna in _COM_SINAL) if len(resumo) else pd.Series(dtype=str)
+    return df
@@ -1,27 +1,303 @@
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta, timezone
-from typing import List, Dict
-from utils.utils import converter_data_iso_para_ddmmaaaa, obter_dia_semana, converter_milisegundos_para_hhmm, minutes_to_str, str_to_minutes
-import re
+from datetime import datetime, time, timezone
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple, Union
 from babel.dates import format_date, format_datetime, format_time
 from babel import Locale
 import pytz
+from utils import metrics
+from utils.punch_records import PunchRecords
+from utils.utils import FORMAT_CACHE_SIZE, tabela_calendario
 
-brazil_tz = pytz.timezone('America/Sao_Paulo')
+BRAZIL_TZ_NAME = 'America/Sao_Paulo'
+brazil_tz = pytz.timezone(BRAZIL_TZ_NAME)
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _formatar_hora_minuto(hora: int, minuto: int, locale) -> str:
+    """Formata um minuto do dia com o Babel; há no máximo 1440 valores por locale."""
+    return format_time(time(hora, minuto), format="short", locale=locale)
 
 def format_punch_time(ts, locale):
     if ts is None:
         return ""
     
-    dt_utc = datetime.utcfromtimestamp(ts / 1000).replace(tzinfo=timezone.utc)
-    
-    dt_brazil = dt_utc.astimezone(brazil_tz)
+    dt_brazil = datetime.fromtimestamp(ts / 1000, tz=timezone.utc).astimezone(brazil_tz)
     
-    return format_time(dt_brazil, format="short", locale=locale)
+    return _formatar_hora_minuto(dt_brazil.hour, dt_brazil.minute, locale)
 
 # Configura o locale para português do Brasil
 locale = Locale('pt', 'BR')
 
+# Colunas do DataFrame de pontos formatados
+COLUNAS_PONTOS = ["ID colaborador", "Colaborador", "Data", "Dia da Semana", "Pontos", "Ajustado", "Trabalhadas", "Abono Previstas", "Saldo"]
+
+MENOS_DE_4_PONTOS = "Menos de 4 pontos batidos"
+COMPENSACAO_FERIADO = "COMPENSAÇÃO FERIADO"
+
+# Jornada prevista em minutos (08:48)
+ABONO_PREVISTO_MIN = 8 * 60 + 48
+
+def punches_to_frame(punches: Union[PunchRecords, List[Dict]]) -> pd.DataFrame:
+    """
+    Carrega os pontos em um DataFrame colunar.
+
+    Args:
+        punches (Union[PunchRecords, List[Dict]]): Registros compactos (lidos direto das colunas)
+            ou a lista bruta de registros retornados pela API do Tangerino.
+
+    Returns:
+        pd.DataFrame: Uma linha por registro, com as colunas employee_id, employee_name,
+        date, dateIn, dateOut, adjust e reason.
+    """
+    if isinstance(punches, PunchRecords):
+        return punches.to_frame()
+    return pd.DataFrame({
+        "employee_id": [p["employee"]["id"] for p in punches],
+        "employee_name": [p["employee"]["name"] for p in punches],
+        "date": [p["date"] for p in punches],
+        "dateIn": pd.array([p.get("dateIn") for p in punches], dtype="Int64"),
+        "dateOut": pd.array([p.get("dateOut") for p in punches], dtype="Int64"),
+        "adjust": [bool(p.get("adjust")) for p in punches],
+        "reason": [(p.get("adjustmentReason") or {}).get("description") for p in punches],
+    })
+
+def formatar_minutos(minutos: pd.Series, sinal: bool = False) -> pd.Series:
+    """
+    Versão vetorizada de `converter_milisegundos_para_hhmm`/`minutes_to_str` sobre minutos inteiros.
+
+    Args:
+        minutos (pd.Series): Minutos inteiros.
+        sinal (bool): Prefixa "+" ou "-" como `minutes_to_str`.
+
+    Returns:
+        pd.Series: Strings no formato "HH:MM" (ou "+HH:MM"/"-HH:MM").
+    """
+    minutos = minutos.astype("int64")
+    absolutos = minutos.abs()
+    texto = (absolutos // 60).astype(str).str.zfill(2) + ":" + (absolutos % 60).astype(str).str.zfill(2)
+    if sinal:
+        texto = pd.Series(np.where(minutos < 0, "-", "+"), index=minutos.index) + texto
+    return texto
+
+# "HH:MM" de cada minuto do dia, indexado pelo minuto
+_HORARIOS_DO_DIA = np.array([f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60)], dtype=object)
+
+def minuto_local(ms: pd.Series) -> pd.Series:
+    """
+    Converte timestamps em milissegundos para o minuto do dia no fuso de São Paulo.
+
+    Args:
+        ms (pd.Series): Timestamps em milissegundos (Int64, podendo conter nulos).
+
+    Returns:
+        pd.Series: Minuto do dia (0 a 1439) como Int64, nulo onde o timestamp é nulo.
+    """
+    horarios = pd.to_datetime(ms, unit="ms", utc=True).dt.tz_convert(BRAZIL_TZ_NAME)
+    return (horarios.dt.hour * 60 + horarios.dt.minute).astype("Int64")
+
+def formatar_horario(minutos: Optional[int]) -> str:
+    """
+    Formata um horário em minutos do dia como "HH:MM" (vazio se ausente).
+
+    Horários deslocados pelos ajustes podem sair do intervalo 00:00-23:59;
+    negativos são exibidos com "-" e os demais seguem contando as horas.
+    """
+    if minutos is None:
+        return ""
+    if 0 <= minutos < 24 * 60:
+        return _HORARIOS_DO_DIA[minutos]
+    sinal = "-" if minutos < 0 else ""
+    minutos = abs(minutos)
+    return f"{sinal}{minutos // 60:02}:{minutos % 60:02}"
+
+def formatar_pares(pares: Tuple) -> str:
+    """Formata os pares (entrada, saída) de um dia como "HH:MM - HH:MM | HH:MM - HH:MM"."""
+    return " | ".join(f"{formatar_horario(entrada)} - {formatar_horario(saida)}" for entrada, saida in pares)
+
+def parse_pares(pontos_str: str) -> Tuple:
+    """
+    Converte a coluna Pontos ("HH:MM - HH:MM | ...") em pares de minutos do dia.
+
+    Horários vazios viram None e "COMPENSAÇÃO FERIADO" vira uma tupla vazia.
+    """
+    if not pontos_str or pontos_str == COMPENSACAO_FERIADO:
+        return ()
+    pares = []
+    for bloco in pontos_str.split(" | "):
+        entrada, _, saida = bloco.partition(" - ")
+        pares.append((_parse_horario(entrada), _parse_horario(saida)))
+    return tuple(pares)
+
+def _parse_horario(texto: str) -> Optional[int]:
+    texto = texto.strip()
+    if not texto:
+        return None
+    sinal = -1 if texto.startswith("-") else 1
+    h, m = map(int, texto.lstrip("+-").split(":"))
+    return sinal * (h * 60 + m)
+
+def _parse_duracao(texto) -> Optional[int]:
+    """Converte "HH:MM"/"+HH:MM"/"-HH:MM" em minutos; vazio ou texto não numérico vira None."""
+    if not isinstance(texto, str) or ":" not in texto:
+        return None
+    return _parse_horario(texto)
+
+def _serie_duracoes(coluna: pd.Series) -> pd.Series:
+    return pd.Series([_parse_duracao(v) for v in coluna], index=coluna.index, dtype="Int64")
+
+# Colunas numéricas da representação intermediária por dia (minutos inteiros)
+COLUNAS_MINUTOS = [
+    "pares", "compensacao", "menos_de_4", "trabalhadas_min", "abono_min", "saldo_min", "ajustar",
+]
+COLUNAS_MINUTOS_AJUSTES = ["intervalo_min", "excedentes_min", "disponiveis_min", "disponiveis_reajustadas"]
+
+# Colunas adicionadas por get_adjusts
+COLUNAS_AJUSTES = ["Intervalo", "Hrs Extras Excedentes", "Hrs Extras Disponíveis"]
+
+@metrics.timed("build_day_minutes")
+def build_day_minutes(punches: List[Dict], holidays: List) -> pd.DataFrame:
+    """
+    Monta a representação intermediária por colaborador e dia a partir dos pontos brutos.
+
+    Todos os pontos são carregados em um único DataFrame colunar e cada etapa
+    (conversão de fuso, agrupamento por colaborador e dia, soma das horas
+    trabalhadas e marcação de fim de semana/feriado) é vetorizada. Os horários
+    ficam como minutos do dia em `pares`; os textos só são gerados por
+    `render_day_minutes`.
+
+    Args:
+        punches (List[Dict]): Lista de registros de ponto retornados pela API do Tangerino.
+        holidays (List): Lista de feriados no formato "YYYY-MM-DD".
+
+    Returns:
+        pd.DataFrame: Uma linha por colaborador e dia, na ordem em que os dias aparecem
+        em `punches`, com as colunas de identificação (ID colaborador, Colaborador,
+        Data, Dia da Semana, Ajustado) e as colunas de `COLUNAS_MINUTOS`.
+    """
+    if not punches:
+        return pd.DataFrame(columns=["ID colaborador", "Colaborador", "Data", "Dia da Semana", "Ajustado"] + COLUNAS_MINUTOS)
+
+    df = punches_to_frame(punches)
+
+    # Agrupa por colaborador e dia, na ordem de aparição
+    df["grupo"] = df.groupby(["employee_id", "date"], sort=False).ngroup()
+    df["incompleto"] = df["dateIn"].isna() | df["dateOut"].isna()
+    df["trabalhado_ms"] = (df["dateOut"] - df["dateIn"]).fillna(0)
+    df["entrada_min"] = minuto_local(df["dateIn"])
+    df["saida_min"] = minuto_local(df["dateOut"])
+
+    grupos = df.groupby("grupo")
+    dias = df.drop_duplicates("grupo").set_index("grupo").sort_index()
+    quantidade = grupos.size()
+    algum_incompleto = grupos["incompleto"].any()
+    trabalhado_ms = grupos["trabalhado_ms"].sum()
+
+    # Os pontos de cada dia chegam do mais recente para o mais antigo
+    pares = [[] for _ in range(len(dias))]
+    for grupo, entrada, saida in zip(df["grupo"].to_numpy()[::-1],
+                                     df["entrada_min"].astype(object).to_numpy()[::-1],
+                                     df["saida_min"].astype(object).to_numpy()[::-1]):
+        pares[grupo].append((None if entrada is pd.NA else int(entrada), None if saida is pd.NA else int(saida)))
+
+    # Datas, dias da semana e feriados vêm de uma tabela do período, consultada por data
+    datas_unicas = pd.to_datetime(pd.Index(dias["date"].unique()), format="%Y-%m-%d")
+    calendario = tabela_calendario(datas_unicas.min().date(), datas_unicas.max().date(), holidays)
+    calendario = calendario.loc[dias["date"]].set_axis(dias.index)
+
+    fim_de_semana = calendario["dia_semana_num"] >= 5
+    compensacao = dias["adjust"] & (dias["reason"] == COMPENSACAO_FERIADO)
+    menos_de_4 = ~compensacao & (algum_incompleto | ((quantidade < 2) & ~fim_de_semana))
+    sem_abono = fim_de_semana | calendario["feriado"]
+
+    trabalhadas_min = pd.Series(np.round(trabalhado_ms.astype("float64") / 1000 / 60), index=dias.index).astype("int64")
+    abono_min = pd.Series(np.where(sem_abono, 0, ABONO_PREVISTO_MIN), index=dias.index)
+
+    return pd.DataFrame({
+        "ID colaborador": dias["employee_id"],
+        "Colaborador": dias["employee_name"],
+        "Data": calendario["data"],
+        "Dia da Semana": calendario["dia_semana"],
+        "Ajustado": np.where(dias["adjust"], "Sim", ""),
+        "pares": pd.Series([() if c else tuple(p) for p, c in zip(pares, compensacao)], index=dias.index, dtype=object),
+        "compensacao": compensacao,
+        "menos_de_4": menos_de_4,
+        "trabalhadas_min": trabalhadas_min,
+        "abono_min": abono_min,
+        "saldo_min": trabalhadas_min.where(~compensacao, 0) - abono_min,
+        "ajustar": False,
+    }).reset_index(drop=True)
+
+def day_minutes_from_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reconstrói a representação intermediária a partir de um DataFrame já formatado.
+
+    Usado apenas quando o chamador tem somente as colunas de exibição (por exemplo,
+    `get_adjusts` aplicado ao resultado de `format_punches_as_dataframe`); cada
+    texto é lido uma única vez.
+
+    Args:
+        df (pd.DataFrame): DataFrame no formato de `format_punches_as_dataframe`,
+            opcionalmente com as colunas de `get_adjusts`.
+
+    Returns:
+        pd.DataFrame: Cópia de `df` com as colunas numéricas correspondentes.
+    """
+    ir = df.copy()
+    ir["pares"] = pd.Series([parse_pares(p) for p in ir["Pontos"]], index=ir.index, dtype=object)
+    ir["compensacao"] = ir["Pontos"] == COMPENSACAO_FERIADO
+    ir["menos_de_4"] = ir["Trabalhadas"] == MENOS_DE_4_PONTOS
+    ir["trabalhadas_min"] = _serie_duracoes(ir["Trabalhadas"]).fillna(0).astype("int64")
+    ir["abono_min"] = _serie_duracoes(ir["Abono Previstas"]).fillna(0).astype("int64")
+    ir["saldo_min"] = _serie_duracoes(ir["Saldo"]).fillna(0).astype("int64")
+    ir["ajustar"] = False
+
+    if "Intervalo" in ir:
+        ir["intervalo_min"] = _serie_duracoes(ir["Intervalo"])
+        ir["excedentes_min"] = _serie_duracoes(ir["Hrs Extras Excedentes"])
+        ir["disponiveis_min"] = _serie_duracoes(ir["Hrs Extras Disponíveis"])
+        ir["disponiveis_reajustadas"] = ~ir["Hrs Extras Disponíveis"].fillna("").str.startswith("+") & ir["disponiveis_min"].notna()
+
+    return ir.drop(columns=["Pontos", "Trabalhadas", "Abono Previstas", "Saldo"] + COLUNAS_AJUSTES, errors="ignore")
+
+@metrics.timed("render_day_minutes")
+def render_day_minutes(ir: pd.DataFrame) -> pd.DataFrame:
+    """
+    Gera as colunas de exibição ("HH:MM") a partir da representação intermediária.
+
+    Args:
+        ir (pd.DataFrame): Resultado de `build_day_minutes`, `compute_adjusts` ou `compute_adjusted`.
+
+    Returns:
+        pd.DataFrame: DataFrame nas colunas de `format_punches_as_dataframe`, acrescido das
+        colunas de `get_adjusts` quando os ajustes já foram calculados.
+    """
+    menos_de_4 = ir["menos_de_4"].astype(bool)
+    compensacao = ir["compensacao"].astype(bool)
+
+    df = ir[["ID colaborador", "Colaborador", "Data", "Dia da Semana"]].copy()
+    df["Pontos"] = pd.Series([formatar_pares(p) for p in ir["pares"]], index=ir.index, dtype=object).where(~compensacao, COMPENSACAO_FERIADO).astype(str)
+    df["Ajustado"] = ir["Ajustado"].where(~ir["ajustar"].astype(bool), "AJUSTAR")
+    df["Trabalhadas"] = formatar_minutos(ir["trabalhadas_min"]).where(~compensacao, "").where(~menos_de_4, MENOS_DE_4_PONTOS)
+    df["Abono Previstas"] = formatar_minutos(ir["abono_min"]).where(ir["abono_min"] > 0, "")
+    df["Saldo"] = formatar_minutos(ir["saldo_min"], sinal=True).where(~menos_de_4, MENOS_DE_4_PONTOS)
+
+    if "intervalo_min" in ir:
+        df["Intervalo"] = _formatar_opcional(ir["intervalo_min"])
+        df["Hrs Extras Excedentes"] = _formatar_opcional(ir["excedentes_min"], sinal=True)
+        disponiveis = _formatar_opcional(ir["disponiveis_min"], sinal=True)
+        reajustadas = ir["disponiveis_reajustadas"].astype(bool)
+        df["Hrs Extras Disponíveis"] = disponiveis.where(~reajustadas, _formatar_opcional(ir["disponiveis_min"]))
+
+    return df
+
+def _formatar_opcional(minutos: pd.Series, sinal: bool = False) -> pd.Series:
+    """Como `formatar_minutos`, mas valores nulos viram string vazia."""
+    nulos = minutos.isna()
+    texto = formatar_minutos(minutos.fillna(0), sinal=sinal)
+    return texto.where(~nulos, "").astype(str)
+
+@metrics.timed("format_punches_as_dataframe")
 def format_punches_as_dataframe(punches: List[Dict], holidays: List) -> pd.DataFrame:
     """
     Converts a list of punch records into a formatted pandas DataFrame.
@@ -31,57 +307,52 @@ def format_punches_as_dataframe(punches: List[Dict], holidays: List) -> pd.DataF
         holidays (List): List of holidays dates.
 
     Returns:
-        pd.DataFrame: A DataFrame containing formatted punch data for further analysis or export.
+        pd.DataFrame: A DataFrame containing formatted punch data for further analysis or export,
+        one row per employee and day, in the order the days first appear in `punches`.
 
     Notes:
-        - Assumes each record contains keys like 'employee', 'punchTime', etc.
-        - This function should parse and format timestamps, extract names, and structure data appropriately.
-    """
-    rows = []
-    date_emp_id = {}
-    for p in punches:
-        if f"{p['employee']['id']} - {p['date']}" in date_emp_id:
-            date_emp_id[f"{p['employee']['id']} - {p['date']}"].append(p)
-        else:
-            date_emp_id[f"{p['employee']['id']} - {p['date']}"] = [p]
-
-    for chave in date_emp_id:
-        p = date_emp_id[chave]
-        rows.append({
-            "ID colaborador": p[0]["employee"]["id"],
-            "Colaborador": p[0]["employee"]["name"],
-            "Data": converter_data_iso_para_ddmmaaaa(p[0]["date"]),
-            "Dia da Semana": obter_dia_semana(p[0]["date"]),
-            "Pontos": (
-                "COMPENSAÇÃO FERIADO"
-                if p[0].get("adjust") and p[0].get("adjustmentReason", {}).get("description") == "COMPENSAÇÃO FERIADO"
-                else " | ".join(
-                    f'{format_punch_time(punch["dateIn"], locale)} - {format_punch_time(punch["dateOut"], locale)}'
-                    for punch in reversed(p)
-                )
-            ),
-            "Ajustado": "Sim" if p[0]["adjust"] else "",
-            "Trabalhadas": (
-                "" if p[0].get("adjust") and p[0].get("adjustmentReason", {}).get("description") == "COMPENSAÇÃO FERIADO"
-                else "Menos de 4 pontos batidos"
-                if any(punch.get("dateIn") is None or punch.get("dateOut") is None for punch in p) or len(p) < 2 and obter_dia_semana(p[0]["date"]) not in ["sábado", "domingo"]
-                else converter_milisegundos_para_hhmm(
-                    sum(
-                        punch["dateOut"] - punch["dateIn"]
-                        for punch in p
-                        if punch.get("dateIn") is not None and punch.get("dateOut") is not None
-                    )
-                )
-            ),
-            "Abono Previstas": "" if obter_dia_semana(p[0]["date"]) in ['sábado', 'domingo'] or p[0]["date"] in holidays else "08:48",
-            "Saldo": "",
-        })
-        
-        rows[-1]["Saldo"] = "Menos de 4 pontos batidos" if rows[-1]["Trabalhadas"] == "Menos de 4 pontos batidos" else minutes_to_str(
-            str_to_minutes(rows[-1].get("Trabalhadas", "")) - str_to_minutes(rows[-1].get("Abono Previstas", ""))
-        )
-
-    return pd.DataFrame(rows)
+        - The heavy lifting happens in `build_day_minutes`; this function only renders its result.
+    """
+    return render_day_minutes(build_day_minutes(punches, holidays))
+
+# Horário comercial considerado no cálculo do intervalo (08:00-17:48)
+INICIO_COMERCIAL_MIN = 8 * 60
+FIM_COMERCIAL_MIN = 17 * 60 + 48
+
+# Intervalo mínimo aceito e limite diário de horas extras (1:57)
+INTERVALO_MINIMO = 58
+LIMITE_EXTRA = 117
+
+def intervalo_minutos(pares: Tuple) -> Optional[int]:
+    """
+    Calcula o maior intervalo entre as batidas dentro do horário comercial (08:00-17:48).
+
+    Args:
+        pares (Tuple): Pares (entrada, saída) em minutos do dia; horários ausentes são None.
+
+    Returns:
+        Optional[int]: Maior intervalo em minutos, ou None se não houver intervalos válidos.
+    """
+    horarios = [h for par in pares for h in par if h is not None]
+
+    # Com uma única entrada e saída não há intervalo
+    if len(horarios) <= 2:
+        return None
+
+    intervalos = []
+    for i in range(1, len(horarios) - 1, 2):
+        saida, entrada = horarios[i], horarios[i + 1]
+
+        # Se o intervalo estiver TOTALMENTE fora do horário comercial, ignora
+        if (saida < INICIO_COMERCIAL_MIN and entrada < INICIO_COMERCIAL_MIN) or \
+           (saida > FIM_COMERCIAL_MIN and entrada > FIM_COMERCIAL_MIN):
+            continue
+
+        # Ajuste para passar meia-noite
+        intervalos.append((entrada - saida) % (24 * 60))
+
+    # Pega o maior intervalo (mesmo que seja menor que 58 minutos)
+    return max(intervalos) if intervalos else None
 
 def calcular_intervalo(pontos_str: str) -> str:
     """
@@ -95,54 +366,108 @@ def calcular_intervalo(pontos_str: str) -> str:
         str: Intervalo formatado como "HH:MM" ou string vazia se não houver intervalos válidos.
     """
     try:
-        if not pontos_str or pontos_str == "COMPENSAÇÃO FERIADO":
-            return ""
-            
-        # Extrai todos os horários da string
-        horarios = re.findall(r'(\d{2}:\d{2})', pontos_str)
-        if len(horarios) < 2:
-            return ""
-            
-        # Se houver apenas 2 horários (uma entrada e uma saída), não há intervalo
-        if len(horarios) == 2:
-            return ""
-            
-        # Calcula todos os intervalos entre saídas e entradas subsequentes
-        intervalos = []
-        fmt = "%H:%M"
-        hora_inicio_comercial = datetime.strptime("08:00", fmt)
-        hora_fim_comercial = datetime.strptime("17:48", fmt)
-        
-        for i in range(1, len(horarios)-1, 2):
-            saida = horarios[i].strip()
-            entrada = horarios[i+1].strip()
-            
-            t_saida = datetime.strptime(saida, fmt)
-            t_entrada = datetime.strptime(entrada, fmt)
-            
-            # Se o intervalo estiver TOTALMENTE fora do horário comercial, ignora
-            if (t_saida < hora_inicio_comercial and t_entrada < hora_inicio_comercial) or \
-               (t_saida > hora_fim_comercial and t_entrada > hora_fim_comercial):
-                continue
-            
-            # Calcula o intervalo
-            intervalo = t_entrada - t_saida
-            if intervalo.total_seconds() < 0:
-                intervalo += timedelta(days=1)  # Ajuste para passar meia-noite
-            
-            intervalos.append(intervalo)
-            
-        if not intervalos:
-            return ""
-            
-        # Pega o maior intervalo (mesmo que seja menor que 58 minutos)
-        maior_intervalo = max(intervalos)
-        horas = maior_intervalo.seconds // 3600
-        minutos = (maior_intervalo.seconds % 3600) // 60
-        
-        return f"{horas:02d}:{minutos:02d}"
+        intervalo = intervalo_minutos(parse_pares(pontos_str))
     except Exception:
         return ""
+    return "" if intervalo is None else formatar_horario(intervalo)
+
+@metrics.timed("compute_adjusts")
+def compute_adjusts(ir: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula Intervalo, Horas Extras Excedentes e Horas Extras Disponíveis sobre os minutos.
+
+    Args:
+        ir (pd.DataFrame): Representação intermediária retornada por `build_day_minutes`.
+
+    Returns:
+        pd.DataFrame: Cópia de `ir` com as colunas de `COLUNAS_MINUTOS_AJUSTES`.
+    """
+    df = ir.copy()
+    df["intervalo_min"] = pd.Series([intervalo_minutos(p) for p in df["pares"]], index=df.index, dtype="Int64")
+
+    saldo = df["saldo_min"].where(~df["menos_de_4"].astype(bool), 0)
+    com_abono = df["abono_min"] > 0
+
+    # Horas acima de 1:57 no dia
+    excedentes = com_abono & (saldo > LIMITE_EXTRA)
+    df["excedentes_min"] = (saldo - LIMITE_EXTRA).astype("Int64").where(excedentes)
+
+    # Horas que ainda faltam para atingir 1:57 no dia
+    disponiveis = com_abono & (saldo < LIMITE_EXTRA) & (saldo >= 0) & ~df["menos_de_4"].astype(bool) & ~df["compensacao"].astype(bool)
+    df["disponiveis_min"] = (LIMITE_EXTRA - saldo).astype("Int64").where(disponiveis)
+    df["disponiveis_reajustadas"] = False
+
+    return df
+
+def _somar(minutos: Optional[int], delta: int) -> int:
+    # Horários ausentes contam como 00:00, como na coluna Pontos original
+    return (minutos or 0) + delta
+
+@metrics.timed("compute_adjusted")
+def compute_adjusted(ir: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica as regras de compensação sobre os minutos de cada dia.
+
+    - Intervalos menores que 58 minutos antecipam o primeiro par de batidas.
+    - As horas excedentes (acima de 1:57) de todo o período formam um saldo que é
+      distribuído, na ordem das linhas, entre os dias com horas extras disponíveis.
+    - A saída dos dias com horas excedentes é reduzida até o limite.
+
+    Args:
+        ir (pd.DataFrame): Resultado de `compute_adjusts`.
+
+    Returns:
+        pd.DataFrame: Cópia de `ir` com os pares e as colunas de horas extras ajustados.
+    """
+    df = ir.copy()
+    originais = df["pares"].tolist()
+    com_intervalo_par = np.array([len(p) > 1 for p in originais], dtype=bool)
+
+    # Saldo de horas excedentes do período, consumido em ordem pelos dias com horas disponíveis
+    total = int(df["excedentes_min"].fillna(0).sum())
+    disponiveis = df["disponiveis_min"].fillna(0).to_numpy(dtype="int64")
+    restante_antes = np.clip(total - (np.cumsum(disponiveis) - disponiveis), 0, None)
+    distribui = df["disponiveis_min"].notna().to_numpy() & (restante_antes > 0)
+    a_somar = np.minimum(disponiveis, restante_antes)
+    restante_depois = restante_antes - a_somar
+
+    intervalo = df["intervalo_min"].fillna(0).to_numpy(dtype="int64")
+    excedentes = df["excedentes_min"].fillna(0).to_numpy(dtype="int64")
+
+    reduz_intervalo = (intervalo < INTERVALO_MINIMO) & com_intervalo_par
+    soma_extras = distribui & com_intervalo_par
+    remove_excedentes = df["excedentes_min"].notna().to_numpy() & com_intervalo_par
+
+    # Cada regra parte dos pares originais; a última aplicada define os pares finais
+    pares = list(originais)
+    for i in np.flatnonzero(reduz_intervalo):
+        (entrada, saida), *resto = originais[i]
+        reduzir = INTERVALO_MINIMO - intervalo[i]
+        pares[i] = ((_somar(entrada, -reduzir), _somar(saida, -reduzir)), *resto)
+    for i in np.flatnonzero(soma_extras):
+        entrada, saida = originais[i][-1]
+        novos = list(originais[i])
+        novos[1] = (entrada, _somar(saida, int(a_somar[i])))
+        pares[i] = tuple(novos)
+    for i in np.flatnonzero(remove_excedentes):
+        entrada, saida = originais[i][-1]
+        novos = list(originais[i])
+        novos[1] = (entrada, _somar(saida, -int(excedentes[i])))
+        pares[i] = tuple(novos)
+
+    df["pares"] = pd.Series(pares, index=df.index, dtype=object)
+    df["intervalo_min"] = df["intervalo_min"].mask(reduz_intervalo, 60)
+
+    reajuste = pd.Series(disponiveis - a_somar, index=df.index, dtype="Int64")
+    zera = soma_extras & ~(restante_depois < disponiveis)
+    df["disponiveis_min"] = df["disponiveis_min"].mask(soma_extras, reajuste).mask(zera, pd.NA)
+    df["disponiveis_reajustadas"] = df["disponiveis_reajustadas"].astype(bool) | (soma_extras & ~zera)
+    df["excedentes_min"] = df["excedentes_min"].mask(remove_excedentes, pd.NA)
+    df["ajustar"] = df["ajustar"].astype(bool) | reduz_intervalo | soma_extras | remove_excedentes
+
+    return df
+
+@metrics.timed("get_adjusts")
 def get_adjusts(df_punches: pd.DataFrame) -> pd.DataFrame:
     """
     Adiciona colunas calculadas como Intervalo, Horas Extras Disponíveis e Horas Faltantes ao DataFrame de batidas.
@@ -153,125 +478,68 @@ def get_adjusts(df_punches: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame com novas colunas calculadas.
     """
-    df = df_punches.copy()
-    df["Intervalo"] = df["Pontos"].apply(calcular_intervalo)
-    
-    # Converte saldo e abono previstos para minutos
-    df["Saldo_min"] = df["Saldo"].apply(lambda x: str_to_minutes(x) if isinstance(x, str) and x != "Menos de 4 pontos batidos" else 0)
-    df["Abono_min"] = df["Abono Previstas"].apply(lambda x: str_to_minutes(x) if isinstance(x, str) else 0)
-    
-    LIMITE_EXTRA = 117  # 1:57 em minutos
-
-    # Cria coluna de horas extras disponíveis
-    df["Hrs Extras Excedentes"] = df.apply(
-        lambda row: minutes_to_str(row["Saldo_min"] - LIMITE_EXTRA) 
-        if row["Abono_min"] > 0 and row["Saldo_min"] > LIMITE_EXTRA else "", 
-        axis=1
-    )
-
-    # Cria coluna de horas faltantes para atingir 1:57
-    df["Hrs Extras Disponíveis"] = df.apply(
-        lambda row: minutes_to_str(LIMITE_EXTRA - row["Saldo_min"]) 
-        if row["Abono_min"] > 0 and row["Saldo_min"] < LIMITE_EXTRA and row["Saldo"] != "Menos de 4 pontos batidos" and row["Pontos"] != "COMPENSAÇÃO FERIADO" and not row["Saldo"].startswith("-") else "", 
-        axis=1
-    )
-
-    # Remove colunas temporárias
-    df.drop(columns=["Saldo_min", "Abono_min"], inplace=True)
-    
-    return df
+    return render_day_minutes(compute_adjusts(day_minutes_from_frame(df_punches)))
 
-def adjusted_punches(punches: List[Dict]) -> pd.DataFrame:
+@metrics.timed("adjusted_punches")
+def adjusted_punches(punches: pd.DataFrame) -> pd.DataFrame:
     """
     Ajusta os pontos de acordo com as regras de compensação e retorna um DataFrame formatado.
 
     Args:
-        punches (List[Dict]): Lista de pontos retornados pela API do Tangerino.
+        punches (pd.DataFrame): DataFrame retornado pela função get_adjusts.
 
     Returns:
         pd.DataFrame: DataFrame contendo os dados ajustados dos pontos.
     """
-    df = punches.copy()
+    return render_day_minutes(compute_adjusted(day_minutes_from_frame(punches)))
 
-    def str_to_minutes(time_str):
-        """Helper function to convert time string to minutes"""
-        if not time_str or time_str in ["", None]:
-            return 0
-        h, m = map(int, time_str.strip("+").split(":"))
-        minutes = h * 60 + m
-        return minutes
-    
-    def minutes_to_str(minutes):
-        """Helper function to convert minutes to time string"""
-        sign = "-" if minutes < 0 else ""
-        minutes = abs(minutes)
-        return f"{sign}{minutes // 60:02}:{minutes % 60:02}"
-    
-    def somar_minutos_hora_str(hora_str, minutos):
-        """Helper function to add minutes to a time string"""
-        total_minutes = str_to_minutes(hora_str) + minutos
-        return minutes_to_str(total_minutes)
-    
-    total_minutes = df["Hrs Extras Excedentes"].apply(str_to_minutes).sum()
-
-    for idx, row in df.iterrows():
-        # Ajustando tempo de intervalo para ser no mínimo 1:00
-        if str_to_minutes(row["Intervalo"]) < 58:
-            pontos = row["Pontos"]
-            blocos = pontos.split(" | ")
-            minutes_to_reduce = 58 - str_to_minutes(row["Intervalo"])
-
-            if len(blocos) > 1:
-                entrada_saida = blocos[0].split(" - ")
-                if len(entrada_saida) == 2:
-                    nova_entrada = somar_minutos_hora_str(entrada_saida[0], -minutes_to_reduce)
-                    nova_saida = somar_minutos_hora_str(entrada_saida[-1], -minutes_to_reduce)
-                    nova_bloco = f"{nova_entrada} - {nova_saida}"
-                    blocos[0] = nova_bloco
-                    df.at[idx, "Pontos"] = " | ".join(blocos)
-
-                    df.at[idx, "Intervalo"] = "01:00"
-                    df.at[idx, "Ajustado"] = "AJUSTAR"
-
-        # Ajustando horas extras excedentes
-        extra = row["Hrs Extras Disponíveis"]
-
-        if extra and total_minutes > 0:
-            minutos_extra = str_to_minutes(extra)
-            minutos_para_somar = minutos_extra if total_minutes >= minutos_extra else total_minutes
-            total_minutes -= minutos_para_somar
-
-            pontos = row["Pontos"]
-            blocos = pontos.split(" | ")
-
-            if len(blocos) > 1:
-                entrada_saida = blocos[-1].split(" - ")
-                if len(entrada_saida) == 2:
-                    nova_saida = somar_minutos_hora_str(entrada_saida[-1], minutos_para_somar)
-                    nova_bloco = f"{entrada_saida[0]} - {nova_saida}"
-                    blocos[1] = nova_bloco
-                    df.at[idx, "Pontos"] = " | ".join(blocos)
-
-                    if total_minutes < minutos_extra:
-                        df.at[idx, "Hrs Extras Disponíveis"] = minutes_to_str(minutos_extra - minutos_para_somar)
-                    else:
-                        df.at[idx, "Hrs Extras Disponíveis"] = ""
-
-                    df.at[idx, "Ajustado"] = "AJUSTAR"
-
-        # Ajustando ponto de saída com horas extras excedentes
-        if df.at[idx, "Hrs Extras Excedentes"] != "":
-            pontos = row["Pontos"]
-            blocos = pontos.split(" | ")
-            if len(blocos) > 1:
-                entrada_saida = blocos[-1].split(" - ")
-                if len(entrada_saida) == 2:
-                    nova_saida = somar_minutos_hora_str(entrada_saida[-1], -str_to_minutes(df.at[idx, "Hrs Extras Excedentes"]))
-                    nova_bloco = f"{entrada_saida[0]} - {nova_saida}"
-                    blocos[1] = nova_bloco
-                    df.at[idx, "Pontos"] = " | ".join(blocos)
-
-                    df.at[idx, "Ajustado"] = "AJUSTAR"
-                    df.at[idx, "Hrs Extras Excedentes"] = ""
-
-    return df
\ No newline at end of file
+def prepare_day_minutes(punches: List[Dict], holidays: List) -> pd.DataFrame:
+    """
+    Monta os minutos de cada dia, ordena pela Data e aplica `compute_adjusts`.
+
+    Todas as colunas calculadas aqui dependem apenas do próprio dia, então as
+    linhas podem ser guardadas e reaproveitadas entre períodos diferentes.
+
+    Args:
+        punches (List[Dict]): Registros de ponto de um único colaborador.
+        holidays (List): Lista de feriados no formato "YYYY-MM-DD".
+
+    Returns:
+        pd.DataFrame: Representação intermediária com as colunas de ajustes e Data em datetime.
+    """
+    day_minutes = build_day_minutes(punches, holidays)
+    day_minutes["Data"] = pd.to_datetime(day_minutes["Data"], format="%d/%m/%Y")
+    day_minutes = day_minutes.sort_values("Data")
+    return compute_adjusts(day_minutes)
+
+def process_day_minutes(punches: List[Dict], holidays: List) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Executa o pipeline completo sobre os pontos de um colaborador, em minutos.
+
+    As linhas são ordenadas pela Data antes dos ajustes, pois a distribuição das
+    horas excedentes segue a ordem dos dias.
+
+    Args:
+        punches (List[Dict]): Registros de ponto de um único colaborador.
+        holidays (List): Lista de feriados no formato "YYYY-MM-DD".
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Representações intermediárias antes
+        (`compute_adjusts`) e depois (`compute_adjusted`) dos ajustes, com Data em datetime.
+    """
+    pre_adjusts = prepare_day_minutes(punches, holidays)
+    return pre_adjusts, compute_adjusted(pre_adjusts)
+
+def process_punches(punches: List[Dict], holidays: List) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Executa format_punches_as_dataframe → get_adjusts → adjusted_punches para um colaborador.
+
+    Args:
+        punches (List[Dict]): Registros de ponto de um único colaborador.
+        holidays (List): Lista de feriados no formato "YYYY-MM-DD".
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Tabelas "Pré Ajustes" e "Pontos Ajustados".
+    """
+    pre_adjusts, adjusted = process_day_minutes(punches, holidays)
+    return render_day_minutes(pre_adjusts), render_day_minutes(adjusted)
@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
 import pandas as pd
 from babel.dates import format_date, format_datetime, format_time
 from babel import Locale
@@ -6,10 +7,14 @@ from babel import Locale
 # Configura o locale para português do Brasil
 locale = Locale('pt', 'BR')
 
+# Máximo de valores distintos memorizados por cada função de formatação
+FORMAT_CACHE_SIZE = 4096
+
 def converter_data_para_ms(data: datetime) -> int:
     """Converte datetime para milissegundos desde epoch."""
     return int(data.timestamp() * 1000)
 
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
 def converter_data_iso_para_ddmmaaaa(data_iso: str) -> str:
     """
     Converte uma data no formato ISO (YYYY-MM-DD) para o formato brasileiro (DD/MM/AAAA) usando Babel.
@@ -29,6 +34,7 @@ def converter_data_iso_para_ddmmaaaa(data_iso: str) -> str:
     except Exception as e:
         raise ValueError(f"Data inválida ou em formato incorreto: '{data_iso}'. Esperado 'YYYY-MM-DD'.") from e
 
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
 def obter_dia_semana(data_iso: str) -> str:
     """
     Retorna o nome completo do dia da semana em português para uma data no formato ISO (YYYY-MM-DD).
@@ -48,6 +54,32 @@ def obter_dia_semana(data_iso: str) -> str:
     except ValueError:
         raise ValueError(f"Data inválida ou em formato incorreto: '{data_iso}'. Esperado 'YYYY-MM-DD'.")
 
+def tabela_calendario(inicio: date, fim: date, holidays=()) -> pd.DataFrame:
+    """
+    Monta a tabela de consulta dos dias do período, uma linha por data.
+
+    Os textos vêm de `converter_data_iso_para_ddmmaaaa` e `obter_dia_semana`,
+    memorizadas: cada data distinta passa pelo Babel uma única vez por processo.
+
+    Args:
+        inicio (date): Primeiro dia.
+        fim (date): Último dia.
+        holidays: Feriados no formato "YYYY-MM-DD".
+
+    Returns:
+        pd.DataFrame: Indexada pela data ISO, com as colunas "data" (DD/MM/AAAA),
+        "dia_semana", "dia_semana_num" (0 = segunda-feira) e "feriado".
+    """
+    datas = pd.date_range(inicio, fim, freq="D")
+    isos = [d.strftime("%Y-%m-%d") for d in datas]
+    feriados = set(holidays)
+    return pd.DataFrame({
+        "data": [converter_data_iso_para_ddmmaaaa(d) for d in isos],
+        "dia_semana": [obter_dia_semana(d) for d in isos],
+        "dia_semana_num": datas.dayofweek,
+        "feriado": [d in feriados for d in isos],
+    }, index=pd.Index(isos))
+
 def converter_milisegundos_para_hhmm(ms: int) -> str:
     """
     Converte milissegundos para o formato 'HH:MM', com minutos arredondados.
@@ -79,43 +111,528 @@ def minutes_to_str(mins):
     mins = abs(mins)
     return f"{sign}{mins // 60:02}:{mins % 60:02}"
 
-from typing import List, Dict
-from datetime import datetime, timedelta
-from api.api import get_punch
+import hashlib
+import logging
+import os
+import threading
+from collections import deque
+from typing import List, Dict, Iterator, NamedTuple, Tuple, Callable, Optional
+from datetime import date, datetime, time, timedelta
+from concurrent.futures import FIRST_COMPLETED, wait
+import requests
+from api.api import get_punch, fetch_punch_page
+from utils import metrics
+from utils.punch_records import PunchRecords
+
+logger = logging.getLogger(__name__)
+
+# Tamanho inicial de cada bloco de busca na API
+CHUNK_DAYS = 8
+
+# Limites do tamanho adaptativo dos blocos, em dias
+MIN_CHUNK_DAYS = int(os.getenv("PUNCH_MIN_CHUNK_DAYS", "1"))
+MAX_CHUNK_DAYS = int(os.getenv("PUNCH_MAX_CHUNK_DAYS", "31"))
+
+# Respostas com até metade deste número de registros e mais rápidas que CHUNK_FAST_SECONDS
+# fazem o bloco crescer; acima dele, ou mais lentas que CHUNK_SLOW_SECONDS, o bloco diminui
+CHUNK_TARGET_RECORDS = 300
+CHUNK_FAST_SECONDS = 1.0
+CHUNK_SLOW_SECONDS = 5.0
+
+# Número padrão de blocos buscados em paralelo
+MAX_WORKERS = 4
+
+# Rodadas extras, ao final da busca, apenas para os blocos que falharam
+CHUNK_RETRY_ROUNDS = 1
+
+class ChunkResult(NamedTuple):
+    """Resultado da busca de uma janela: os pontos, ou a mensagem de erro."""
+    inicio: int
+    fim: int
+    punches: Optional[PunchRecords]
+    erro: Optional[str] = None
+    segundos: float = 0.0
+    truncado: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.erro is None
+
+    @property
+    def dias(self) -> List[date]:
+        """Dias cobertos pela janela (o instante final pertence à janela seguinte)."""
+        return dias_entre(dia_local(self.inicio), dia_local(max(self.inicio, self.fim - 1)))
+
+class FetchResult(NamedTuple):
+    """Pontos de um período e as janelas que não puderam ser buscadas."""
+    punches: PunchRecords
+    falhas: List[ChunkResult]
+    blocos: int = 0
 
-def fetch_punches_in_chunks(start_ms: int, end_ms: int, colaborador_id, token: str) -> List[Dict]:
+    @property
+    def dias_incompletos(self) -> List[date]:
+        """Dias cobertos por alguma janela com falha, em ordem crescente."""
+        return sorted({dia for falha in self.falhas for dia in falha.dias})
+
+def namespace_da_conta(token: str) -> str:
+    """
+    Identificador estável da conta (empresa) para separar caches e arquivos em disco.
+
+    IDs de colaboradores de empresas diferentes podem coincidir; por isso o cache
+    de pontos e o arquivo Parquet ficam separados por token. Apenas um resumo
+    (SHA-256) do token é usado, nunca o próprio token.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+def dia_local(ms: int) -> date:
+    """Converte um timestamp em milissegundos para a data local."""
+    return datetime.fromtimestamp(ms / 1000).date()
+
+def dias_entre(inicio: date, fim: date) -> List[date]:
+    """Retorna todos os dias entre `inicio` e `fim`, inclusive."""
+    return [inicio + timedelta(days=i) for i in range((fim - inicio).days + 1)]
+
+def agrupar_dias_consecutivos(dias: List[date]) -> List[Tuple[date, date]]:
     """
-    Busca os registros de ponto em blocos de 8 dias, evitando sobrecarga na API.
+    Agrupa uma lista ordenada de dias em faixas contínuas.
+
+    Args:
+        dias (List[date]): Dias em ordem crescente.
+
+    Returns:
+        List[Tuple[date, date]]: Faixas (primeiro dia, último dia).
+    """
+    faixas = []
+    for dia in dias:
+        if faixas and dia - faixas[-1][1] == timedelta(days=1):
+            faixas[-1] = (faixas[-1][0], dia)
+        else:
+            faixas.append((dia, dia))
+    return faixas
+
+def faixas_de_dias(dias: List[date]) -> List[Tuple[int, int]]:
+    """Converte uma lista ordenada de dias em intervalos contínuos (início, fim) em milissegundos."""
+    return [
+        (int(datetime.combine(primeiro, time.min).timestamp() * 1000), int(datetime.combine(ultimo, time.max).timestamp() * 1000))
+        for primeiro, ultimo in agrupar_dias_consecutivos(dias)
+    ]
+
+def formatar_faixas_de_dias(dias: List[date]) -> str:
+    """Descreve uma lista ordenada de dias como faixas, ex.: "01/05/2025 a 08/05/2025, 12/05/2025"."""
+    faixas = []
+    for primeiro, ultimo in agrupar_dias_consecutivos(dias):
+        texto = primeiro.strftime("%d/%m/%Y")
+        if ultimo != primeiro:
+            texto += f" a {ultimo.strftime('%d/%m/%Y')}"
+        faixas.append(texto)
+    return ", ".join(faixas)
+
+def split_em_blocos(start_ms: int, end_ms: int, dias: int = CHUNK_DAYS) -> List[Tuple[int, int]]:
+    """
+    Divide o intervalo em janelas consecutivas de até `dias` dias.
 
     Args:
         start_ms (int): Timestamp inicial em milissegundos.
         end_ms (int): Timestamp final em milissegundos.
-        colaborador_id: ID do colaborador.
-        token (str): Token de autenticação.
+        dias (int): Tamanho máximo de cada janela em dias.
 
     Returns:
-        List[Dict]: Lista acumulada de registros de ponto.
+        List[Tuple[int, int]]: Lista de janelas (início, fim) em milissegundos.
     """
-    punches = []
+    blocos = []
     current_start = datetime.fromtimestamp(start_ms / 1000)
     final_end = datetime.fromtimestamp(end_ms / 1000)
 
     while current_start < final_end:
-        current_end = current_start + timedelta(days=8)
+        current_end = current_start + timedelta(days=dias)
 
         # Limita a data final ao limite real
         if current_end > final_end:
             current_end = final_end
 
-        # Converte para milissegundos
-        current_start_ms = int(current_start.timestamp() * 1000)
-        current_end_ms = int(current_end.timestamp() * 1000)
-
-        # Busca os dados para o intervalo atual
-        chunk = get_punch(current_start_ms, current_end_ms, colaborador_id, token)
-        punches.extend(chunk)
+        blocos.append((int(current_start.timestamp() * 1000), int(current_end.timestamp() * 1000)))
 
         # Avança para o próximo bloco
         current_start = current_end
 
-    return punches
\ No newline at end of file
+    return blocos
+
+def chave_ponto(punch: Dict) -> tuple:
+    """Retorna a chave usada para identificar registros de ponto duplicados."""
+    if punch.get("id") is not None:
+        return ("id", punch["id"])
+    return (punch.get("employee", {}).get("id"), punch.get("date"), punch.get("dateIn"), punch.get("dateOut"))
+
+def mesclar_blocos(blocos: List[PunchRecords]) -> PunchRecords:
+    """
+    Junta os resultados dos blocos na ordem das janelas, removendo duplicados.
+
+    Janelas vizinhas compartilham o instante de fronteira, então o mesmo ponto
+    pode aparecer em dois blocos.
+
+    Args:
+        blocos (List[PunchRecords]): Resultados de cada janela (ou listas de dicionários da API), na ordem cronológica.
+
+    Returns:
+        PunchRecords: Registros de ponto únicos.
+    """
+    return PunchRecords.merge(blocos)
+
+def buscar_janelas(janelas: List[Tuple[int, int]], colaborador_id, token: str, max_workers: int = MAX_WORKERS,
+                   buscar: Callable = get_punch) -> List:
+    """
+    Executa `buscar` para cada janela, em paralelo, preservando a ordem das janelas.
+
+    Args:
+        janelas (List[Tuple[int, int]]): Janelas (início, fim) em milissegundos.
+        colaborador_id: ID do colaborador.
+        token (str): Token de autenticação.
+        max_workers (int): Número máximo de janelas buscadas simultaneamente.
+        buscar (Callable): Função com a assinatura de `get_punch`.
+
+    Returns:
+        List: Resultado de cada janela, na mesma ordem de `janelas`.
+    """
+    def tarefa(janela: Tuple[int, int]):
+        return buscar(janela[0], janela[1], colaborador_id, token)
+
+    if max_workers <= 1 or len(janelas) <= 1:
+        return [tarefa(janela) for janela in janelas]
+
+    with metrics.ContextExecutor(max_workers=min(max_workers, len(janelas))) as executor:
+        # executor.map preserva a ordem das janelas
+        return list(executor.map(tarefa, janelas))
+
+class AdaptiveChunker:
+    """
+    Ajusta o tamanho das janelas de busca conforme o tamanho e a latência das respostas.
+
+    O tamanho dobra enquanto as respostas são pequenas e rápidas e cai pela metade
+    quando são grandes, lentas ou falham, sempre entre `min_days` e `max_days`.
+    Respostas truncadas (a API indicou mais páginas) são divididas ao meio e buscadas
+    de novo. Seguro para uso entre threads.
+    """
+
+    def __init__(self, dias: int = CHUNK_DAYS, min_days: int = MIN_CHUNK_DAYS, max_days: int = MAX_CHUNK_DAYS):
+        self.min_days = max(1, min_days)
+        self.max_days = max(self.min_days, max_days)
+        self.dias = min(max(dias, self.min_days), self.max_days)
+        # Depois de uma resposta truncada, o tamanho não volta a crescer até o ponto de truncar
+        self.teto = self.max_days
+        self._lock = threading.Lock()
+
+    def janela(self, start_ms: int, end_ms: int) -> Tuple[int, int]:
+        """Retorna a próxima janela a partir de `start_ms`, com o tamanho atual, limitada a `end_ms`."""
+        with self._lock:
+            dias = self.dias
+        fim = int((datetime.fromtimestamp(start_ms / 1000) + timedelta(days=dias)).timestamp() * 1000)
+        return start_ms, min(fim, end_ms)
+
+    def observe(self, resultado: ChunkResult) -> List[Tuple[int, int]]:
+        """
+        Ajusta o tamanho a partir de uma resposta.
+
+        Args:
+            resultado (ChunkResult): Resultado da busca de uma janela.
+
+        Returns:
+            List[Tuple[int, int]]: Metades a buscar no lugar de `resultado`, quando ele veio
+            truncado e ainda pode ser dividido; caso contrário, lista vazia (uma janela truncada
+            do tamanho mínimo deve ter a paginação seguida com `completar_paginas`).
+        """
+        dias = len(resultado.dias)
+        registros = len(resultado.punches or [])
+        with self._lock:
+            if resultado.truncado:
+                self.teto = max(self.min_days, min(self.teto, dias // 2))
+            if not resultado.ok or resultado.truncado or registros > CHUNK_TARGET_RECORDS or resultado.segundos > CHUNK_SLOW_SECONDS:
+                self.dias = max(self.min_days, min(self.dias, dias) // 2)
+            elif registros <= CHUNK_TARGET_RECORDS // 2 and resultado.segundos < CHUNK_FAST_SECONDS and dias >= self.dias:
+                self.dias = min(self.teto, self.dias * 2)
+
+        if not resultado.truncado or dias // 2 < self.min_days:
+            return []
+        meio = int((datetime.fromtimestamp(resultado.inicio / 1000) + timedelta(days=dias // 2)).timestamp() * 1000)
+        return [(resultado.inicio, meio), (meio, resultado.fim)]
+
+def buscar_bloco(start_ms: int, end_ms: int, colaborador_id, token: str) -> ChunkResult:
+    """Busca uma janela, devolvendo o status em vez de levantar exceção."""
+    try:
+        pagina = fetch_punch_page(start_ms, end_ms, colaborador_id, token)
+        # A resposta é convertida de imediato; os dicionários da API não ficam acumulados
+        return ChunkResult(start_ms, end_ms, PunchRecords.from_punches(pagina["content"]), segundos=pagina["elapsed"],
+                           truncado=pagina["truncated"])
+    except requests.exceptions.RequestException as e:
+        logger.error("Erro ao buscar pontos: %s", e)
+        return ChunkResult(start_ms, end_ms, None, str(e))
+
+def completar_paginas(resultado: ChunkResult, colaborador_id, token: str) -> ChunkResult:
+    """
+    Segue a paginação de uma janela truncada que não pode mais ser dividida.
+
+    Args:
+        resultado (ChunkResult): Primeira página da janela, com `truncado` verdadeiro.
+        colaborador_id: ID do colaborador.
+        token (str): Token de autenticação.
+
+    Returns:
+        ChunkResult: A janela com os registros de todas as páginas, ou com falha se
+        alguma página falhar (nunca fica marcada como completa com dados faltando).
+    """
+    blocos, segundos, page = [resultado.punches], resultado.segundos, 1
+    try:
+        while True:
+            pagina = fetch_punch_page(resultado.inicio, resultado.fim, colaborador_id, token, page=page)
+            blocos.append(PunchRecords.from_punches(pagina["content"]))
+            segundos += pagina["elapsed"]
+            if not pagina["truncated"]:
+                break
+            if not pagina["content"]:
+                raise requests.exceptions.RequestException(f"Página {page} vazia, mas a API indica páginas seguintes")
+            page += 1
+    except requests.exceptions.RequestException as e:
+        logger.error("Erro ao buscar pontos: %s", e)
+        return ChunkResult(resultado.inicio, resultado.fim, None, str(e))
+    return ChunkResult(resultado.inicio, resultado.fim, mesclar_blocos(blocos), segundos=segundos)
+
+def buscar_bloco_completo(start_ms: int, end_ms: int, colaborador_id, token: str) -> ChunkResult:
+    """Como `buscar_bloco`, mas segue a paginação quando a resposta vem truncada."""
+    resultado = buscar_bloco(start_ms, end_ms, colaborador_id, token)
+    if resultado.ok and resultado.truncado:
+        return completar_paginas(resultado, colaborador_id, token)
+    return resultado
+
+def iter_adaptativo(faixas: List[Tuple[int, int]], colaborador_id, token: str, max_workers: int = MAX_WORKERS,
+                    chunker: Optional[AdaptiveChunker] = None) -> Iterator[ChunkResult]:
+    """
+    Percorre as faixas em janelas de tamanho adaptativo, com até `max_workers` janelas em voo.
+
+    Cada nova janela usa o tamanho aprendido com as respostas anteriores. Janelas
+    truncadas são substituídas pelas suas metades ou, no tamanho mínimo, completadas
+    com as páginas seguintes.
+
+    Args:
+        faixas (List[Tuple[int, int]]): Intervalos (início, fim) em milissegundos a cobrir.
+        colaborador_id: ID do colaborador.
+        token (str): Token de autenticação.
+        max_workers (int): Número máximo de janelas buscadas simultaneamente.
+        chunker (Optional[AdaptiveChunker]): Estado do tamanho das janelas; compartilhe para reaproveitar o aprendizado.
+
+    Yields:
+        ChunkResult: Resultado de cada janela, na ordem em que as respostas chegam.
+    """
+    chunker = chunker or AdaptiveChunker()
+    faixas = deque(faixas)
+    divididas = deque()
+
+    def proxima() -> Optional[Tuple[int, int]]:
+        if divididas:
+            return divididas.popleft()
+        while faixas:
+            inicio, fim = faixas[0]
+            if inicio >= fim:
+                faixas.popleft()
+                continue
+            janela = chunker.janela(inicio, fim)
+            if janela[1] >= fim:
+                faixas.popleft()
+            else:
+                faixas[0] = (janela[1], fim)
+            return janela
+        return None
+
+    with metrics.ContextExecutor(max_workers=max(1, max_workers)) as executor:
+        ativos = set()
+        while True:
+            while len(ativos) < max(1, max_workers):
+                janela = proxima()
+                if janela is None:
+                    break
+                ativos.add(executor.submit(buscar_bloco, janela[0], janela[1], colaborador_id, token))
+            if not ativos:
+                break
+            prontos, ativos = wait(ativos, return_when=FIRST_COMPLETED)
+            for future in prontos:
+                resultado = future.result()
+                metades = chunker.observe(resultado)
+                if metades:
+                    divididas.extend(metades)
+                elif resultado.ok and resultado.truncado:
+                    # Já no tamanho mínimo: as páginas seguintes são buscadas em vez de dividir
+                    ativos.add(executor.submit(completar_paginas, resultado, colaborador_id, token))
+                else:
+                    yield resultado
+
+def buscar_adaptativo(faixas: List[Tuple[int, int]], colaborador_id, token: str, max_workers: int = MAX_WORKERS,
+                      chunker: Optional[AdaptiveChunker] = None) -> List[ChunkResult]:
+    """Como `iter_adaptativo`, mas devolve todos os resultados em ordem cronológica."""
+    return sorted(iter_adaptativo(faixas, colaborador_id, token, max_workers, chunker), key=lambda r: r.inicio)
+
+def buscar_blocos(faixas: List[Tuple[int, int]], colaborador_id, token: str, max_workers: int = MAX_WORKERS,
+                  rodadas: int = CHUNK_RETRY_ROUNDS, chunker: Optional[AdaptiveChunker] = None) -> List[ChunkResult]:
+    """
+    Busca as faixas em janelas adaptativas e repete apenas as janelas que falharam, por até `rodadas` rodadas extras.
+
+    Cada requisição já tem suas próprias tentativas com backoff (api._get); as rodadas
+    extras cobrem falhas que persistiram enquanto as demais janelas disputavam o limite.
+
+    Args:
+        faixas (List[Tuple[int, int]]): Intervalos (início, fim) em milissegundos a cobrir.
+        colaborador_id: ID do colaborador.
+        token (str): Token de autenticação.
+        max_workers (int): Número máximo de janelas buscadas simultaneamente.
+        rodadas (int): Rodadas extras para as janelas com falha.
+        chunker (Optional[AdaptiveChunker]): Estado do tamanho das janelas.
+
+    Returns:
+        List[ChunkResult]: Resultado de cada janela, em ordem cronológica.
+    """
+    resultados = buscar_adaptativo(faixas, colaborador_id, token, max_workers, chunker)
+    return repetir_falhas(resultados, colaborador_id, token, max_workers, rodadas)
+
+def repetir_falhas(resultados: List[ChunkResult], colaborador_id, token: str, max_workers: int = MAX_WORKERS,
+                   rodadas: int = CHUNK_RETRY_ROUNDS, buscar: Callable = buscar_bloco_completo) -> List[ChunkResult]:
+    """
+    Busca de novo apenas as janelas com falha, por até `rodadas` rodadas.
+
+    Args:
+        resultados (List[ChunkResult]): Resultados da primeira busca.
+        colaborador_id: ID do colaborador (repassado a `buscar`).
+        token (str): Token de autenticação.
+        max_workers (int): Número máximo de janelas buscadas simultaneamente.
+        rodadas (int): Número máximo de rodadas extras.
+        buscar (Callable): Função com a assinatura de `buscar_bloco`.
+
+    Returns:
+        List[ChunkResult]: Os mesmos resultados, com as janelas repetidas substituídas.
+    """
+    resultados = list(resultados)
+    for _ in range(rodadas):
+        falhas = [i for i, r in enumerate(resultados) if not r.ok]
+        if not falhas:
+            break
+        novos = buscar_janelas([(resultados[i].inicio, resultados[i].fim) for i in falhas], colaborador_id, token,
+                               max_workers, buscar=buscar)
+        for i, resultado in zip(falhas, novos):
+            resultados[i] = resultado
+    return resultados
+
+def _fetch_with_cache(start_ms: int, end_ms: int, colaborador_id, token: str, max_workers: int, cache,
+                      chunker: Optional[AdaptiveChunker]) -> FetchResult:
+    """Busca na API apenas os dias ausentes ou ainda abertos no cache e lê o período completo do cache."""
+    inicio, fim = dia_local(start_ms), dia_local(end_ms)
+    faixas = faixas_de_dias(cache.missing_days(colaborador_id, dias_entre(inicio, fim)))
+
+    resultados = buscar_blocos(faixas, colaborador_id, token, max_workers, chunker=chunker)
+    for resultado in resultados:
+        # Janelas com falha não são marcadas como cobertas e serão buscadas na próxima vez
+        if resultado.ok:
+            cache.store(colaborador_id, resultado.dias, resultado.punches)
+
+    return FetchResult(cache.load(colaborador_id, inicio, fim), [r for r in resultados if not r.ok], len(resultados))
+
+def fetch_punches_with_status(start_ms: int, end_ms: int, colaborador_id, token: str, max_workers: int = MAX_WORKERS,
+                              cache=None, chunker: Optional[AdaptiveChunker] = None) -> FetchResult:
+    """
+    Como `fetch_punches_in_chunks`, mas informa também as janelas que falharam.
+
+    Args:
+        start_ms (int): Timestamp inicial em milissegundos.
+        end_ms (int): Timestamp final em milissegundos.
+        colaborador_id: ID do colaborador.
+        token (str): Token de autenticação.
+        max_workers (int): Número máximo de blocos buscados simultaneamente.
+        cache (Optional[PunchCache]): Cache local de pontos.
+        chunker (Optional[AdaptiveChunker]): Estado do tamanho das janelas; por padrão, um novo a cada chamada.
+
+    Returns:
+        FetchResult: Pontos obtidos e janelas com falha (ver `FetchResult.dias_incompletos`).
+    """
+    with metrics.stage("fetch_punches", colaborador=colaborador_id, cache=cache is not None) as evento:
+        if cache is not None:
+            resultado = _fetch_with_cache(start_ms, end_ms, colaborador_id, token, max_workers, cache, chunker)
+        else:
+            resultados = buscar_blocos([(start_ms, end_ms)], colaborador_id, token, max_workers, chunker=chunker)
+            punches = mesclar_blocos([r.punches for r in resultados if r.ok])
+            resultado = FetchResult(punches, [r for r in resultados if not r.ok], len(resultados))
+        evento.update(rows=len(resultado.punches), chunks=resultado.blocos, failed_chunks=len(resultado.falhas))
+    return resultado
+
+def iter_punch_chunks(start_ms: int, end_ms: int, colaborador_id, token: str, max_workers: int = MAX_WORKERS,
+                      cache=None, chunker: Optional[AdaptiveChunker] = None) -> Iterator[ChunkResult]:
+    """
+    Versão em fluxo de `fetch_punches_with_status`: entrega cada janela assim que ela chega.
+
+    Com `cache`, os trechos já cobertos são entregues primeiro (lidos do disco) e
+    cada janela buscada é gravada ao chegar. Janelas com falha são repetidas ao
+    final (CHUNK_RETRY_ROUNDS) e entregues com o resultado da última tentativa.
+    Os dias de cada resultado estão em `ChunkResult.dias`; o total de dias do
+    período permite calcular o progresso.
+
+    Args:
+        start_ms (int): Timestamp inicial em milissegundos.
+        end_ms (int): Timestamp final em milissegundos.
+        colaborador_id: ID do colaborador.
+        token (str): Token de autenticação.
+        max_workers (int): Número máximo de blocos buscados simultaneamente.
+        cache (Optional[PunchCache]): Cache local de pontos.
+        chunker (Optional[AdaptiveChunker]): Estado do tamanho das janelas.
+
+    Yields:
+        ChunkResult: Resultado de cada janela, na ordem de chegada.
+    """
+    faixas = [(start_ms, end_ms)]
+    if cache is not None:
+        inicio, fim = dia_local(start_ms), dia_local(end_ms)
+        pendentes = cache.missing_days(colaborador_id, dias_entre(inicio, fim))
+        cobertos = sorted(set(dias_entre(inicio, fim)) - set(pendentes))
+        for primeiro, ultimo in agrupar_dias_consecutivos(cobertos):
+            faixa_inicio = int(datetime.combine(primeiro, time.min).timestamp() * 1000)
+            faixa_fim = int(datetime.combine(ultimo + timedelta(days=1), time.min).timestamp() * 1000)
+            yield ChunkResult(faixa_inicio, faixa_fim, cache.load(colaborador_id, primeiro, ultimo))
+        faixas = faixas_de_dias(pendentes)
+
+    falhas = []
+    for resultado in iter_adaptativo(faixas, colaborador_id, token, max_workers, chunker):
+        if not resultado.ok:
+            falhas.append(resultado)
+            continue
+        if cache is not None:
+            cache.store(colaborador_id, resultado.dias, resultado.punches)
+        yield resultado
+
+    for resultado in repetir_falhas(falhas, colaborador_id, token, max_workers):
+        if resultado.ok and cache is not None:
+            cache.store(colaborador_id, resultado.dias, resultado.punches)
+        yield resultado
+
+def fetch_punches_in_chunks(start_ms: int, end_ms: int, colaborador_id, token: str, max_workers: int = MAX_WORKERS,
+                            cache=None, chunker: Optional[AdaptiveChunker] = None) -> PunchRecords:
+    """
+    Busca os registros de ponto em blocos, evitando sobrecarga na API.
+
+    Os blocos começam com CHUNK_DAYS dias e se adaptam às respostas (ver
+    AdaptiveChunker), entre MIN_CHUNK_DAYS e MAX_CHUNK_DAYS. Eles são buscados
+    em paralelo (até `max_workers` por vez) sobre a sessão HTTP compartilhada,
+    respeitando o limite de requisições do token. O resultado é o mesmo
+    independentemente da ordem em que os blocos terminam.
+
+    Com um `cache` (utils.punch_cache.PunchCache), apenas os dias ainda não
+    cobertos, expirados ou abertos são buscados na API; o restante vem do disco.
+
+    Blocos que falham mesmo após as novas tentativas ficam de fora do resultado;
+    use `fetch_punches_with_status` para saber quais dias ficaram incompletos.
+
+    Args:
+        start_ms (int): Timestamp inicial em milissegundos.
+        end_ms (int): Timestamp final em milissegundos.
+        colaborador_id: ID do colaborador.
+        token (str): Token de autenticação.
+        max_workers (int): Número máximo de blocos buscados simultaneamente. Use 1 para busca sequencial.
+        cache (Optional[PunchCache]): Cache local de pontos. Sem cache, todo o período é buscado.
+        chunker (Optional[AdaptiveChunker]): Estado do tamanho das janelas; por padrão, um novo a cada chamada.
+
+    Returns:
+        PunchRecords: Registros de ponto acumulados, em formato compacto (iterar devolve dicionários da API).
+    """
+    return fetch_punches_with_status(start_ms, end_ms, colaborador_id, token, max_workers, cache, chunker).punches